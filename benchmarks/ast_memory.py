@@ -0,0 +1,69 @@
+# Resident size of a parsed program in three layouts: nodes with a __dict__
+# (the layout before Expr/Stmt nodes had __slots__, rebuilt here from the
+# parsed tree), the __slots__ nodes the parser produces, and a NodeArena.
+# Every size includes the tokens the program keeps alive.
+#
+#   python benchmarks/ast_memory.py [lines]
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import generate_large, load_programs
+from pylox.parser.fields import fields
+from pylox.parser.node_arena import NodeArena
+from pylox.parser.parser import Parser
+from pylox.scanner.scanner import Scanner
+
+
+class DictNode:
+  pass
+
+
+def with_dicts(value):
+  if isinstance(value, list):
+    return [with_dicts(item) for item in value]
+  if not hasattr(value, 'accept'):
+    return value
+  node = DictNode()
+  for name, field in zip(value.__slots__, fields(value)):
+    setattr(node, name, with_dicts(field))
+  return node
+
+
+def parse(source: str):
+  return Parser(Scanner(source, print).scan_tokens(), print).parse()
+
+
+# Bytes still allocated once `build` has returned and its temporaries are gone.
+def resident(build) -> int:
+  gc.collect()
+  tracemalloc.start()
+  try:
+    kept = build()
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+  finally:
+    del kept
+    tracemalloc.stop()
+
+
+def main(argv: list[str]) -> None:
+  programs = load_programs(None)
+  programs['large_file'] = generate_large(int(argv[0]) if argv else 5000)
+
+  layouts = {
+    '__dict__ nodes': lambda source: with_dicts(parse(source)),
+    '__slots__ nodes': parse,
+    'arena': lambda source: NodeArena.from_statements(parse(source)),
+  }
+  print(f'{"program":<18}' + ''.join(f'{name:>18}' for name in layouts))
+  for program, source in programs.items():
+    sizes = [resident(lambda: build(source)) for build in layouts.values()]
+    print(f'{program:<18}' + ''.join(f'{size / 1024:>15.1f}KiB' for size in sizes))
+
+
+if __name__ == '__main__':
+  main(sys.argv[1:])
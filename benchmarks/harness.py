@@ -0,0 +1,180 @@
+# Times each phase of running the programs in benchmarks/programs (plus a
+# large generated file for the scanner) on every backend, records peak
+# memory, and writes the results as JSON so runs can be compared. The
+# scanner, parser and backends are the ones LoxRuntime runs, with the same
+# defaults as pylox; the engines and optimization level are recorded with
+# the results.
+#
+#   python benchmarks/harness.py --output before.json
+#   python benchmarks/harness.py --backend tree vm --only fib --output after.json
+#   python benchmarks/harness.py --scanner fast --parser descent -O 1 --output after.json
+#   python benchmarks/harness.py --compare before.json after.json
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pylox.interpreter.optimizer import Optimizer
+from pylox.interpreter.resolver import Resolver
+from pylox.runtime import LoxRuntime
+
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'programs')
+
+PHASES = ('scan', 'parse', 'optimize', 'resolve', 'interpret')
+# Options that change what is timed, recorded with the results.
+OPTIONS = ('scanner', 'parser', 'optimize')
+
+
+# A long straight-line script that mostly exercises the scanner and parser.
+def generate_large(lines: int = 5000) -> str:
+  chunks = []
+  for i in range(lines):
+    chunks.append(f'var v{i} = {i} * (3 + {i % 7}) - {i}.5; // number {i}\n')
+    if i % 10 == 0:
+      chunks.append(f'var s{i} = "string literal {i}" + "!";\n')
+  chunks.append('print v0;\n')
+  return ''.join(chunks)
+
+
+def load_programs(only: list[str] | None) -> dict[str, str]:
+  programs = {}
+  for path in sorted(glob.glob(os.path.join(PROGRAMS_DIR, '*.lox'))):
+    with open(path, encoding='utf-8') as file:
+      programs[os.path.splitext(os.path.basename(path))[0]] = file.read()
+  programs['large_file'] = generate_large()
+  if only:
+    programs = {name: source for name, source in programs.items() if name in only}
+  return programs
+
+
+# Error callback for every phase; a benchmark that reports an error is broken.
+def fail(*error) -> None:
+  raise SystemExit(f'benchmark program failed: {" ".join(map(str, error))}')
+
+
+# Seconds spent in each phase for one run, with the program's output discarded.
+def run_phases(backend, source: str, scanner, parser, optimize: int) -> dict[str, float]:
+  times = {}
+  start = time.perf_counter()
+  tokens = scanner(source, fail).scan_tokens()
+  times['scan'] = time.perf_counter() - start
+
+  start = time.perf_counter()
+  statements = parser(tokens, fail).parse()
+  times['parse'] = time.perf_counter() - start
+
+  start = time.perf_counter()
+  statements = Optimizer(optimize).optimize(statements)
+  times['optimize'] = time.perf_counter() - start
+
+  start = time.perf_counter()
+  Resolver(fail).resolve(statements)
+  times['resolve'] = time.perf_counter() - start
+
+  runner = backend(fail)
+  with open(os.devnull, 'w') as devnull:
+    stdout, sys.stdout = sys.stdout, devnull
+    try:
+      start = time.perf_counter()
+      runner.interpret(statements)
+      times['interpret'] = time.perf_counter() - start
+    finally:
+      sys.stdout = stdout
+  return times
+
+
+# Best time per phase over `repeat` runs, then one more run under tracemalloc
+# for the peak, so tracing never slows the timed runs.
+def measure(program: str, backend: str, source: str, args: argparse.Namespace) -> dict:
+  engines = (LoxRuntime.backends[backend], source, LoxRuntime.scanner_engines[args.scanner],
+             LoxRuntime.parser_engines[args.parser], args.optimize)
+  best = dict.fromkeys(PHASES, float('inf'))
+  for _ in range(args.repeat):
+    for phase, seconds in run_phases(*engines).items():
+      best[phase] = min(best[phase], seconds)
+
+  tracemalloc.start()
+  try:
+    run_phases(*engines)
+    peak = tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+
+  return {'program': program, 'backend': backend, **best, 'total': sum(best.values()), 'peak_bytes': peak}
+
+
+def print_results(results: list[dict]) -> None:
+  print(f'{"program":<18} {"backend":<8}' + ''.join(f'{p:>11}' for p in PHASES) + f'{"total":>11}{"peak KiB":>11}')
+  for r in results:
+    phases = ''.join(f'{r[p] * 1000:>9.1f}ms' for p in PHASES)
+    print(f'{r["program"]:<18} {r["backend"]:<8}{phases}{r["total"] * 1000:>9.1f}ms{r["peak_bytes"] // 1024:>11}')
+
+
+# Ratio new/old of each phase for the program/backend pairs both files have.
+# Phases missing from either file (older runs had no optimize phase) show as
+# '-'; runs with different engines or -O are flagged, since they time
+# different code.
+def compare(old_path: str, new_path: str) -> None:
+  with open(old_path, encoding='utf-8') as file:
+    old_run = json.load(file)
+  with open(new_path, encoding='utf-8') as file:
+    new_run = json.load(file)
+  old = {(r['program'], r['backend']): r for r in old_run['results']}
+  new = new_run['results']
+
+  for option in OPTIONS:
+    if old_run.get(option) != new_run.get(option):
+      print(f'note: {option} differs: {old_run.get(option)} -> {new_run.get(option)}')
+
+  columns = (*PHASES, 'total', 'peak_bytes')
+  print(f'{"program":<18} {"backend":<8}' + ''.join(f'{c.replace("_bytes", ""):>11}' for c in columns))
+  for r in new:
+    before = old.get((r['program'], r['backend']))
+    if before is None:
+      continue
+    ratios = ''.join(f'{r[c] / before[c]:>10.2f}x' if before.get(c) and c in r else f'{"-":>11}' for c in columns)
+    print(f'{r["program"]:<18} {r["backend"]:<8}{ratios}')
+
+
+def main(argv: list[str]) -> None:
+  parser = argparse.ArgumentParser(prog='harness')
+  parser.add_argument('--backend', nargs='+', choices=LoxRuntime.backends, default=list(LoxRuntime.backends))
+  parser.add_argument('--scanner', choices=LoxRuntime.scanner_engines, default='classic')
+  parser.add_argument('--parser', choices=LoxRuntime.parser_engines, default='pratt')
+  parser.add_argument('-O', dest='optimize', type=int, choices=(0, 1), default=0)
+  parser.add_argument('--only', nargs='+', metavar='PROGRAM', help='run only these programs')
+  parser.add_argument('--repeat', type=int, default=3)
+  parser.add_argument('--output', metavar='FILE', help='write the results as JSON')
+  parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two JSON result files')
+  args = parser.parse_args(argv)
+
+  if args.compare:
+    compare(*args.compare)
+    return
+
+  results = []
+  for program, source in load_programs(args.only).items():
+    for backend in args.backend:
+      results.append(measure(program, backend, source, args))
+  print_results(results)
+
+  if args.output:
+    with open(args.output, 'w', encoding='utf-8') as file:
+      json.dump({
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        **{option: getattr(args, option) for option in OPTIONS},
+        'results': results,
+      }, file, indent=2)
+
+
+if __name__ == '__main__':
+  main(sys.argv[1:])
@@ -0,0 +1,106 @@
+# Compares the completion-signal `return` used by the Interpreter with the
+# classic exception-based unwinding, on the tree-walking interpreter.
+#
+#   python benchmarks/return_unwinding.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pylox.interpreter.environment import Environment
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.lox_function import LoxFunction
+from pylox.interpreter.resolver import Resolver
+from pylox.parser.parser import Parser
+from pylox.parser.stmt import Stmt
+from pylox.scanner.scanner import Scanner
+
+
+PROGRAMS = {
+  'fib': 'fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); } print fib(20);',
+  'tail_return': '''
+    fun inc(x) { return x + 1; }
+    var i = 0;
+    while (i < 100000) i = inc(i);
+    print i;
+  ''',
+  'early_return_in_loop': '''
+    fun find(limit) { var i = 0; while (true) { if (i >= limit) return i; i = i + 1; } }
+    var total = 0;
+    for (var n = 0; n < 2000; n = n + 1) total = total + find(20);
+    print total;
+  ''',
+}
+
+
+class ReturnValue(Exception):
+  def __init__(self, value: object):
+    self.value = value
+
+
+class ExceptionFunction(LoxFunction):
+  def call(self, interpreter, arguments):
+    environment = Environment(interpreter.Globals, self.declaration.slot_count)
+    environment.slots[:len(arguments)] = arguments
+    try:
+      interpreter.execute_block(self.declaration.body, environment)
+    except ReturnValue as r:
+      return r.value
+    return None
+
+
+class ExceptionInterpreter(Interpreter):
+  def visit_function_stmt(self, stmt: Stmt.Function) -> None:
+    self.define(stmt.name, stmt.slot, ExceptionFunction(stmt))
+
+  def visit_return_stmt(self, stmt: Stmt.Return):
+    raise ReturnValue(None if stmt.value is None else self.evaluate(stmt.value))
+
+
+# The completion signal alone, without LoxFunction's trailing-return fast path.
+class SignalFunction(LoxFunction):
+  def __init__(self, declaration: Stmt.Function):
+    super().__init__(declaration)
+    self.body = declaration.body
+    self.result = None
+
+
+class SignalInterpreter(Interpreter):
+  def visit_function_stmt(self, stmt: Stmt.Function) -> None:
+    self.define(stmt.name, stmt.slot, SignalFunction(stmt))
+
+
+VARIANTS = {
+  'exceptions': ExceptionInterpreter,
+  'signal': SignalInterpreter,
+  'signal+fast path': Interpreter,
+}
+
+
+def measure(interpreter_class, source: str, repeat: int = 3) -> float:
+  best = float('inf')
+  for _ in range(repeat):
+    statements = Parser(Scanner(source, print).scan_tokens(), print).parse()
+    Resolver(print).resolve(statements)
+    interpreter = interpreter_class(print)
+    with open(os.devnull, 'w') as devnull:
+      stdout, sys.stdout = sys.stdout, devnull
+      try:
+        start = time.perf_counter()
+        interpreter.interpret(statements)
+        best = min(best, time.perf_counter() - start)
+      finally:
+        sys.stdout = stdout
+  return best
+
+
+def main():
+  print(f"{'program':<22}" + ''.join(f'{name:>18}' for name in VARIANTS))
+  for name, source in PROGRAMS.items():
+    times = [measure(variant, source) for variant in VARIANTS.values()]
+    print(f'{name:<22}' + ''.join(f'{t:>17.3f}s' for t in times))
+
+
+if __name__ == '__main__':
+  main()
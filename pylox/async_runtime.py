@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable
+
+from pylox.interpreter.async_interpreter import AsyncInterpreter
+from pylox.natives.registry import NativeFunction
+from pylox.runtime import LoxRuntime
+
+
+# LoxRuntime for asyncio services. run_async() and run_file_async() run the
+# script on a thread of its own and await its exit status, while coroutine
+# natives (registered with @native or passed in `natives`) are awaited on
+# the caller's event loop. Many scripts can be in flight on one loop; each
+# one only holds up its own thread while it waits on I/O.
+#
+# The tree-walker is ordinary recursive Python, so a script can't suspend
+# as a coroutine mid-expression: every running script takes one OS thread,
+# which blocks while the loop awaits its native. How many scripts can run at
+# once is bounded by threads, not by the loop. Cancelling the awaiting task
+# cancels the native being awaited and ends the script with a runtime error
+# at its next native call; a script computing without calling natives runs
+# on until it gets there.
+class AsyncLoxRuntime(LoxRuntime):
+
+  def __init__(self, natives: dict[str, Callable[..., object | Awaitable[object]]] | None = None, **options):
+    super().__init__(**options)
+    for name, function in (natives or {}).items():
+      self.interpreter.Globals.define(name, NativeFunction(name, 'host', function, pure=False))
+
+
+  def create_interpreter(self, backend: str, profile: bool):
+    if backend != 'tree' or profile:
+      raise ValueError('AsyncLoxRuntime runs on the tree backend only')
+    return AsyncInterpreter(self.runtime_error)
+
+
+  async def run_async(self, source: str) -> int:
+    def run():
+      self.run(source)
+      return self.exit_code()
+    return await self.in_thread(run)
+
+
+  async def run_file_async(self, path: str) -> int:
+    return await self.in_thread(lambda: self.run_file(path))
+
+
+  async def in_thread(self, run: Callable[[], int]) -> int:
+    loop = asyncio.get_running_loop()
+    self.interpreter.loop = loop
+    self.interpreter.cancelled = False
+    done = loop.create_future()
+
+    def settle(method, value):
+      if not done.done():
+        method(value)
+
+    def target():
+      try:
+        status = run()
+      except BaseException as e:
+        loop.call_soon_threadsafe(settle, done.set_exception, e)
+      else:
+        loop.call_soon_threadsafe(settle, done.set_result, status)
+
+    threading.Thread(target=target, daemon=True).start()
+    try:
+      return await done
+    except asyncio.CancelledError:
+      self.interpreter.cancel()
+      raise
@@ -0,0 +1,97 @@
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from pylox.lox import Lox
+from pylox.runtime import LoxRuntime
+
+
+# `pylox run-many`: runs many independent scripts on a pool of worker
+# processes, each of which imports pylox once and then runs script after
+# script on a fresh LoxRuntime writing to its own buffers. Options other than
+# run-many's own are the usual single-script options and apply to every
+# script:
+#
+#   python main.py run-many scripts/ extra.lox --workers 8 --backend vm
+#
+# Every script's stdout, stderr, exit code (0, 65 for compile errors, 70 for
+# runtime errors, 1 for a crash of the interpreter itself) and wall time is
+# collected into a summary. run-many exits with the highest exit code seen.
+
+# Lox options shared by every script run in this worker.
+worker_options = argparse.Namespace()
+
+
+def collect_scripts(paths: list[str]) -> list[str]:
+  scripts = []
+  for path in paths:
+    if os.path.isdir(path):
+      for directory, _, files in os.walk(path):
+        scripts.extend(os.path.join(directory, f) for f in files if f.endswith('.lox'))
+    else:
+      scripts.append(path)
+  return sorted(scripts)
+
+
+def init_worker(options: argparse.Namespace) -> None:
+  global worker_options
+  worker_options = options
+
+
+def run_script(path: str) -> dict:
+  stdout, stderr = io.StringIO(), io.StringIO()
+  start = time.perf_counter()
+  try:
+    runtime = LoxRuntime.from_args(worker_options, stdout)
+    exit_code = runtime.run_file(path)
+    Lox.report(runtime, stderr)
+  except Exception:
+    traceback.print_exc(file=stderr)
+    exit_code = 1
+  return {
+    'script': path,
+    'exit_code': exit_code,
+    'seconds': time.perf_counter() - start,
+    'stdout': stdout.getvalue(),
+    'stderr': stderr.getvalue(),
+  }
+
+
+def run_many(argv: list[str]) -> int:
+  parser = argparse.ArgumentParser(prog='pylox run-many')
+  parser.add_argument('paths', nargs='+', help='.lox scripts, or directories searched for them')
+  parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                      help='worker processes (default: one per CPU)')
+  parser.add_argument('--summary', metavar='FILE', help='write every result, output included, as JSON')
+  parser.add_argument('--show-output', action='store_true', help="print each script's output after its result")
+  args = Lox.parse_args(argv, parser)
+  scripts = collect_scripts(args.paths)
+  start = time.perf_counter()
+  if args.workers > 1 and len(scripts) > 1:
+    chunksize = max(1, len(scripts) // (args.workers * 4))
+    with multiprocessing.Pool(args.workers, init_worker, (args,)) as pool:
+      results = pool.map(run_script, scripts, chunksize)
+  else:
+    init_worker(args)
+    results = [run_script(script) for script in scripts]
+  elapsed = time.perf_counter() - start
+
+  for result in results:
+    print(f'{result["exit_code"]:>4} {result["seconds"] * 1000:>9.1f}ms  {result["script"]}')
+    if args.show_output:
+      sys.stdout.write(result['stdout'])
+      sys.stderr.write(result['stderr'])
+
+  failed = sum(1 for result in results if result['exit_code'])
+  print(f'{len(results)} scripts, {failed} failed, {elapsed:.2f}s with {args.workers} workers')
+
+  if args.summary:
+    with open(args.summary, 'w', encoding='utf-8') as file:
+      json.dump({'workers': args.workers, 'seconds': elapsed, 'results': results}, file, indent=2)
+
+  return max((result['exit_code'] for result in results), default=0)
@@ -0,0 +1,57 @@
+import asyncio
+import concurrent.futures
+
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.rope import Rope
+from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.natives.registry import NativeError, NativeFunction
+from pylox.parser.expr import Expr
+
+
+# Tree interpreter whose coroutine natives run on an asyncio event loop. The
+# interpreter itself runs on a thread of its own (see AsyncLoxRuntime); at a
+# call to a coroutine native the script thread hands the coroutine to `loop`
+# and waits for its result, so the loop is free to run other coroutines,
+# including the natives of other scripts, in the meantime.
+#
+# cancel() is called from the loop when the task awaiting the script is
+# cancelled: the native being awaited is cancelled and this native call, or
+# the script's next one, raises a runtime error that ends the script.
+class AsyncInterpreter(Interpreter):
+
+  def __init__(self, error_callback):
+    super().__init__(error_callback)
+    self.loop: asyncio.AbstractEventLoop | None = None
+    self.cancelled = False
+    # The coroutine native the script thread is waiting on.
+    self.pending: concurrent.futures.Future | None = None
+
+
+  def cancel(self) -> None:
+    self.cancelled = True
+    pending = self.pending
+    if pending is not None:
+      pending.cancel()
+
+
+  def call_native(self, native: NativeFunction, expr: Expr.Call):
+    if self.cancelled:
+      raise RuntimeException(expr.paren, 'Script cancelled.')
+    if native.coroutine is None:
+      return super().call_native(native, expr)
+
+    arguments = [self.evaluate(arg) for arg in expr.arguments]
+    arguments = [str(arg) if type(arg) is Rope else arg for arg in arguments]
+    if len(arguments) != native.param_count:
+      raise RuntimeException(expr.paren, f'Expected {native.param_count} arguments but got {len(arguments)}.')
+    self.pending = asyncio.run_coroutine_threadsafe(native.coroutine(*arguments), self.loop)
+    try:
+      if self.cancelled:
+        self.pending.cancel()
+      return self.pending.result()
+    except NativeError as e:
+      raise RuntimeException(expr.paren, str(e))
+    except concurrent.futures.CancelledError:
+      raise RuntimeException(expr.paren, 'Script cancelled.')
+    finally:
+      self.pending = None
@@ -0,0 +1,385 @@
+import operator as op
+from typing import Callable
+
+from pylox.interpreter.closure_function import ClosureFunction
+from pylox.interpreter.environment import Environment
+from pylox.interpreter.interpreter import RETURN
+from pylox.interpreter.lox_callable import LoxCallable
+from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.natives.registry import NativeError, NativeFunction
+from pylox.parser.expr import Expr
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_type import TokenType
+
+
+Closure = Callable[[Environment], object]
+
+
+# Whether running `stmt` can end in a `return`. Statements that can't never
+# produce the RETURN signal, so the closures around them skip checking for it.
+def can_return(stmt: Stmt | None) -> bool:
+  if isinstance(stmt, Stmt.Return):
+    return True
+  if isinstance(stmt, Stmt.Block):
+    return any(can_return(s) for s in stmt.statements)
+  if isinstance(stmt, Stmt.If):
+    return can_return(stmt.then_branch) or can_return(stmt.else_branch)
+  if isinstance(stmt, (Stmt.While, Stmt.For)):
+    return can_return(stmt.body)
+  return False
+
+# Binary operators whose operands must both be numbers.
+NUMBER_OPERATORS: dict[TokenType, Callable[[float, float], object]] = {
+  TokenType.GREATER:       op.gt,
+  TokenType.GREATER_EQUAL: op.ge,
+  TokenType.LESS:          op.lt,
+  TokenType.LESS_EQUAL:    op.le,
+  TokenType.MINUS:         op.sub,
+  TokenType.SLASH:         op.truediv,
+  TokenType.STAR:          op.mul,
+}
+
+
+# Turns each resolved Expr/Stmt node into a Python closure taking the current
+# Environment, once. Everything that can be decided from the tree, such as
+# which operator a Binary applies or which slot a Variable reads, is decided
+# here, so running the program never goes through accept()/visit_*.
+# Expression closures return the value; statement closures return None, or
+# RETURN (see Interpreter) after a return statement.
+class ClosureCompiler(Expr.Visitor, Stmt.Visitor):
+
+  def __init__(self, interpreter):
+    self.interpreter = interpreter
+
+
+  def compile(self, node: Expr | Stmt) -> Closure:
+    return node.accept(self)
+
+
+  def compile_block(self, statements: list[Stmt]) -> tuple[Closure, ...]:
+    return tuple(self.compile(s) for s in statements)
+
+
+  def visit_expression_stmt(self, stmt: Stmt.Expression) -> Closure:
+    expression = self.compile(stmt.expression)
+    def run(env):
+      expression(env)
+    return run
+
+
+  def visit_print_stmt(self, stmt: Stmt.Print) -> Closure:
+    expression = self.compile(stmt.expression)
+    stringify = self.interpreter.stringify
+    interpreter = self.interpreter
+    def run(env):
+      print(stringify(expression(env)), file=interpreter.output)
+    return run
+
+
+  def visit_var_stmt(self, stmt: Stmt.Var) -> Closure:
+    initializer = self.compile(stmt.initializer) if stmt.initializer else lambda env: None
+    return self.define(stmt.name.lexeme, stmt.slot, initializer)
+
+
+  def visit_function_stmt(self, stmt: Stmt.Function) -> Closure:
+    body = stmt.body
+    # Same fast path as LoxFunction: a trailing return is compiled to the
+    # expression the function's result comes from.
+    result = None
+    if body and isinstance(body[-1], Stmt.Return):
+      value = body[-1].value
+      body, result = body[:-1], self.compile(value) if value else lambda env: None
+    statements = self.compile_block(body)
+    checked = any(can_return(s) for s in body)
+    return self.define(stmt.name.lexeme, stmt.slot, lambda env: ClosureFunction(stmt, statements, checked, result))
+
+
+  def visit_return_stmt(self, stmt: Stmt.Return) -> Closure:
+    value = self.compile(stmt.value) if stmt.value else lambda env: None
+    interpreter = self.interpreter
+    def run(env):
+      interpreter.return_value = value(env)
+      return RETURN
+    return run
+
+
+  def define(self, name: str, slot: int | None, value: Closure) -> Closure:
+    if slot is None:
+      values = self.interpreter.Globals.values
+      def define_global(env):
+        values[name] = value(env)
+      return define_global
+
+    def define_local(env):
+      env.slots[slot] = value(env)
+    return define_local
+
+
+  def visit_block_stmt(self, stmt: Stmt.Block) -> Closure:
+    statements = self.compile_block(stmt.statements)
+    size = stmt.slot_count
+    if not stmt.scoped:
+      return self.scopeless_block(statements, can_return(stmt))
+
+    if can_return(stmt):
+      def run_returning(env):
+        inner = Environment(env, size)
+        for s in statements:
+          if s(inner) is RETURN:
+            return RETURN
+      return run_returning
+
+    def run(env):
+      inner = Environment(env, size)
+      for s in statements:
+        s(inner)
+    return run
+
+
+  # A block without a scope of its own runs in the environment it is given.
+  def scopeless_block(self, statements: tuple[Closure, ...], returning: bool) -> Closure:
+    if returning:
+      def run_returning(env):
+        for s in statements:
+          if s(env) is RETURN:
+            return RETURN
+      return run_returning
+
+    def run(env):
+      for s in statements:
+        s(env)
+    return run
+
+
+  def visit_if_stmt(self, stmt: Stmt.If) -> Closure:
+    condition = self.compile(stmt.condition)
+    then_branch = self.compile(stmt.then_branch)
+    is_truthy = self.interpreter.is_truthy
+
+    if stmt.else_branch is None:
+      def run_if(env):
+        if is_truthy(condition(env)):
+          return then_branch(env)
+      return run_if
+
+    else_branch = self.compile(stmt.else_branch)
+    def run_if_else(env):
+      if is_truthy(condition(env)):
+        return then_branch(env)
+      return else_branch(env)
+    return run_if_else
+
+
+  def visit_while_stmt(self, stmt: Stmt.While) -> Closure:
+    condition = self.compile(stmt.condition)
+    body = self.compile(stmt.body)
+    is_truthy = self.interpreter.is_truthy
+
+    if can_return(stmt.body):
+      def run_returning(env):
+        while is_truthy(condition(env)):
+          if body(env) is RETURN:
+            return RETURN
+      return run_returning
+
+    def run(env):
+      while is_truthy(condition(env)):
+        body(env)
+    return run
+
+
+  def visit_for_stmt(self, stmt: Stmt.For) -> Closure:
+    initializer = self.compile(stmt.initializer) if stmt.initializer else lambda env: None
+    condition = self.compile(stmt.condition)
+    increment = self.compile(stmt.increment) if stmt.increment else lambda env: None
+    body = self.compile_block(stmt.body.statements) if stmt.inline_body else (self.compile(stmt.body),)
+    size = stmt.slot_count
+    is_truthy = self.interpreter.is_truthy
+
+    if can_return(stmt.body):
+      def run_returning(env):
+        loop = Environment(env, size)
+        initializer(loop)
+        while is_truthy(condition(loop)):
+          for s in body:
+            if s(loop) is RETURN:
+              return RETURN
+          increment(loop)
+      return run_returning
+
+    def run(env):
+      loop = Environment(env, size)
+      initializer(loop)
+      while is_truthy(condition(loop)):
+        for s in body:
+          s(loop)
+        increment(loop)
+    return run
+
+
+  def visit_literal_expr(self, expr: Expr.Literal) -> Closure:
+    value = expr.value
+    return lambda env: value
+
+
+  def visit_grouping_expr(self, expr: Expr.Grouping) -> Closure:
+    return self.compile(expr.expression)
+
+
+  def visit_variable_expr(self, expr: Expr.Variable) -> Closure:
+    slot = expr.slot
+
+    if slot is None:
+      values = self.interpreter.Globals.values
+      name = expr.name
+      lexeme = name.lexeme
+      def get_global(env):
+        try:
+          return values[lexeme]
+        except KeyError:
+          raise RuntimeException(name, f"Undefined variable '{lexeme}'.") from None
+      return get_global
+
+    depth = expr.depth
+    if depth == 0:
+      return lambda env: env.slots[slot]
+    if depth == 1:
+      return lambda env: env.enclosing.slots[slot]
+    return lambda env: env.get_at(depth, slot)
+
+
+  def visit_assign_expr(self, expr: Expr.Assign) -> Closure:
+    value = self.compile(expr.value)
+    slot = expr.slot
+
+    if slot is None:
+      values = self.interpreter.Globals.values
+      name = expr.name
+      lexeme = name.lexeme
+      def assign_global(env):
+        result = value(env)
+        if lexeme not in values:
+          raise RuntimeException(name, f"Undefined variable '{lexeme}'.")
+        values[lexeme] = result
+        return result
+      return assign_global
+
+    depth = expr.depth
+    if depth == 0:
+      def assign_local(env):
+        result = env.slots[slot] = value(env)
+        return result
+      return assign_local
+
+    def assign_at(env):
+      result = value(env)
+      env.assign_at(depth, slot, result)
+      return result
+    return assign_at
+
+
+  def visit_logical_expr(self, expr: Expr.Logical) -> Closure:
+    left = self.compile(expr.left)
+    right = self.compile(expr.right)
+    is_truthy = self.interpreter.is_truthy
+
+    if expr.operator.token_type == TokenType.OR:
+      def logical_or(env):
+        value = left(env)
+        return value if is_truthy(value) else right(env)
+      return logical_or
+
+    def logical_and(env):
+      value = left(env)
+      return right(env) if is_truthy(value) else value
+    return logical_and
+
+
+  def visit_unary_expr(self, expr: Expr.Unary) -> Closure:
+    right = self.compile(expr.right)
+    operator = expr.operator
+
+    if operator.token_type == TokenType.MINUS:
+      def negate(env):
+        value = right(env)
+        if not isinstance(value, float):
+          raise RuntimeException(operator, "Operand must be a number.")
+        return -value
+      return negate
+
+    is_truthy = self.interpreter.is_truthy
+    return lambda env: not is_truthy(right(env))
+
+
+  # Operands are evaluated right first, like Interpreter.visit_binary_expr.
+  def visit_binary_expr(self, expr: Expr.Binary) -> Closure:
+    left = self.compile(expr.left)
+    right = self.compile(expr.right)
+    operator = expr.operator
+    token_type = operator.token_type
+
+    if token_type == TokenType.PLUS:
+      def add(env):
+        r = right(env)
+        l = left(env)
+        if isinstance(l, float) and isinstance(r, float):
+          return l + r
+        if isinstance(l, str) and isinstance(r, str):
+          return l + r
+        raise RuntimeException(operator, "Operand must be two numbers or two strings.")
+      return add
+
+    if token_type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
+      is_equal = self.interpreter.is_equal
+      if token_type == TokenType.EQUAL_EQUAL:
+        def equal(env):
+          r = right(env)
+          return is_equal(left(env), r)
+        return equal
+
+      def not_equal(env):
+        r = right(env)
+        return not is_equal(left(env), r)
+      return not_equal
+
+    apply = NUMBER_OPERATORS[token_type]
+
+    # A number literal on the right, as in `i < 100`, needs no evaluation or check.
+    if isinstance(expr.right, Expr.Literal) and isinstance(expr.right.value, float):
+      constant = expr.right.value
+      def apply_constant(env):
+        l = left(env)
+        if isinstance(l, float):
+          return apply(l, constant)
+        raise RuntimeException(operator, "Operand must be a number.")
+      return apply_constant
+
+    def apply_numbers(env):
+      r = right(env)
+      l = left(env)
+      if isinstance(l, float) and isinstance(r, float):
+        return apply(l, r)
+      raise RuntimeException(operator, "Operand must be a number.")
+    return apply_numbers
+
+
+  def visit_call_expr(self, expr: Expr.Call) -> Closure:
+    callee = self.compile(expr.callee)
+    arguments = self.compile_block(expr.arguments)
+    paren = expr.paren
+    interpreter = self.interpreter
+
+    def call(env):
+      function = callee(env)
+      values = [argument(env) for argument in arguments]
+      if type(function) is NativeFunction and len(values) == function.param_count:
+        try:
+          return function.function(*values)
+        except NativeError as e:
+          raise RuntimeException(paren, str(e)) from None
+      if not isinstance(function, LoxCallable):
+        raise RuntimeException(paren, 'Can only call functions and classes.')
+      if len(values) != function.arity():
+        raise RuntimeException(paren, f'Expected {function.arity()} arguments but got {len(values)}.')
+      return function.call(interpreter, values)
+    return call
@@ -0,0 +1,29 @@
+from pylox.interpreter.environment import Environment
+from pylox.interpreter.interpreter import RETURN
+from pylox.interpreter.lox_function import LoxFunction
+from pylox.parser.stmt import Stmt
+
+
+class ClosureFunction(LoxFunction):
+  # `body` holds the compiled statements before any trailing return, whose
+  # value is compiled into `result`. `checked` says whether a statement in
+  # `body` can signal RETURN.
+  def __init__(self, declaration: Stmt.Function, body: tuple, checked: bool, result):
+    super().__init__(declaration)
+    self.body = body
+    self.checked = checked
+    self.result = result
+
+  def call(self, interpreter, arguments: list[object]) -> object:
+    environment = Environment(interpreter.Globals, self.declaration.slot_count)
+    environment.slots[:len(arguments)] = arguments
+    if self.checked:
+      for stmt in self.body:
+        if stmt(environment) is RETURN:
+          return interpreter.return_value
+    else:
+      for stmt in self.body:
+        stmt(environment)
+    if self.result is not None:
+      return self.result(environment)
+    return None
@@ -0,0 +1,18 @@
+from pylox.interpreter.closure_compiler import ClosureCompiler
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.parser.stmt import Stmt
+
+
+# Same entry point, globals, stringify and truthiness rules as Interpreter, but
+# the resolved statements are compiled to closures by ClosureCompiler first and
+# then run by calling them.
+class ClosureInterpreter(Interpreter):
+
+  def interpret(self, statements: list[Stmt]):
+    try:
+      compiler = ClosureCompiler(self)
+      for run in [compiler.compile(s) for s in statements]:
+        run(self.Globals)
+    except RuntimeException as e:
+      self.error_callback(e)
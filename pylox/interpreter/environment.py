@@ -1,15 +1,32 @@
 from __future__ import annotations
+import itertools
 from pylox.interpreter.runtime_exception import RuntimeException
 from pylox.scanner.token_item import TokenItem
 
 
+# The global environment keeps its variables in the `values` dict. Block and
+# function environments hold their locals in `slots`, indexed by the slot the
+# Resolver assigned, and are reached by walking `depth` enclosing links.
+#
+# `version` changes whenever define or assign writes to `values`. Versions
+# come from one counter shared by every global environment, so a version seen
+# on one never matches another; Expr.Variable caches a global's value
+# together with the version it was read at. Only the global environment has
+# values, so block and call environments keep the class default of 0.
 class Environment:
-  def __init__(self, enclosing: Environment | None = None):
+  versions = itertools.count(1)
+  version = 0
+
+  def __init__(self, enclosing: Environment | None = None, size: int = 0):
     self.values = {}
+    self.slots: list[object] = [None] * size
     self.enclosing = enclosing
+    if enclosing is None:
+      self.version = next(Environment.versions)
 
   def define(self, name: str, value: object) -> None:
     self.values[name] = value
+    self.version = next(Environment.versions)
 
   def get(self, name: TokenItem):
     if name.lexeme in self.values:
@@ -22,10 +39,26 @@ class Environment:
   def assign(self, name: TokenItem, value: object) -> None:
     if name.lexeme in self.values:
       self.values[name.lexeme] = value
+      self.version = next(Environment.versions)
       return
     
     if self.enclosing:
       self.enclosing.assign(name, value)
       return
     
-    raise RuntimeException(name, f"Undefined variable '{name.lexeme}'.")
\ No newline at end of file
+    raise RuntimeException(name, f"Undefined variable '{name.lexeme}'.")
+
+
+  def get_at(self, depth: int, slot: int) -> object:
+    environment = self
+    while depth:
+      environment = environment.enclosing
+      depth -= 1
+    return environment.slots[slot]
+
+  def assign_at(self, depth: int, slot: int, value: object) -> None:
+    environment = self
+    while depth:
+      environment = environment.enclosing
+      depth -= 1
+    environment.slots[slot] = value
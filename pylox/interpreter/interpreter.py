@@ -1,21 +1,36 @@
 
-from typing import Callable
+from typing import Callable, TextIO
 from pylox.interpreter.environment import Environment
+from pylox.interpreter.lox_callable import LoxCallable
+from pylox.natives.registry import NativeError, NativeFunction, install
 from pylox.parser.expr import Expr
 from pylox.parser.stmt import Stmt
-from pylox.scanner.token_type import TokenType
 from pylox.scanner.token_item import TokenItem
 from pylox.interpreter.runtime_exception import RuntimeException
 
 
+# Completion signal for `return`. Executing a statement yields None when it
+# completes normally and RETURN when a return statement ran inside it, with
+# the value left in Interpreter.return_value. Blocks, ifs and loops pass the
+# signal up until LoxFunction.call picks the value up, so returning never
+# raises through the Python frames in between.
+RETURN = 'return'
+
+
 class Interpreter(Expr.Visitor, Stmt.Visitor):
 
   def __init__(self, error_callback: Callable[[RuntimeException], None]):
-    from pylox.interpreter.clock_function import ClockFunction
     self.error_callback = error_callback
     self.Globals = Environment()
     self.environment = self.Globals
-    self.Globals.define("clock", ClockFunction())
+    self.return_value: object = None
+    # Where print statements write; None means the current sys.stdout.
+    self.output: TextIO | None = None
+    # Functions flagged pure get an LRU cache of this many results when it
+    # is above zero; `memoized` collects them for reporting.
+    self.memo_size = 0
+    self.memoized: list = []
+    install(self.Globals.define)
 
 
   def interpret(self, statements: list[Stmt]):
@@ -42,16 +57,17 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
     return expr.accept(self)
 
 
-  def execute(self, stmt: Stmt):
-    stmt.accept(self)
+  def execute(self, stmt: Stmt) -> str | None:
+    return stmt.accept(self)
 
   
-  def execute_block(self, statements: list[Stmt], environment: Environment):
+  def execute_block(self, statements: list[Stmt], environment: Environment) -> str | None:
     previous = self.environment
     try:
       self.environment = environment
       for stmt in statements:
-        self.execute(stmt)
+        if stmt.accept(self) is RETURN:
+          return RETURN
     finally:
       self.environment = previous
 
@@ -68,53 +84,89 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
     return a == b
 
 
-  def check_number_operand(self, operator: TokenItem, operand: object):
-    if isinstance(operand, float): return
-    raise RuntimeException(operator, "Operand must be a number.")
-
-
-  def check_number_operands(self, operator: TokenItem, left: object, right: object):
-    if isinstance(left, float) and isinstance(right, float): 
-      return
-    raise RuntimeException(operator, "Operand must be a number.")
-
-
   def visit_expression_stmt(self, stmt: Stmt.Expression) -> None:
     self.evaluate(stmt.expression)
 
 
   def visit_function_stmt(self, stmt: Stmt.Function) -> None:
     from pylox.interpreter.lox_function import LoxFunction
-    function: LoxFunction = LoxFunction(stmt)
-    self.environment.define(stmt.name.lexeme, function)
+    from pylox.interpreter.memoized_function import MemoizedFunction
+    function: LoxFunction
+    if stmt.pure and self.memo_size:
+      function = MemoizedFunction(stmt, self.memo_size)
+      self.memoized.append(function)
+    else:
+      function = LoxFunction(stmt)
+    self.define(stmt.name, stmt.slot, function)
 
 
-  def visit_if_stmt(self, stmt: Stmt.If) -> None:
+  def visit_if_stmt(self, stmt: Stmt.If) -> str | None:
     if self.is_truthy(self.evaluate(stmt.condition)):
-      self.execute(stmt.then_branch)
+      return self.execute(stmt.then_branch)
     elif stmt.else_branch:
-      self.execute(stmt.else_branch)
+      return self.execute(stmt.else_branch)
 
 
   def visit_print_stmt(self, stmt: Stmt.Print) -> None:
     value: object = self.evaluate(stmt.expression)
-    print(self.stringify(value))
+    print(self.stringify(value), file=self.output)
 
 
   def visit_var_stmt(self, stmt: Stmt.Var) -> None:
     value: object = None
     if stmt.initializer:
       value = self.evaluate(stmt.initializer)
-    self.environment.define(stmt.name.lexeme, value)
+    self.define(stmt.name, stmt.slot, value)
+
+
+  def define(self, name: TokenItem, slot: int | None, value: object) -> None:
+    if slot is None:
+      self.Globals.define(name.lexeme, value)
+    else:
+      self.environment.slots[slot] = value
 
   
-  def visit_while_stmt(self, stmt: Stmt.While) -> None:
+  def visit_return_stmt(self, stmt: Stmt.Return) -> str:
+    self.return_value = None if stmt.value is None else self.evaluate(stmt.value)
+    return RETURN
+
+  
+  # Loops flagged by pylox.interpreter.vectorize first try to run all at once.
+  def visit_while_stmt(self, stmt: Stmt.While) -> str | None:
+    if stmt.vector is not None and stmt.vector.run(self):
+      return None
     while self.is_truthy(self.evaluate(stmt.condition)):
-      self.execute(stmt.body)
+      if self.execute(stmt.body) is RETURN:
+        return RETURN
 
 
-  def visit_block_stmt(self, stmt: Stmt.Block):
-    self.execute_block(stmt.statements, Environment(enclosing=self.environment))
+  # One environment for the whole loop; the increment is evaluated directly
+  # and an inline body's statements run in the loop scope.
+  def visit_for_stmt(self, stmt: Stmt.For) -> str | None:
+    previous = self.environment
+    self.environment = Environment(previous, stmt.slot_count)
+    try:
+      if stmt.initializer:
+        self.execute(stmt.initializer)
+      if stmt.vector is not None and stmt.vector.run(self):
+        return None
+
+      condition, increment = stmt.condition, stmt.increment
+      body = stmt.body.statements if stmt.inline_body else (stmt.body,)
+      while self.is_truthy(self.evaluate(condition)):
+        for s in body:
+          if self.execute(s) is RETURN:
+            return RETURN
+        if increment is not None:
+          self.evaluate(increment)
+    finally:
+      self.environment = previous
+
+
+  def visit_block_stmt(self, stmt: Stmt.Block) -> str | None:
+    if stmt.scoped:
+      return self.execute_block(stmt.statements, Environment(self.environment, stmt.slot_count))
+    return self.execute_block(stmt.statements, self.environment)
 
 
   def visit_literal_expr(self, expr: Expr.Literal):
@@ -122,16 +174,7 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
   
 
   def visit_logical_expr(self, expr: Expr.Logical):
-    left: object = self.evaluate(expr.left)
-
-    if expr.operator.token_type == TokenType.OR:
-      if self.is_truthy(left): 
-        return left
-    else:
-      if not self.is_truthy(left): 
-        return left
-      
-    return self.evaluate(expr.right)
+    return expr.handler(self, expr)
 
 
   def visit_grouping_expr(self, expr: Expr.Grouping):
@@ -139,86 +182,80 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
 
 
   def visit_unary_expr(self, expr: Expr.Unary):
-    right: object = self.evaluate(expr.right)
-
-    if expr.operator.token_type == TokenType.MINUS:
-      self.check_number_operand(expr.operator, right)
-      return -float(right)
-    
-    if expr.operator.token_type == TokenType.BANG:
-      return not self.is_truthy(right)
+    return expr.handler(expr.operator, self.evaluate(expr.right))
     
   
   def visit_variable_expr(self, expr: Expr.Variable):
-    return self.environment.get(expr.name)
+    if expr.slot is not None:
+      return self.environment.get_at(expr.depth, expr.slot)
+
+    globals = self.Globals
+    if expr.cache_version == globals.version:
+      return expr.cache_value
+    value = globals.get(expr.name)
+    expr.cache_value = value
+    expr.cache_version = globals.version
+    return value
   
 
   def visit_assign_expr(self, expr: Expr.Assign):
     value: object = self.evaluate(expr.value)
-    self.environment.assign(expr.name, value)
+    if expr.slot is None:
+      self.Globals.assign(expr.name, value)
+    else:
+      self.environment.assign_at(expr.depth, expr.slot, value)
     return value
   
 
+  # Right operand first, then left; the Resolver picked the handler.
   def visit_binary_expr(self, expr: Expr.Binary):
     right: object = self.evaluate(expr.right)
     left: object = self.evaluate(expr.left)
-
-    if expr.operator.token_type == TokenType.BANG_EQUAL:
-      return not self.is_equal(left, right)
-   
-    if expr.operator.token_type == TokenType.EQUAL_EQUAL:
-      return self.is_equal(left, right)
-
-    if expr.operator.token_type == TokenType.GREATER:
-      self.check_number_operands(expr.operator, left, right)
-      return float(left) > float(right)
-    
-    if expr.operator.token_type == TokenType.GREATER_EQUAL:
-      self.check_number_operands(expr.operator, left, right)
-      return float(left) >= float(right)
-    
-    if expr.operator.token_type == TokenType.LESS:
-      self.check_number_operands(expr.operator, left, right)
-      return float(left) < float(right)
-    
-    if expr.operator.token_type == TokenType.LESS_EQUAL:
-      self.check_number_operands(expr.operator, left, right)
-      return float(left) <= float(right)
-
-    if expr.operator.token_type == TokenType.MINUS:
-      self.check_number_operands(expr.operator, left, right)
-      return float(left) - float(right)
-    
-    if expr.operator.token_type == TokenType.PLUS:
-      if isinstance(left, float) and isinstance(right, float):
-        return float(left) + float(right)
-      if isinstance(left, str) and isinstance(right, str):
-        return str(left) + str(right)
-      raise RuntimeException(expr.operator, "Operand must be two numbers or two strings.")
-      
-    if expr.operator.token_type == TokenType.SLASH:
-      self.check_number_operands(expr.operator, left, right)
-      return float(left) / float(right)
-    
-    if expr.operator.token_type == TokenType.STAR:
-      self.check_number_operands(expr.operator, left, right)
-      return float(left) * float(right)
+    return expr.handler(expr.operator, left, right)
     
 
   def visit_call_expr(self, expr: Expr.Call):
-    from pylox.interpreter.lox_callable import LoxCallable
     function = self.evaluate(expr.callee)
+    if type(function) is NativeFunction:
+      return self.call_native(function, expr)
 
     arguments: list[object] = []
     for arg in expr.arguments:
       arguments.append(self.evaluate(arg))
 
     if not isinstance(function, LoxCallable):
-      return self.error_callback('Can only call functions and classes.')
+      raise RuntimeException(expr.paren, 'Can only call functions and classes.')
     if len(arguments) != function.arity():
-      return self.error_callback(f'Expected {function.arity()} arguments but got {len(arguments)}.')
+      raise RuntimeException(expr.paren, f'Expected {function.arity()} arguments but got {len(arguments)}.')
     
     return function.call(self, arguments)
 
 
+  # Fast path for natives: arguments go straight from evaluation into the
+  # Python call, without an intermediate list or the LoxCallable protocol.
+  def call_native(self, native: NativeFunction, expr: Expr.Call):
+    arguments = expr.arguments
+    count = len(arguments)
+    try:
+      if count == 1:
+        first = self.evaluate(arguments[0])
+        if native.param_count == 1:
+          return native.function(first)
+      elif count == 2:
+        first = self.evaluate(arguments[0])
+        second = self.evaluate(arguments[1])
+        if native.param_count == 2:
+          return native.function(first, second)
+      elif count == 0:
+        if native.param_count == 0:
+          return native.function()
+      else:
+        values = [self.evaluate(arg) for arg in arguments]
+        if native.param_count == count:
+          return native.function(*values)
+    except NativeError as e:
+      raise RuntimeException(expr.paren, str(e))
+    raise RuntimeException(expr.paren, f'Expected {native.param_count} arguments but got {count}.')
+
+
 
@@ -1,7 +1,9 @@
-
+from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
-from pylox.interpreter.interpreter import Interpreter
+if TYPE_CHECKING:
+  from pylox.interpreter.interpreter import Interpreter
 
 
 class LoxCallable(ABC):
@@ -12,4 +14,3 @@ class LoxCallable(ABC):
   @abstractmethod
   def call(self, interpreter: Interpreter, arguments: list[object]) -> object:
     pass
-
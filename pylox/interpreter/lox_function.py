@@ -1,18 +1,33 @@
-
 from pylox.parser.stmt import Stmt
 from pylox.interpreter.lox_callable import LoxCallable
 from pylox.interpreter.environment import Environment
-from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.interpreter import Interpreter, RETURN
 
 class LoxFunction(LoxCallable):
   def __init__(self, declaration: Stmt.Function):
     self.declaration = declaration   
+    # Fast path: a trailing `return` is evaluated directly rather than
+    # executed, so the common `return expr;` ending never raises the
+    # completion signal at all.
+    body = declaration.body
+    self.returns_last = bool(body) and isinstance(body[-1], Stmt.Return)
+    self.body = body[:-1] if self.returns_last else body
+    self.result = body[-1].value if self.returns_last else None
 
   def call(self, interpreter: Interpreter, arguments: list[object]) -> object:
-    environment = Environment(interpreter.Globals)
-    for i in range(len(self.declaration.params)):
-      environment.define(self.declaration.params[i].lexeme, arguments[i])
-    interpreter.execute_block(self.declaration.body, environment)
+    environment = Environment(interpreter.Globals, self.declaration.slot_count)
+    environment.slots[:len(arguments)] = arguments
+    previous = interpreter.environment
+    try:
+      interpreter.environment = environment
+      for stmt in self.body:
+        if stmt.accept(interpreter) is RETURN:
+          return interpreter.return_value
+      if self.result is not None:
+        return self.result.accept(interpreter)
+      return None
+    finally:
+      interpreter.environment = previous
 
   def arity(self):
     return len(self.declaration.params)
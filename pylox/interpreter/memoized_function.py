@@ -0,0 +1,63 @@
+import math
+from collections import OrderedDict
+
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.lox_function import LoxFunction
+from pylox.interpreter.rope import Rope
+from pylox.parser.stmt import Stmt
+
+
+# Hashable key for a call's arguments, or None when one of them isn't a
+# number, string (Ropes are flattened), nil or bool. Bools are tagged so
+# `true` and `1` differ, and zeros carry their sign so `-0` and `0` (which
+# print differently) do too.
+def memo_key(arguments: list[object]) -> tuple | None:
+  key = []
+  for value in arguments:
+    kind = type(value)
+    if kind is float:
+      key.append(value if value else (0.0, math.copysign(1.0, value)))
+    elif kind is str or value is None:
+      key.append(value)
+    elif kind is Rope:
+      key.append(str(value))
+    elif kind is bool:
+      key.append((bool, value))
+    else:
+      return None
+  return tuple(key)
+
+
+# A LoxFunction flagged pure by pylox.interpreter.purity, with a bounded LRU
+# cache of results keyed by argument values.
+class MemoizedFunction(LoxFunction):
+  def __init__(self, declaration: Stmt.Function, size: int):
+    super().__init__(declaration)
+    self.size = size
+    self.cache: OrderedDict[tuple, object] = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+
+  # Empties the cache and stops caching, for when a later run rebinds a
+  # global the results may depend on.
+  def forget(self) -> None:
+    self.cache.clear()
+    self.size = 0
+
+  def call(self, interpreter: Interpreter, arguments: list[object]) -> object:
+    key = memo_key(arguments) if self.size else None
+    if key is None:
+      return super().call(interpreter, arguments)
+
+    cache = self.cache
+    if key in cache:
+      self.hits += 1
+      cache.move_to_end(key)
+      return cache[key]
+
+    self.misses += 1
+    result = super().call(interpreter, arguments)
+    cache[key] = result
+    if len(cache) > self.size:
+      cache.popitem(last=False)
+    return result
@@ -0,0 +1,137 @@
+from typing import Callable
+
+from pylox.interpreter.rope import Rope, concat
+from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.scanner.token_item import TokenItem
+from pylox.scanner.token_type import TokenType
+
+
+# Handlers for each operator, looked up once per node by the Resolver and
+# stored on the node, so the Interpreter calls the operation directly instead
+# of comparing operator.token_type against every TokenType it knows.
+#
+# Binary handlers take (operator, left, right) with both operands already
+# evaluated; unary handlers take (operator, right); logical handlers take
+# (interpreter, expr) since they decide whether to evaluate the right side.
+
+
+def is_truthy(obj: object) -> bool:
+  return obj is not None and obj is not False
+
+
+def is_equal(a: object, b: object) -> bool:
+  if a is None:
+    return b is None
+  return a == b
+
+
+def number_error(operator: TokenItem):
+  raise RuntimeException(operator, "Operand must be a number.")
+
+
+def equal(operator: TokenItem, left: object, right: object) -> bool:
+  return is_equal(left, right)
+
+
+def not_equal(operator: TokenItem, left: object, right: object) -> bool:
+  return not is_equal(left, right)
+
+
+def greater(operator: TokenItem, left: object, right: object) -> bool:
+  if isinstance(left, float) and isinstance(right, float):
+    return left > right
+  number_error(operator)
+
+
+def greater_equal(operator: TokenItem, left: object, right: object) -> bool:
+  if isinstance(left, float) and isinstance(right, float):
+    return left >= right
+  number_error(operator)
+
+
+def less(operator: TokenItem, left: object, right: object) -> bool:
+  if isinstance(left, float) and isinstance(right, float):
+    return left < right
+  number_error(operator)
+
+
+def less_equal(operator: TokenItem, left: object, right: object) -> bool:
+  if isinstance(left, float) and isinstance(right, float):
+    return left <= right
+  number_error(operator)
+
+
+def subtract(operator: TokenItem, left: object, right: object) -> float:
+  if isinstance(left, float) and isinstance(right, float):
+    return left - right
+  number_error(operator)
+
+
+# Strings concatenate through pylox.interpreter.rope, so long strings built
+# up piece by piece become Ropes.
+def add(operator: TokenItem, left: object, right: object) -> float | str | Rope:
+  if isinstance(left, float) and isinstance(right, float):
+    return left + right
+  if isinstance(left, (str, Rope)) and isinstance(right, (str, Rope)):
+    return concat(left, right)
+  raise RuntimeException(operator, "Operand must be two numbers or two strings.")
+
+
+def divide(operator: TokenItem, left: object, right: object) -> float:
+  if isinstance(left, float) and isinstance(right, float):
+    return left / right
+  number_error(operator)
+
+
+def multiply(operator: TokenItem, left: object, right: object) -> float:
+  if isinstance(left, float) and isinstance(right, float):
+    return left * right
+  number_error(operator)
+
+
+def negate(operator: TokenItem, right: object) -> float:
+  if isinstance(right, float):
+    return -right
+  number_error(operator)
+
+
+def logical_not(operator: TokenItem, right: object) -> bool:
+  return not is_truthy(right)
+
+
+def logical_or(interpreter, expr) -> object:
+  left = interpreter.evaluate(expr.left)
+  if left is not None and left is not False:
+    return left
+  return interpreter.evaluate(expr.right)
+
+
+def logical_and(interpreter, expr) -> object:
+  left = interpreter.evaluate(expr.left)
+  if left is None or left is False:
+    return left
+  return interpreter.evaluate(expr.right)
+
+
+BINARY: dict[TokenType, Callable[[TokenItem, object, object], object]] = {
+  TokenType.BANG_EQUAL:    not_equal,
+  TokenType.EQUAL_EQUAL:   equal,
+  TokenType.GREATER:       greater,
+  TokenType.GREATER_EQUAL: greater_equal,
+  TokenType.LESS:          less,
+  TokenType.LESS_EQUAL:    less_equal,
+  TokenType.MINUS:         subtract,
+  TokenType.PLUS:          add,
+  TokenType.SLASH:         divide,
+  TokenType.STAR:          multiply,
+}
+
+UNARY: dict[TokenType, Callable[[TokenItem, object], object]] = {
+  TokenType.MINUS: negate,
+  TokenType.BANG:  logical_not,
+}
+
+LOGICAL: dict[TokenType, Callable[[object, object], object]] = {
+  TokenType.OR:  logical_or,
+  TokenType.AND: logical_and,
+}
@@ -0,0 +1,239 @@
+from pylox.interpreter import operators
+from pylox.interpreter.rope import Rope
+from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.parser.expr import Expr
+from pylox.parser.fields import declares, fields
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_type import TokenType
+
+
+# Names assigned anywhere under `node`, used to tell which locals keep the
+# value they were declared with.
+def assigned_names(node, names: set[str]) -> set[str]:
+  if isinstance(node, Expr.Assign):
+    names.add(node.name.lexeme)
+  for value in fields(node):
+    if isinstance(value, list):
+      for item in value:
+        if hasattr(item, 'accept'):
+          assigned_names(item, names)
+    elif hasattr(value, 'accept'):
+      assigned_names(value, names)
+  return names
+
+
+# Tree-to-tree pass run after Parser.parse and before the Resolver.
+#
+#   -O0  leaves the program untouched.
+#   -O1  folds Unary/Binary/Logical/Grouping nodes whose operands are literals,
+#        substitutes locals that are declared with a literal and never
+#        assigned, drops if/while/for branches that can never run, and splices
+#        blocks that declare nothing into the enclosing statement list.
+#
+# Folding applies the same operator handlers the Interpreter runs, so the
+# folded value is exactly what the program would compute. A node whose evaluation fails is
+# left in place, so the error is still raised, and reported, at run time.
+class Optimizer(Expr.Visitor, Stmt.Visitor):
+
+  def __init__(self, level: int = 1):
+    self.level = level
+    # Innermost-last local scopes: name -> the Literal it always holds, or
+    # None when it can change. Globals are never tracked.
+    self.scopes: list[dict[str, Expr.Literal | None]] = []
+    self.assigned: list[set[str]] = []
+
+
+  def optimize(self, statements: list[Stmt]) -> list[Stmt]:
+    if self.level < 1:
+      return statements
+    return self.statements(statements)
+
+
+  def statements(self, statements: list[Stmt]) -> list[Stmt]:
+    result = []
+    for stmt in statements:
+      stmt = stmt.accept(self)
+      if stmt is None:
+        continue
+      if isinstance(stmt, Stmt.Block) and not declares(stmt.statements):
+        result.extend(stmt.statements)
+      else:
+        result.append(stmt)
+      # Nothing after a return in the same list can run.
+      if result and isinstance(result[-1], Stmt.Return):
+        break
+    return result
+
+
+  def statement(self, stmt: Stmt) -> Stmt:
+    stmt = stmt.accept(self)
+    return Stmt.Block([]) if stmt is None else stmt
+
+
+  def expression(self, expr: Expr) -> Expr:
+    return expr.accept(self)
+
+
+  def fold(self, expr: Expr.Unary | Expr.Binary) -> Expr:
+    try:
+      if isinstance(expr, Expr.Unary):
+        value = operators.UNARY[expr.operator.token_type](expr.operator, expr.right.value)
+      else:
+        value = operators.BINARY[expr.operator.token_type](expr.operator, expr.left.value, expr.right.value)
+    except (RuntimeException, ArithmeticError):
+      return expr
+    # Literals are plain values on every backend.
+    if type(value) is Rope:
+      value = str(value)
+    return Expr.Literal(value)
+
+
+  def scoped(self, statements: list[Stmt], scope: dict[str, Expr.Literal | None]) -> list[Stmt]:
+    self.scopes.append(scope)
+    self.assigned.append(set())
+    for stmt in statements:
+      assigned_names(stmt, self.assigned[-1])
+    try:
+      return self.statements(statements)
+    finally:
+      self.scopes.pop()
+      self.assigned.pop()
+
+
+  def visit_block_stmt(self, stmt: Stmt.Block) -> Stmt | None:
+    statements = self.scoped(stmt.statements, {})
+    return Stmt.Block(statements) if statements else None
+
+
+  def visit_function_stmt(self, stmt: Stmt.Function) -> Stmt:
+    self.declare(stmt.name.lexeme, None)
+    # A function body sees its parameters and the globals, not the scopes
+    # around the declaration.
+    enclosing = self.scopes, self.assigned
+    self.scopes, self.assigned = [], []
+    body = self.scoped(stmt.body, {param.lexeme: None for param in stmt.params})
+    self.scopes, self.assigned = enclosing
+    return Stmt.Function(stmt.name, stmt.params, body)
+
+
+  def declare(self, name: str, value: Expr.Literal | None) -> None:
+    if self.scopes:
+      self.scopes[-1][name] = None if name in self.assigned[-1] else value
+
+
+  def visit_var_stmt(self, stmt: Stmt.Var) -> Stmt:
+    if stmt.initializer is None:
+      self.declare(stmt.name.lexeme, Expr.Literal(None))
+      return stmt
+
+    initializer = self.expression(stmt.initializer)
+    self.declare(stmt.name.lexeme, initializer if isinstance(initializer, Expr.Literal) else None)
+    return Stmt.Var(stmt.name, initializer)
+
+
+  def visit_expression_stmt(self, stmt: Stmt.Expression) -> Stmt | None:
+    expression = self.expression(stmt.expression)
+    if isinstance(expression, Expr.Literal):
+      return None
+    return Stmt.Expression(expression)
+
+
+  def visit_return_stmt(self, stmt: Stmt.Return) -> Stmt:
+    return Stmt.Return(stmt.keyword, self.expression(stmt.value) if stmt.value else None)
+
+
+  def visit_print_stmt(self, stmt: Stmt.Print) -> Stmt:
+    return Stmt.Print(stmt.keyword, self.expression(stmt.expression))
+
+
+  def visit_if_stmt(self, stmt: Stmt.If) -> Stmt | None:
+    condition = self.expression(stmt.condition)
+    if isinstance(condition, Expr.Literal):
+      if operators.is_truthy(condition.value):
+        return stmt.then_branch.accept(self)
+      return stmt.else_branch.accept(self) if stmt.else_branch else None
+
+    else_branch = self.statement(stmt.else_branch) if stmt.else_branch else None
+    return Stmt.If(stmt.keyword, condition, self.statement(stmt.then_branch), else_branch)
+
+
+  def visit_while_stmt(self, stmt: Stmt.While) -> Stmt | None:
+    condition = self.expression(stmt.condition)
+    if isinstance(condition, Expr.Literal):
+      if not operators.is_truthy(condition.value):
+        return None
+      condition = Expr.Literal(True)
+    return Stmt.While(stmt.keyword, condition, self.statement(stmt.body))
+
+
+  # The loop scope holds the initializer's variable, which the increment
+  # usually assigns, so it is rarely substituted.
+  def visit_for_stmt(self, stmt: Stmt.For) -> Stmt | None:
+    self.scopes.append({})
+    self.assigned.append(assigned_names(stmt, set()))
+    try:
+      initializer = stmt.initializer.accept(self) if stmt.initializer else None
+      condition = self.expression(stmt.condition)
+      if isinstance(condition, Expr.Literal):
+        if not operators.is_truthy(condition.value):
+          return Stmt.Block([initializer]) if initializer else None
+        condition = Expr.Literal(True)
+      increment = self.expression(stmt.increment) if stmt.increment else None
+      if isinstance(increment, Expr.Literal):
+        increment = None
+      return Stmt.For(stmt.keyword, initializer, condition, increment, self.statement(stmt.body))
+    finally:
+      self.scopes.pop()
+      self.assigned.pop()
+
+
+  def visit_literal_expr(self, expr: Expr.Literal) -> Expr:
+    return expr
+
+
+  def visit_grouping_expr(self, expr: Expr.Grouping) -> Expr:
+    expression = self.expression(expr.expression)
+    if isinstance(expression, Expr.Literal):
+      return expression
+    return Expr.Grouping(expression)
+
+
+  def visit_variable_expr(self, expr: Expr.Variable) -> Expr:
+    for scope in reversed(self.scopes):
+      if expr.name.lexeme in scope:
+        value = scope[expr.name.lexeme]
+        return Expr.Literal(value.value) if value is not None else expr
+    return expr
+
+
+  def visit_assign_expr(self, expr: Expr.Assign) -> Expr:
+    return Expr.Assign(expr.name, self.expression(expr.value))
+
+
+  def visit_logical_expr(self, expr: Expr.Logical) -> Expr:
+    left = self.expression(expr.left)
+    right = self.expression(expr.right)
+    if isinstance(left, Expr.Literal):
+      truthy = operators.is_truthy(left.value)
+      if expr.operator.token_type == TokenType.OR:
+        return left if truthy else right
+      return right if truthy else left
+    return Expr.Logical(left, expr.operator, right)
+
+
+  def visit_unary_expr(self, expr: Expr.Unary) -> Expr:
+    unary = Expr.Unary(expr.operator, self.expression(expr.right))
+    if isinstance(unary.right, Expr.Literal):
+      return self.fold(unary)
+    return unary
+
+
+  def visit_binary_expr(self, expr: Expr.Binary) -> Expr:
+    binary = Expr.Binary(self.expression(expr.left), expr.operator, self.expression(expr.right))
+    if isinstance(binary.left, Expr.Literal) and isinstance(binary.right, Expr.Literal):
+      return self.fold(binary)
+    return binary
+
+
+  def visit_call_expr(self, expr: Expr.Call) -> Expr:
+    return Expr.Call(self.expression(expr.callee), expr.paren, [self.expression(a) for a in expr.arguments])
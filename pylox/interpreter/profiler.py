@@ -0,0 +1,96 @@
+from time import perf_counter_ns
+from typing import TextIO
+
+from pylox.parser.fields import fields
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_item import TokenItem
+
+
+SCRIPT = '<script>'
+
+
+# Line of the first token under `node`, or None when it holds none (as in
+# `1;` or `{}`). Fields are walked in declaration order, which is source order.
+def first_line(node) -> int | None:
+  for value in fields(node):
+    if isinstance(value, TokenItem):
+      return value.line
+    items = value if isinstance(value, list) else [value]
+    for item in items:
+      if isinstance(item, TokenItem):
+        return item.line
+      if hasattr(item, 'accept'):
+        line = first_line(item)
+        if line is not None:
+          return line
+  return None
+
+
+# Counts and times collected by ProfilingInterpreter. Times are inclusive and
+# only taken by the outermost active execution of a line or function, so
+# recursion and nesting never count the same nanoseconds twice. Self time per
+# call stack feeds the collapsed-stack (flamegraph) output.
+class Profiler:
+
+  def __init__(self):
+    # line (None when unknown) -> [executions, total ns, active]
+    self.lines: dict[int | None, list] = {}
+    # Stmt.Function -> [calls, total ns, self ns, active]
+    self.functions: dict[Stmt.Function, list] = {}
+    # call stack (function names, outermost first) -> self ns
+    self.stacks: dict[tuple[str, ...], int] = {}
+    # [path, start ns, ns spent in callees] per active call, script first
+    self.frames: list[list] = []
+
+
+  def enter(self, declaration: Stmt.Function) -> list:
+    stats = self.functions.get(declaration)
+    if stats is None:
+      stats = self.functions[declaration] = [0, 0, 0, 0]
+    stats[0] += 1
+    stats[3] += 1
+    path = self.frames[-1][0] + (declaration.name.lexeme,)
+    self.frames.append([path, perf_counter_ns(), 0])
+    return stats
+
+
+  def exit(self, stats: list) -> None:
+    path, start, children = self.frames.pop()
+    elapsed = perf_counter_ns() - start
+    stats[3] -= 1
+    if not stats[3]:
+      stats[1] += elapsed
+    stats[2] += elapsed - children
+    self.frames[-1][2] += elapsed
+    self.stacks[path] = self.stacks.get(path, 0) + elapsed - children
+
+
+  # start() and finish() bracket each run of a program, as the script frame.
+  def start(self) -> None:
+    self.frames = [[(SCRIPT,), perf_counter_ns(), 0]]
+
+
+  def finish(self) -> None:
+    path, start, children = self.frames.pop()
+    self.stacks[path] = self.stacks.get(path, 0) + perf_counter_ns() - start - children
+
+
+  def report(self, out: TextIO, limit: int = 20) -> None:
+    print(f'{"line":>6} {"count":>10} {"total ms":>10}', file=out)
+    lines = sorted(self.lines.items(), key=lambda item: item[1][1], reverse=True)
+    for line, (count, total, _) in lines[:limit]:
+      print(f'{"?" if line is None else line:>6} {count:>10} {total / 1e6:>10.3f}', file=out)
+
+    print(f'\n{"function":<24} {"calls":>10} {"total ms":>10} {"self ms":>10}', file=out)
+    functions = sorted(self.functions.items(), key=lambda item: item[1][1], reverse=True)
+    for declaration, (calls, total, own, _) in functions[:limit]:
+      name = f'{declaration.name.lexeme}:{declaration.name.line}'
+      print(f'{name:<24} {calls:>10} {total / 1e6:>10.3f} {own / 1e6:>10.3f}', file=out)
+
+
+  # One `frame;frame;frame weight` line per call stack, weights in
+  # microseconds of self time, as flamegraph.pl and speedscope expect.
+  def collapsed(self, out: TextIO) -> None:
+    for path, own in sorted(self.stacks.items()):
+      if own >= 1000:
+        print(f'{";".join(path)} {own // 1000}', file=out)
@@ -0,0 +1,95 @@
+from time import perf_counter_ns
+
+from pylox.interpreter.environment import Environment
+from pylox.interpreter.interpreter import RETURN, Interpreter
+from pylox.interpreter.lox_function import LoxFunction
+from pylox.interpreter.profiler import Profiler, first_line
+from pylox.parser.stmt import Stmt
+
+
+# LoxFunction whose calls are recorded by the interpreter's Profiler. The body
+# always goes through Interpreter.execute, without LoxFunction's trailing
+# return fast path, so every statement in it is counted on its own line.
+class ProfiledFunction(LoxFunction):
+
+  def call(self, interpreter: 'ProfilingInterpreter', arguments: list[object]) -> object:
+    environment = Environment(interpreter.Globals, self.declaration.slot_count)
+    environment.slots[:len(arguments)] = arguments
+    profiler = interpreter.profiler
+    stats = profiler.enter(self.declaration)
+    previous = interpreter.environment
+    try:
+      interpreter.environment = environment
+      for stmt in self.declaration.body:
+        if interpreter.execute(stmt) is RETURN:
+          return interpreter.return_value
+      return None
+    finally:
+      interpreter.environment = previous
+      profiler.exit(stats)
+
+
+# Interpreter that counts and times every statement per source line and every
+# call per function. Interpreter itself has no hooks, so running without
+# --profile costs nothing. Memoization is not applied while profiling: cached
+# calls would hide the cost being measured.
+class ProfilingInterpreter(Interpreter):
+
+  def __init__(self, error_callback):
+    super().__init__(error_callback)
+    self.profiler = Profiler()
+    # Stmt -> the line it is counted on.
+    self.lines: dict[Stmt, int | None] = {}
+    self.line: int | None = None
+
+
+  def interpret(self, statements: list[Stmt]):
+    self.profiler.start()
+    try:
+      super().interpret(statements)
+    finally:
+      self.profiler.finish()
+
+
+  def execute(self, stmt: Stmt) -> str | None:
+    line = self.lines.get(stmt, -1)
+    if line == -1:
+      # A statement without tokens of its own is counted on the line of the
+      # statement that ran it, or on no line (None) at the top level.
+      line = first_line(stmt)
+      line = self.lines[stmt] = self.line if line is None else line
+    stats = self.profiler.lines.get(line)
+    if stats is None:
+      stats = self.profiler.lines[line] = [0, 0, False]
+    stats[0] += 1
+    outer = self.line
+    self.line = line
+    if stats[2]:
+      try:
+        return stmt.accept(self)
+      finally:
+        self.line = outer
+
+    stats[2] = True
+    start = perf_counter_ns()
+    try:
+      return stmt.accept(self)
+    finally:
+      stats[1] += perf_counter_ns() - start
+      stats[2] = False
+      self.line = outer
+
+
+  def execute_block(self, statements: list[Stmt], environment: Environment) -> str | None:
+    previous = self.environment
+    try:
+      self.environment = environment
+      for stmt in statements:
+        if self.execute(stmt) is RETURN:
+          return RETURN
+    finally:
+      self.environment = previous
+
+
+  def visit_function_stmt(self, stmt: Stmt.Function) -> None:
+    self.define(stmt.name, stmt.slot, ProfiledFunction(stmt))
@@ -0,0 +1,90 @@
+from typing import Iterable
+
+from pylox.parser.expr import Expr
+from pylox.parser.fields import fields
+from pylox.parser.stmt import Stmt
+
+
+# Whether running `node` could do anything but compute a value from its
+# arguments: print, write a global, read a global other than one of
+# `pure_names`, or call something that isn't a global named in `pure_names`.
+# Nested function declarations are skipped; their bodies only run if called,
+# and calling a local is already impure.
+def is_impure(node, pure_names: set[str]) -> bool:
+  if isinstance(node, Stmt.Print):
+    return True
+  if isinstance(node, Stmt.Function):
+    return False
+  if isinstance(node, Expr.Assign) and node.slot is None:
+    return True
+  if isinstance(node, Expr.Variable) and node.slot is None:
+    return node.name.lexeme not in pure_names
+  if isinstance(node, Expr.Call):
+    callee = node.callee
+    while isinstance(callee, Expr.Grouping):
+      callee = callee.expression
+    if not (isinstance(callee, Expr.Variable) and callee.slot is None):
+      return True
+
+  for value in fields(node):
+    if isinstance(value, list):
+      if any(hasattr(item, 'accept') and is_impure(item, pure_names) for item in value):
+        return True
+    elif hasattr(value, 'accept') and is_impure(value, pure_names):
+      return True
+  return False
+
+
+# Flags the top-level functions of a resolved program whose result depends
+# only on their arguments, setting Stmt.Function.pure. Candidates are
+# functions whose name is bound exactly once in the program and never
+# assigned; the set is then shrunk until every remaining function only calls
+# functions still in it (or natives listed in `pure_natives` that the program
+# never rebinds). `bound` names the globals earlier runs on the same globals
+# bound or assigned; natives among them are no longer trusted.
+def find_pure_functions(statements: list[Stmt], pure_natives: Iterable[str] = (),
+                        bound: Iterable[str] = ()) -> list[Stmt.Function]:
+  bindings: dict[str, int] = {}
+  functions: dict[str, Stmt.Function] = {}
+  for stmt in statements:
+    if isinstance(stmt, (Stmt.Var, Stmt.Function)):
+      bindings[stmt.name.lexeme] = bindings.get(stmt.name.lexeme, 0) + 1
+    if isinstance(stmt, Stmt.Function):
+      functions[stmt.name.lexeme] = stmt
+
+  assigned = set()
+  for stmt in statements:
+    collect_global_assignments(stmt, assigned)
+
+  pure = {name for name, fn in functions.items() if bindings[name] == 1 and name not in assigned}
+  natives = set(pure_natives) - bindings.keys() - assigned - set(bound)
+  changed = True
+  while changed:
+    names = pure | natives
+    impure = {name for name in pure if any(is_impure(s, names) for s in functions[name].body)}
+    pure -= impure
+    changed = bool(impure)
+
+  for name, function in functions.items():
+    function.pure = name in pure
+  return [functions[name] for name in pure]
+
+
+# The global names a program binds at the top level or assigns anywhere.
+def global_bindings(statements: list[Stmt]) -> set[str]:
+  names = {stmt.name.lexeme for stmt in statements if isinstance(stmt, (Stmt.Var, Stmt.Function))}
+  for stmt in statements:
+    collect_global_assignments(stmt, names)
+  return names
+
+
+def collect_global_assignments(node, names: set[str]) -> None:
+  if isinstance(node, Expr.Assign) and node.slot is None:
+    names.add(node.name.lexeme)
+  for value in fields(node):
+    if isinstance(value, list):
+      for item in value:
+        if hasattr(item, 'accept'):
+          collect_global_assignments(item, names)
+    elif hasattr(value, 'accept'):
+      collect_global_assignments(value, names)
@@ -0,0 +1,188 @@
+from typing import Callable
+
+from pylox.interpreter import operators
+from pylox.parser.expr import Expr
+from pylox.parser.fields import declares
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_item import TokenItem
+
+
+# Static pass run between Parser.parse and Interpreter.interpret. Every local
+# variable gets a slot in the list-backed Environment of the scope declaring
+# it, and every Variable/Assign records how many environments up that scope is
+# (depth) and which slot to read (slot). Names that resolve to no local scope
+# are globals and keep their dict lookup. Binary, Unary and Logical nodes get
+# the handler for their operator from pylox.interpreter.operators.
+#
+# Functions don't close over the blocks they are declared in: their call
+# environment encloses the globals directly, so a function body starts from a
+# fresh scope chain.
+#
+# Blocks that declare no variable or function get no scope (Block.scoped is
+# False): their statements resolve in the enclosing scope, and the backends
+# run them in the enclosing environment. `blocks` and `scopeless` count the
+# blocks resolved and how many of them were left without a scope.
+class Resolver(Expr.Visitor, Stmt.Visitor):
+
+  def __init__(self, error_callback: Callable[[TokenItem, str], None]):
+    self.error_callback = error_callback
+    self.scopes: list[dict[str, int]] = []
+    self.sizes: list[int] = []
+    self.in_function = False
+    self.blocks = 0
+    self.scopeless = 0
+
+
+  def resolve(self, statements: list[Stmt]) -> None:
+    for stmt in statements:
+      self.resolve_stmt(stmt)
+
+
+  def resolve_stmt(self, stmt: Stmt) -> None:
+    stmt.accept(self)
+
+
+  def resolve_expr(self, expr: Expr) -> None:
+    expr.accept(self)
+
+
+  # Returns the slot for `name` in the innermost scope, or None at the top
+  # level. Redeclaring a name in the same scope reuses its slot.
+  def declare(self, name: TokenItem) -> int | None:
+    if not self.scopes:
+      return None
+    scope = self.scopes[-1]
+    slot = scope.get(name.lexeme)
+    if slot is None:
+      slot = scope[name.lexeme] = self.sizes[-1]
+      self.sizes[-1] += 1
+    return slot
+
+
+  def resolve_local(self, expr: Expr.Variable | Expr.Assign) -> None:
+    for depth, scope in enumerate(reversed(self.scopes)):
+      slot = scope.get(expr.name.lexeme)
+      if slot is not None:
+        expr.depth = depth
+        expr.slot = slot
+        return
+    expr.depth = 0
+    expr.slot = None
+
+
+  def visit_block_stmt(self, stmt: Stmt.Block) -> None:
+    self.blocks += 1
+    stmt.scoped = declares(stmt.statements)
+    if not stmt.scoped:
+      self.scopeless += 1
+      self.resolve(stmt.statements)
+      return
+
+    self.scopes.append({})
+    self.sizes.append(0)
+    self.resolve(stmt.statements)
+    self.scopes.pop()
+    stmt.slot_count = self.sizes.pop()
+
+
+  def visit_var_stmt(self, stmt: Stmt.Var) -> None:
+    if stmt.initializer:
+      self.resolve_expr(stmt.initializer)
+    stmt.slot = self.declare(stmt.name)
+
+
+  def visit_function_stmt(self, stmt: Stmt.Function) -> None:
+    stmt.slot = self.declare(stmt.name)
+
+    enclosing = self.scopes, self.sizes, self.in_function
+    # Each parameter gets its own slot, in order; a repeated name resolves to
+    # the last one, as repeated Environment.define calls would.
+    self.scopes = [{param.lexeme: i for i, param in enumerate(stmt.params)}]
+    self.sizes = [len(stmt.params)]
+    self.in_function = True
+    self.resolve(stmt.body)
+    stmt.slot_count = self.sizes[0]
+    self.scopes, self.sizes, self.in_function = enclosing
+
+
+  def visit_expression_stmt(self, stmt: Stmt.Expression) -> None:
+    self.resolve_expr(stmt.expression)
+
+
+  def visit_if_stmt(self, stmt: Stmt.If) -> None:
+    self.resolve_expr(stmt.condition)
+    self.resolve_stmt(stmt.then_branch)
+    if stmt.else_branch:
+      self.resolve_stmt(stmt.else_branch)
+
+
+  def visit_print_stmt(self, stmt: Stmt.Print) -> None:
+    self.resolve_expr(stmt.expression)
+
+
+  def visit_return_stmt(self, stmt: Stmt.Return) -> None:
+    if not self.in_function:
+      self.error_callback(stmt.keyword, "Can't return from top-level code.")
+    if stmt.value:
+      self.resolve_expr(stmt.value)
+
+
+  def visit_while_stmt(self, stmt: Stmt.While) -> None:
+    self.resolve_expr(stmt.condition)
+    self.resolve_stmt(stmt.body)
+
+
+  # The initializer, condition, increment and a body block without a scope
+  # all resolve in the one loop scope.
+  def visit_for_stmt(self, stmt: Stmt.For) -> None:
+    self.scopes.append({})
+    self.sizes.append(0)
+    if stmt.initializer:
+      self.resolve_stmt(stmt.initializer)
+    self.resolve_expr(stmt.condition)
+    if stmt.increment:
+      self.resolve_expr(stmt.increment)
+    self.resolve_stmt(stmt.body)
+    stmt.inline_body = isinstance(stmt.body, Stmt.Block) and not stmt.body.scoped
+    self.scopes.pop()
+    stmt.slot_count = self.sizes.pop()
+
+
+  def visit_variable_expr(self, expr: Expr.Variable) -> None:
+    self.resolve_local(expr)
+
+
+  def visit_assign_expr(self, expr: Expr.Assign) -> None:
+    self.resolve_expr(expr.value)
+    self.resolve_local(expr)
+
+
+  def visit_binary_expr(self, expr: Expr.Binary) -> None:
+    expr.handler = operators.BINARY[expr.operator.token_type]
+    self.resolve_expr(expr.left)
+    self.resolve_expr(expr.right)
+
+
+  def visit_call_expr(self, expr: Expr.Call) -> None:
+    self.resolve_expr(expr.callee)
+    for argument in expr.arguments:
+      self.resolve_expr(argument)
+
+
+  def visit_grouping_expr(self, expr: Expr.Grouping) -> None:
+    self.resolve_expr(expr.expression)
+
+
+  def visit_literal_expr(self, expr: Expr.Literal) -> None:
+    pass
+
+
+  def visit_logical_expr(self, expr: Expr.Logical) -> None:
+    expr.handler = operators.LOGICAL[expr.operator.token_type]
+    self.resolve_expr(expr.left)
+    self.resolve_expr(expr.right)
+
+
+  def visit_unary_expr(self, expr: Expr.Unary) -> None:
+    expr.handler = operators.UNARY[expr.operator.token_type]
+    self.resolve_expr(expr.right)
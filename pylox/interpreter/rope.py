@@ -0,0 +1,71 @@
+# Lazy string built by `+` in the tree interpreter. Concatenating strings
+# whose combined length reaches ROPE_MIN yields a Rope instead of a copy: it
+# keeps its pieces in a list and only joins them when the string is observed
+# (str(), ==, hashing, natives). Ropes are immutable values. Appending to a
+# rope pushes onto its piece list in place when no other rope has extended
+# that list yet, so `s = s + piece;` in a loop costs O(len(piece)) per step
+# instead of copying the whole accumulated string.
+ROPE_MIN = 256
+
+
+class Rope:
+  __slots__ = ('pieces', 'count', 'length', 'flat')
+
+  # `count` is how many leading entries of `pieces` belong to this rope;
+  # ropes appended to the same list see longer prefixes of it.
+  def __init__(self, pieces: list[str], count: int, length: int):
+    self.pieces = pieces
+    self.count = count
+    self.length = length
+    self.flat: str | None = None
+
+
+  def __str__(self) -> str:
+    if self.flat is None:
+      self.flat = ''.join(self.pieces[:self.count]) if self.count < len(self.pieces) else ''.join(self.pieces)
+    return self.flat
+
+
+  def __eq__(self, other: object) -> bool:
+    if isinstance(other, (str, Rope)):
+      return self.length == len(other) and str(self) == str(other)
+    return NotImplemented
+
+
+  def __hash__(self) -> int:
+    return hash(str(self))
+
+
+  def __len__(self) -> int:
+    return self.length
+
+
+  def __repr__(self) -> str:
+    return f'Rope({str(self)!r})'
+
+
+  def append(self, piece: str) -> 'Rope':
+    pieces = self.pieces
+    if self.count != len(pieces):
+      pieces = pieces[:self.count]
+    pieces.append(piece)
+    return Rope(pieces, self.count + 1, self.length + len(piece))
+
+
+# `left + right` for operands that are each a str or a Rope.
+def concat(left: 'str | Rope', right: 'str | Rope') -> 'str | Rope':
+  if type(left) is Rope:
+    if type(right) is Rope:
+      rope = left
+      for piece in right.pieces[:right.count]:
+        rope = rope.append(piece)
+      return rope
+    return left.append(right)
+
+  length = len(left) + len(right)
+  if type(right) is Rope:
+    pieces = [left, *right.pieces[:right.count]]
+    return Rope(pieces, len(pieces), length)
+  if length < ROPE_MIN:
+    return left + right
+  return Rope([left, right], 2, length)
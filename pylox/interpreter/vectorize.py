@@ -0,0 +1,290 @@
+import math
+
+try:
+  import numpy
+except ImportError: # Optional: without NumPy every loop is interpreted.
+  numpy = None
+
+from pylox.interpreter.environment import Environment
+from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.parser.expr import Expr
+from pylox.parser.fields import fields
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_type import TokenType
+
+
+# Counted loops shorter than this are interpreted: NumPy's per-call overhead
+# would outweigh the work saved.
+VECTOR_MIN = 64
+# Iterations computed per batch, which bounds the memory a loop can take.
+CHUNK = 1 << 16
+# Every integer up to this magnitude is exact as a float.
+EXACT = 2 ** 53
+
+# Reductions `acc = acc <op> term`, by the NumPy ufunc whose accumulate
+# applies them. accumulate folds strictly left to right (unlike sum or prod,
+# which add pairwise), so the result is the float the loop would compute.
+REDUCTIONS = {
+  TokenType.PLUS: 'add',
+  TokenType.MINUS: 'subtract',
+  TokenType.STAR: 'multiply',
+  TokenType.SLASH: 'divide',
+}
+# Reductions that may also be written `acc = term <op> acc`.
+COMMUTATIVE = (TokenType.PLUS, TokenType.STAR)
+BOUNDS = (TokenType.LESS, TokenType.LESS_EQUAL, TokenType.GREATER, TokenType.GREATER_EQUAL)
+ARITHMETIC = (TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH)
+
+
+def available() -> bool:
+  return numpy is not None
+
+
+# Raised while computing a loop that has to be interpreted after all.
+class Fallback(Exception):
+  pass
+
+
+# Whether `expr` is arithmetic on number literals and variables, none of them
+# named in `excluded`. Such an expression has no side effects, so computing
+# it for every iteration at once gives what the loop would compute one
+# iteration at a time.
+def is_arithmetic(expr: Expr, excluded: set[str]) -> bool:
+  if isinstance(expr, Expr.Literal):
+    return type(expr.value) is float
+  if isinstance(expr, Expr.Variable):
+    return expr.name.lexeme not in excluded
+  if isinstance(expr, Expr.Grouping):
+    return is_arithmetic(expr.expression, excluded)
+  if isinstance(expr, Expr.Unary):
+    return expr.operator.token_type == TokenType.MINUS and is_arithmetic(expr.right, excluded)
+  if isinstance(expr, Expr.Binary):
+    return (expr.operator.token_type in ARITHMETIC
+            and is_arithmetic(expr.left, excluded) and is_arithmetic(expr.right, excluded))
+  return False
+
+
+def is_variable(expr: Expr, name: str) -> bool:
+  return isinstance(expr, Expr.Variable) and expr.name.lexeme == name
+
+
+# The integer step of `counter = counter + step` or `counter = counter - step`.
+def counter_step(expr: Expr, counter: str) -> int | None:
+  if not (isinstance(expr, Expr.Assign) and expr.name.lexeme == counter):
+    return None
+  value = expr.value
+  if not (isinstance(value, Expr.Binary) and is_variable(value.left, counter)
+          and isinstance(value.right, Expr.Literal) and type(value.right.value) is float):
+    return None
+  step = value.right.value
+  if not step.is_integer() or step == 0:
+    return None
+  if value.operator.token_type == TokenType.PLUS:
+    return int(step)
+  if value.operator.token_type == TokenType.MINUS:
+    return -int(step)
+  return None
+
+
+# A counted loop
+#
+#   for (...; i < n; i = i + 1) acc = acc + f(i);
+#
+# or the same loop written as `while (i < n) { acc = acc + f(i); i = i + 1; }`,
+# with `<`, `<=`, `>` or `>=`, any integer step towards the bound, a body of
+# that one assignment (braces allowed), a reduction by +, -, * or / and f
+# and n arithmetic on literals and variables the loop does not assign. Each
+# run checks what the analysis can't: that the counter starts as an exact
+# integer, that every value involved is a number, that no term divides by
+# zero and that the loop is long enough to be worth it. Otherwise run()
+# returns False, having changed nothing, and the loop is interpreted.
+class VectorLoop:
+
+  def __init__(self, condition: Expr.Binary, update: Expr.Assign, increment: Expr.Assign, step: int,
+               term: Expr, blocks: list[Stmt.Block], increment_depth: int):
+    self.condition = condition
+    self.update = update
+    self.increment = increment
+    self.step = step
+    self.term = term
+    # Blocks the interpreter enters between the loop's environment and the
+    # one the update runs in; the increment runs in the environment of the
+    # first `increment_depth` of them.
+    self.blocks = blocks
+    self.increment_depth = increment_depth
+    self.counter = increment.name.lexeme
+    self.reduction = update.value.operator.token_type
+    # The variable node reading the accumulator in the reduction.
+    self.accumulator = update.value.left if is_variable(update.value.left, update.name.lexeme) else update.value.right
+
+
+  @staticmethod
+  def match(loop: Stmt.While | Stmt.For) -> 'VectorLoop | None':
+    if isinstance(loop, Stmt.For):
+      # Resolved, so a body block declaring nothing runs in the loop scope.
+      update, increment, blocks = loop.body, loop.increment, []
+      if isinstance(update, Stmt.Block):
+        if not (loop.inline_body and len(update.statements) == 1):
+          return None
+        update = update.statements[0]
+    else:
+      body = loop.body
+      if not (isinstance(body, Stmt.Block) and len(body.statements) == 2
+              and isinstance(body.statements[1], Stmt.Expression)):
+        return None
+      update, increment, blocks = body.statements[0], body.statements[1].expression, [body]
+      if isinstance(update, Stmt.Block) and len(update.statements) == 1:
+        blocks.append(update)
+        update = update.statements[0]
+    if not isinstance(update, Stmt.Expression):
+      return None
+    update = update.expression
+
+    condition = loop.condition
+    if not (isinstance(condition, Expr.Binary) and condition.operator.token_type in BOUNDS
+            and isinstance(condition.left, Expr.Variable)):
+      return None
+    counter = condition.left.name.lexeme
+    step = counter_step(increment, counter)
+    if step is None or not isinstance(update, Expr.Assign) or update.name.lexeme == counter:
+      return None
+    accumulator = update.name.lexeme
+    reduction = update.value
+    if not (isinstance(reduction, Expr.Binary) and reduction.operator.token_type in REDUCTIONS):
+      return None
+    if is_variable(reduction.left, accumulator):
+      term = reduction.right
+    elif is_variable(reduction.right, accumulator) and reduction.operator.token_type in COMMUTATIVE:
+      term = reduction.left
+    else:
+      return None
+
+    if not (is_arithmetic(term, {accumulator}) and is_arithmetic(condition.right, {accumulator, counter})):
+      return None
+    return VectorLoop(condition, update, increment, step, term, blocks, min(1, len(blocks)))
+
+
+  # Runs the whole loop, leaving the accumulator and counter as the
+  # interpreted loop would, or returns False without running it. A For
+  # loop's initializer has already run.
+  def run(self, interpreter) -> bool:
+    outer = interpreter.environment
+    environments = [outer]
+    for block in self.blocks:
+      environment = environments[-1]
+      environments.append(Environment(environment, block.slot_count) if block.scoped else environment)
+    try:
+      start = interpreter.evaluate(self.condition.left)
+      bound = float(self.values(interpreter, self.condition.right, None))
+      if not (type(start) is float and start.is_integer() and abs(start) <= EXACT):
+        return False
+      count = self.trip_count(int(start), bound)
+      if count is None or count < VECTOR_MIN or abs(start + count * self.step) > EXACT:
+        return False
+
+      interpreter.environment = environments[-1]
+      acc = interpreter.evaluate(self.accumulator)
+      if type(acc) is not float:
+        return False
+      acc = self.reduce(interpreter, acc, int(start), count)
+
+      store(interpreter, self.update, acc)
+      interpreter.environment = environments[self.increment_depth]
+      store(interpreter, self.increment, start + count * self.step)
+      return True
+    except (RuntimeException, Fallback):
+      return False
+    finally:
+      interpreter.environment = outer
+
+
+  # Iterations before `counter <op> bound` fails, or None when the loop
+  # might not end.
+  def trip_count(self, start: int, bound: float) -> int | None:
+    if not math.isfinite(bound):
+      return None
+    operator = self.condition.operator.token_type
+    if self.step > 0 and operator in (TokenType.LESS, TokenType.LESS_EQUAL):
+      last = math.ceil(bound) - 1 if operator == TokenType.LESS else math.floor(bound)
+      return max(0, (last - start) // self.step + 1)
+    if self.step < 0 and operator in (TokenType.GREATER, TokenType.GREATER_EQUAL):
+      first = math.floor(bound) + 1 if operator == TokenType.GREATER else math.ceil(bound)
+      return max(0, (start - first) // -self.step + 1)
+    return None
+
+
+  def reduce(self, interpreter, acc: float, start: int, count: int) -> float:
+    accumulate = getattr(numpy, REDUCTIONS[self.reduction]).accumulate
+    with numpy.errstate(all='ignore'):
+      for first in range(0, count, CHUNK):
+        size = min(CHUNK, count - first)
+        counters = (numpy.arange(first, first + size, dtype=numpy.int64) * self.step + start).astype(numpy.float64)
+        values = numpy.empty(size + 1)
+        values[0] = acc
+        values[1:] = self.values(interpreter, self.term, counters)
+        if self.reduction == TokenType.SLASH and not values[1:].all():
+          raise Fallback()
+        acc = float(accumulate(values)[-1])
+    return acc
+
+
+  # `expr` for every counter value at once (a scalar where it doesn't
+  # depend on the counter).
+  def values(self, interpreter, expr: Expr, counters):
+    if isinstance(expr, Expr.Literal):
+      return numpy.float64(expr.value)
+    if isinstance(expr, Expr.Variable):
+      if counters is not None and expr.name.lexeme == self.counter:
+        return counters
+      value = interpreter.evaluate(expr)
+      if type(value) is not float:
+        raise Fallback()
+      return numpy.float64(value)
+    if isinstance(expr, Expr.Grouping):
+      return self.values(interpreter, expr.expression, counters)
+    if isinstance(expr, Expr.Unary):
+      return -self.values(interpreter, expr.right, counters)
+
+    right = self.values(interpreter, expr.right, counters)
+    left = self.values(interpreter, expr.left, counters)
+    operator = expr.operator.token_type
+    if operator == TokenType.PLUS:
+      return left + right
+    if operator == TokenType.MINUS:
+      return left - right
+    if operator == TokenType.STAR:
+      return left * right
+    if not numpy.all(right):
+      raise Fallback()
+    return left / right
+
+
+def store(interpreter, target: Expr.Assign, value: float) -> None:
+  if target.slot is None:
+    interpreter.Globals.assign(target.name, value)
+  else:
+    interpreter.environment.assign_at(target.depth, target.slot, value)
+
+
+# Finds the loops of a resolved program that VectorLoop can run, setting
+# Stmt.While.vector or Stmt.For.vector on each. Does nothing without NumPy.
+def find_vector_loops(statements: list[Stmt]) -> list[Stmt.While | Stmt.For]:
+  loops: list[Stmt.While | Stmt.For] = []
+  if numpy is not None:
+    for stmt in statements:
+      collect_loops(stmt, loops)
+  return loops
+
+
+def collect_loops(node, loops: list[Stmt.While | Stmt.For]) -> None:
+  if isinstance(node, (Stmt.While, Stmt.For)):
+    node.vector = VectorLoop.match(node)
+    if node.vector is not None:
+      loops.append(node)
+  for value in fields(node):
+    if isinstance(value, list):
+      for item in value:
+        if hasattr(item, 'accept'):
+          collect_loops(item, loops)
+    elif hasattr(value, 'accept'):
+      collect_loops(value, loops)
@@ -1,91 +1,113 @@
+import argparse
 import sys
-from pylox.interpreter.interpreter import Interpreter
-from pylox.parser.ast_printer import AstPrinter
-from pylox.parser.parser import Parser
-from pylox.parser.stmt import Stmt
-from pylox.scanner.scanner import Scanner
-from pylox.scanner.token_item import TokenItem
-from pylox.scanner.token_type import TokenType
-from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.parser.parse_cache import CACHE_DIR
+from pylox.runtime import LoxRuntime
 
+
+# Command line front end. All interpreter state lives in one LoxRuntime;
+# embedders use LoxRuntime directly.
 class Lox:
-  had_error = False
-  had_runtime_error = False
-  interpreter = None
-  
+  runtime: LoxRuntime | None = None
+  profile_stacks = None
+
 
   @staticmethod
   def init() -> None:
-    if len(sys.argv) > 2:
-      print('Usage pylox [script]')
-      return
-    
-    if not sys.argv[1].endswith('.lox'):
+    if sys.argv[1:2] == ['run-many']:
+      from pylox.batch import run_many
+      sys.exit(run_many(sys.argv[2:]))
+
+    args = Lox.parse_args(sys.argv[1:])
+
+    if args.script and not args.script.endswith('.lox'):
       print('Must be a lox file type')
       return
-    
-    Lox.interpreter = Interpreter(Lox.runtime_error)
-    if len(sys.argv) == 2:
-      Lox.run_file(sys.argv[1])
+
+    Lox.runtime = LoxRuntime.from_args(args)
+    Lox.profile_stacks = args.profile_stacks
+    if args.script:
+      Lox.run_file(args.script)
     else:
       Lox.run_prompt()
 
 
+  # `parser` lets another command (see pylox.batch) take the same options.
+  @staticmethod
+  def parse_args(argv: list[str], parser: argparse.ArgumentParser | None = None) -> argparse.Namespace:
+    if parser is None:
+      parser = argparse.ArgumentParser(prog='pylox')
+      parser.add_argument('script', nargs='?')
+    parser.add_argument('--backend', choices=LoxRuntime.backends, default='tree',
+                        help='tree-walking interpreter, bytecode VM, closure-compiled tree or transpiled Python')
+    parser.add_argument('--scanner', choices=LoxRuntime.scanner_engines,
+                        help='scanner engine used to tokenize the source (classic, or fast with --stream)')
+    parser.add_argument('--parser', choices=LoxRuntime.parser_engines, default='pratt',
+                        help='expression parser: table-driven precedence climbing or one method per grammar level')
+    parser.add_argument('--stream', action='store_true',
+                        help='memory-map the script and run each statement as soon as it is parsed')
+    parser.add_argument('--compact-tokens', action='store_true',
+                        help='keep scanned tokens in a struct-of-arrays TokenBuffer (implies --scanner fast)')
+    parser.add_argument('--cache', action='store_true',
+                        help=f'reuse parsed programs stored in {CACHE_DIR} next to the script')
+    parser.add_argument('-O', dest='optimize', type=int, choices=(0, 1), default=0,
+                        help='optimization level: -O0 runs the tree as parsed, -O1 folds constants and drops dead code')
+    parser.add_argument('--memoize', action='store_true',
+                        help='cache results of pure functions (tree backend)')
+    parser.add_argument('--memo-size', type=int, default=128, metavar='SIZE',
+                        help='results kept per memoized function')
+    parser.add_argument('--vectorize', action='store_true',
+                        help='run simple counted numeric reduction loops as NumPy array operations (tree backend)')
+    parser.add_argument('--scope-report', action='store_true',
+                        help='print how many blocks run without their own environment (tree and closure backends)')
+    parser.add_argument('--emit-python', action='store_true',
+                        help='print the Python the program transpiles to instead of running it')
+    parser.add_argument('--profile', action='store_true',
+                        help='run on the tree backend and print per-line and per-function counts and times')
+    parser.add_argument('--profile-stacks', metavar='FILE',
+                        help='profile like --profile and write collapsed stacks for flamegraphs to FILE')
+    args = parser.parse_args(argv)
+    if (args.profile or args.profile_stacks) and args.backend != 'tree':
+      parser.error('--profile runs on the tree backend only')
+    if args.scope_report and args.backend not in ('tree', 'closure'):
+      parser.error('--scope-report applies to the tree and closure backends only')
+    if args.compact_tokens and args.scanner == 'classic':
+      parser.error('--compact-tokens scans with the fast scanner only')
+    if args.vectorize:
+      from pylox.interpreter import vectorize
+      if not vectorize.available():
+        parser.error('--vectorize requires NumPy')
+    return args
+
+
   @staticmethod
   def run_prompt() -> None:
     while True:
       line: str = input('> ')
       if line is None: 
         break
-      Lox.run(line)
-      Lox.had_error = False
+      Lox.runtime.run(line)
+      Lox.runtime.reset_errors()
 
 
   @staticmethod
   def run_file(path: str) -> None:
-    with open(path, 'r', encoding='utf-8') as file:
-      contents = file.read()
-
-    Lox.run(contents)
-
-    if Lox.had_error: 
-      sys.exit(65)
-    if Lox.had_runtime_error:
-      sys.exit(70)
-
-
-  @staticmethod
-  def run(source: str) -> None:
-    scanner = Scanner(source, Lox.scanner_error)
-    tokens: list[TokenItem] = scanner.scan_tokens()
-    parser = Parser(tokens, Lox.parse_error)
-    statements: list[Stmt] = parser.parse()
-
-    if Lox.had_error: return
+    runtime = Lox.runtime
+    status = runtime.run_file(path)
+    Lox.report(runtime, sys.stderr, Lox.profile_stacks)
+    if status:
+      sys.exit(status)
 
-    Lox.interpreter.interpret(statements)
-  
 
+  # Memoization, scope and profiling reports for a finished run.
   @staticmethod
-  def scanner_error(line: int, message: str) -> None:
-    Lox.report(line, "", message)
-
-
-  @staticmethod
-  def parse_error(token: TokenItem, message: str) -> None:
-    if token.token_type == TokenType.EOF:
-      Lox.report(token.line, " at end", message)
-    else:
-      Lox.report(token.line, " at '" + token.lexeme + "'", message)
-
-
-  @staticmethod
-  def runtime_error(error: RuntimeException) -> None:
-    print(f'Error: {error}\n[line {error.token.line}]') 
-    Lox.had_runtime_error = True
-
-
-  @staticmethod
-  def report(line: int, where: str, message: str) -> None:
-    print(f'[line {line}] Error{where}: {message}')
-
+  def report(runtime: LoxRuntime, out, profile_stacks: str | None = None) -> None:
+    if runtime.memo_size:
+      runtime.report_memo(out)
+    if runtime.scope_report:
+      runtime.report_scopes(out)
+    profiler = getattr(runtime.interpreter, 'profiler', None)
+    if profiler is not None:
+      profiler.report(out)
+      if profile_stacks:
+        with open(profile_stacks, 'w', encoding='utf-8') as file:
+          profiler.collapsed(file)
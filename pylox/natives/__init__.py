@@ -0,0 +1,2 @@
+# Importing the modules registers their natives with pylox.natives.registry.
+from pylox.natives import math_module, string_module, time_module
@@ -0,0 +1,78 @@
+import math
+
+from pylox.natives.registry import NativeError, native, number
+
+
+@native('math')
+def sqrt(x):
+  if number(x) < 0:
+    raise NativeError("Operand must be a non-negative number.")
+  return math.sqrt(x)
+
+
+# Infinities and nan are already whole: they come back unchanged.
+@native('math')
+def floor(x):
+  if not math.isfinite(number(x)):
+    return x
+  return float(math.floor(x))
+
+
+@native('math')
+def ceil(x):
+  if not math.isfinite(number(x)):
+    return x
+  return float(math.ceil(x))
+
+
+@native('math', 'abs')
+def absolute(x):
+  return abs(number(x))
+
+
+@native('math', 'min')
+def minimum(a, b):
+  return min(number(a), number(b))
+
+
+@native('math', 'max')
+def maximum(a, b):
+  return max(number(a), number(b))
+
+
+@native('math', 'pow')
+def power(x, y):
+  try:
+    return math.pow(number(x), number(y))
+  except (ValueError, OverflowError):
+    raise NativeError("Result is not a number.") from None
+
+
+# The sine and cosine of an infinity are nan.
+@native('math')
+def sin(x):
+  if math.isinf(number(x)):
+    return math.nan
+  return math.sin(x)
+
+
+@native('math')
+def cos(x):
+  if math.isinf(number(x)):
+    return math.nan
+  return math.cos(x)
+
+
+@native('math')
+def exp(x):
+  try:
+    return math.exp(number(x))
+  except OverflowError:
+    return math.inf
+
+
+@native('math')
+def log(x):
+  if number(x) <= 0:
+    raise NativeError("Operand must be a positive number.")
+  return math.log(x)
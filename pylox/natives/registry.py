@@ -0,0 +1,102 @@
+import asyncio
+import inspect
+from typing import Callable, Iterable
+
+from pylox.interpreter.lox_callable import LoxCallable
+from pylox.interpreter.rope import Rope
+
+
+# Raised by a native for a bad argument. The call site turns it into a
+# RuntimeException on the call's closing parenthesis.
+class NativeError(Exception):
+  pass
+
+
+# A Python function exposed to Lox. `param_count` is read from the Python
+# signature once, when the native is registered, and call sites compare it
+# directly. `pure` natives depend only on their arguments (see
+# pylox.interpreter.purity).
+#
+# A coroutine function is kept in `coroutine`. AsyncInterpreter awaits it on
+# its event loop; every other call site calls `function`, which runs the
+# coroutine to completion on a loop of its own (see run_coroutine).
+class NativeFunction(LoxCallable):
+  __slots__ = ('name', 'module', 'function', 'coroutine', 'param_count', 'pure')
+
+  def __init__(self, name: str, module: str, function: Callable[..., object], pure: bool):
+    self.name = name
+    self.module = module
+    self.param_count = len(inspect.signature(function).parameters)
+    self.pure = pure
+    if inspect.iscoroutinefunction(function):
+      self.coroutine = function
+      self.function = lambda *arguments: run_coroutine(name, function, arguments)
+    else:
+      self.coroutine = None
+      self.function = function
+
+  def arity(self) -> int:
+    return self.param_count
+
+  def call(self, interpreter, arguments: list[object]) -> object:
+    return self.function(*arguments)
+
+  def __str__(self):
+    return "<native fn>"
+
+
+# Runs coroutine native `name` to completion for a synchronous call site.
+# asyncio.run() can't start a loop on a thread that is already running one,
+# so a script embedded in an async service has to use AsyncLoxRuntime.
+def run_coroutine(name: str, function: Callable[..., object], arguments: tuple) -> object:
+  try:
+    asyncio.get_running_loop()
+  except RuntimeError:
+    return asyncio.run(function(*arguments))
+  raise NativeError(f"'{name}' can't run inside a running event loop; it needs AsyncLoxRuntime.")
+
+
+# module name -> native name -> NativeFunction
+MODULES: dict[str, dict[str, NativeFunction]] = {}
+
+
+# Registers the decorated function as native `name` (default: the function's
+# own name) of `module`. Lox has no property access, so natives are bound as
+# plain globals and a name may only be used once across all modules.
+def native(module: str, name: str | None = None, pure: bool = True):
+  def register(function: Callable[..., object]) -> Callable[..., object]:
+    native_name = name or function.__name__
+    if any(native_name in natives for natives in MODULES.values()):
+      raise ValueError(f"Native '{native_name}' is already registered.")
+    MODULES.setdefault(module, {})[native_name] = NativeFunction(native_name, module, function, pure)
+    return function
+  return register
+
+
+def natives(modules: Iterable[str] | None = None) -> Iterable[NativeFunction]:
+  for module in MODULES if modules is None else modules:
+    yield from MODULES[module].values()
+
+
+# Binds every native of `modules` (default: all of them) through `define`.
+def install(define: Callable[[str, object], None], modules: Iterable[str] | None = None) -> None:
+  for function in natives(modules):
+    define(function.name, function)
+
+
+def pure_natives() -> set[str]:
+  return {function.name for function in natives() if function.pure}
+
+
+def number(value: object) -> float:
+  if type(value) is not float:
+    raise NativeError("Operand must be a number.")
+  return value
+
+
+def string(value: object) -> str:
+  if type(value) is not str:
+    if type(value) is Rope:
+      return str(value)
+    raise NativeError("Operand must be a string.")
+  return value
@@ -0,0 +1,31 @@
+from pylox.natives.registry import NativeError, native, number, string
+
+
+@native('string', 'len')
+def length(s):
+  return float(len(string(s)))
+
+
+@native('string')
+def upper(s):
+  return string(s).upper()
+
+
+@native('string')
+def lower(s):
+  return string(s).lower()
+
+
+# Characters from index `start` up to, not including, `end`.
+@native('string')
+def substring(s, start, end):
+  s = string(s)
+  if not (number(start).is_integer() and number(end).is_integer() and 0 <= start <= end <= len(s)):
+    raise NativeError("Substring bounds out of range.")
+  return s[int(start):int(end)]
+
+
+# Index of the first occurrence of `part` in `s`, or -1.
+@native('string')
+def find(s, part):
+  return float(string(s).find(string(part)))
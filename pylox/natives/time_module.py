@@ -0,0 +1,14 @@
+import asyncio
+import time
+
+from pylox.natives.registry import native, number
+
+
+@native('time', pure=False)
+def clock() -> float:
+  return time.time()
+
+
+@native('time', pure=False)
+async def sleep(seconds) -> None:
+  await asyncio.sleep(number(seconds))
@@ -31,3 +31,19 @@ class AstPrinter(Expr.Visitor):
     builder.append(")")
     return "".join(builder)
   
+
+
+  def visit_variable_expr(self, variable: Expr.Variable):
+    return variable.name.lexeme
+
+
+  def visit_assign_expr(self, assign: Expr.Assign):
+    return self.parenthesize(f"= {assign.name.lexeme}", assign.value)
+
+
+  def visit_logical_expr(self, logical: Expr.Logical):
+    return self.parenthesize(logical.operator.lexeme, logical.left, logical.right)
+
+
+  def visit_call_expr(self, call: Expr.Call):
+    return self.parenthesize("call", call.callee, *call.arguments)
@@ -46,9 +46,14 @@ class Expr(ABC):
 
 
   class Assign:
+    __slots__ = ('name', 'value', 'depth', 'slot')
+
     def __init__(self, name: TokenItem, value: Expr):
       self.name = name
       self.value = value
+      # Filled in by the Resolver; a None slot means the variable is global.
+      self.depth: int = 0
+      self.slot: int | None = None
 
     def accept(self, visitor: Expr.Visitor):
       return visitor.visit_assign_expr(self)
@@ -58,10 +63,13 @@ class Expr(ABC):
 
 
   class Binary:
+    __slots__ = ('left', 'operator', 'right', 'handler')
+
     def __init__(self, left: Expr, operator: TokenItem, right: Expr):
       self.left = left
       self.operator = operator
       self.right = right
+      self.handler = None # Filled in by the Resolver from pylox.interpreter.operators
 
     def accept(self, visitor: Expr.Visitor):
       return visitor.visit_binary_expr(self)
@@ -71,6 +79,8 @@ class Expr(ABC):
     
   
   class Call:
+    __slots__ = ('callee', 'paren', 'arguments')
+
     def __init__(self, callee: Expr, paren: TokenItem, arguments: list[Expr]):
       self.callee = callee
       self.paren = paren
@@ -84,6 +94,8 @@ class Expr(ABC):
 
 
   class Grouping:
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expr):
       self.expression = expression
 
@@ -95,6 +107,8 @@ class Expr(ABC):
 
 
   class Literal:
+    __slots__ = ('value',)
+
     def __init__(self, value: object):
       self.value = value
 
@@ -106,10 +120,13 @@ class Expr(ABC):
     
   
   class Logical:
+    __slots__ = ('left', 'operator', 'right', 'handler')
+
     def __init__(self, left: Expr, operator: TokenItem, right: Expr):
       self.left = left
       self.operator = operator
       self.right = right
+      self.handler = None # Filled in by the Resolver from pylox.interpreter.operators
 
     def accept(self, visitor: Expr.Visitor):
       return visitor.visit_logical_expr(self)
@@ -119,8 +136,17 @@ class Expr(ABC):
 
   
   class Variable:
+    __slots__ = ('name', 'depth', 'slot', 'cache_version', 'cache_value')
+
     def __init__(self, name: TokenItem):
       self.name = name
+      # Filled in by the Resolver; a None slot means the variable is global.
+      self.depth: int = 0
+      self.slot: int | None = None
+      # Inline cache for globals: the value last read and the version of the
+      # global Environment it was read at.
+      self.cache_version = 0
+      self.cache_value: object = None
 
     def accept(self, visitor: Expr.Visitor):
       return visitor.visit_variable_expr(self)
@@ -130,9 +156,12 @@ class Expr(ABC):
     
     
   class Unary:
+    __slots__ = ('operator', 'right', 'handler')
+
     def __init__(self, operator: TokenItem, right: Expr):
       self.operator = operator
       self.right = right
+      self.handler = None # Filled in by the Resolver from pylox.interpreter.operators
 
     def accept(self, visitor: Expr.Visitor):
       return visitor.visit_unary_expr(self)
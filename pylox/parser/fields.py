@@ -0,0 +1,16 @@
+from typing import Iterator
+
+from pylox.parser.stmt import Stmt
+
+
+# Values of an Expr or Stmt node's fields, in the order of its __slots__:
+# constructor arguments first, then what later passes fill in.
+def fields(node) -> Iterator[object]:
+  for name in node.__slots__:
+    yield getattr(node, name)
+
+
+# Whether a list of statements declares a variable or function directly,
+# so that running it needs a scope of its own.
+def declares(statements: list[Stmt]) -> bool:
+  return any(isinstance(s, (Stmt.Var, Stmt.Function)) for s in statements)
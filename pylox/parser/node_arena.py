@@ -0,0 +1,166 @@
+import sys
+from array import array
+
+from pylox.parser.parse_cache import CODES, SCHEMA
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_item import TokenItem
+from pylox.scanner.token_type import TokenType
+
+
+TOKEN_TYPES = {t.value: t for t in TokenType}
+
+
+# Flat, struct-of-arrays copy of a parsed program: one row per node, with
+# children referenced by row number instead of by object. Node rows follow
+# the field layout of parse_cache.SCHEMA:
+#
+#   kinds[n]    schema code of node n
+#   starts[n]   offset of node n's first field in `fields`
+#   fields      one int per schema field: a node row (-1 for None) for
+#               expr/stmt, a token row for token, an offset into `lists`
+#               for exprs/stmts/tokens, and an index into `constants` for a
+#               Literal's value
+#   lists       for each list field, its length followed by its rows
+#
+# Tokens are rows too (type, lexeme, line), with lexemes shared through
+# `strings`. Only what the parser produced is kept: Resolver annotations
+# are recomputed when the statements are rebuilt and resolved again.
+class NodeArena:
+
+  def __init__(self):
+    self.kinds = array('B')
+    self.starts = array('l')
+    self.fields = array('l')
+    self.lists = array('l')
+    self.constants: list[object] = []
+    self.token_types = array('B')
+    self.token_lexemes = array('l')
+    self.token_lines = array('l')
+    self.strings: list[str] = []
+    self.roots = array('l')
+    self.constant_ids: dict[tuple, int] = {}
+    self.string_ids: dict[str, int] = {}
+
+
+  @staticmethod
+  def from_statements(statements: list[Stmt]) -> 'NodeArena':
+    arena = NodeArena()
+    for stmt in statements:
+      arena.roots.append(arena.add(stmt))
+    # Only needed while adding nodes.
+    arena.constant_ids = {}
+    arena.string_ids = {}
+    return arena
+
+
+  def __len__(self) -> int:
+    return len(self.kinds)
+
+
+  def add(self, node) -> int:
+    if node is None:
+      return -1
+
+    code = CODES[type(node)]
+    values = []
+    for name, kind in SCHEMA[code][1]:
+      value = getattr(node, name)
+      if kind == 'token':
+        values.append(self.add_token(value))
+      elif kind == 'tokens':
+        values.append(self.add_list([self.add_token(t) for t in value]))
+      elif kind in ('exprs', 'stmts'):
+        values.append(self.add_list([self.add(n) for n in value]))
+      elif kind == 'value':
+        values.append(self.add_constant(value))
+      else:
+        values.append(self.add(value))
+
+    row = len(self.kinds)
+    self.kinds.append(code)
+    self.starts.append(len(self.fields))
+    self.fields.extend(values)
+    return row
+
+
+  def add_list(self, rows: list[int]) -> int:
+    offset = len(self.lists)
+    self.lists.append(len(rows))
+    self.lists.extend(rows)
+    return offset
+
+
+  def add_token(self, token: TokenItem) -> int:
+    lexeme = self.string_ids.get(token.lexeme)
+    if lexeme is None:
+      lexeme = self.string_ids[token.lexeme] = len(self.strings)
+      self.strings.append(token.lexeme)
+    row = len(self.token_types)
+    self.token_types.append(token.token_type.value)
+    self.token_lexemes.append(lexeme)
+    self.token_lines.append(token.line)
+    return row
+
+
+  # Equal constants share an entry; the type is part of the key so that
+  # true and 1, or 0 and -0, stay apart.
+  def add_constant(self, value: object) -> int:
+    key = (type(value), repr(value))
+    index = self.constant_ids.get(key)
+    if index is None:
+      index = self.constant_ids[key] = len(self.constants)
+      self.constants.append(value)
+    return index
+
+
+  def statements(self) -> list[Stmt]:
+    return [self.node(row) for row in self.roots]
+
+
+  def node(self, row: int):
+    if row < 0:
+      return None
+
+    cls, schema = SCHEMA[self.kinds[row]]
+    start = self.starts[row]
+    args = []
+    for i, (_, kind) in enumerate(schema):
+      value = self.fields[start + i]
+      if kind == 'token':
+        args.append(self.token(value))
+      elif kind == 'tokens':
+        args.append([self.token(t) for t in self.items(value)])
+      elif kind in ('exprs', 'stmts'):
+        args.append([self.node(n) for n in self.items(value)])
+      elif kind == 'value':
+        args.append(self.constants[value])
+      else:
+        args.append(self.node(value))
+    return cls(*args)
+
+
+  def items(self, offset: int) -> array:
+    return self.lists[offset + 1:offset + 1 + self.lists[offset]]
+
+
+  def token(self, row: int) -> TokenItem:
+    token_type = TOKEN_TYPES[self.token_types[row]]
+    lexeme = self.strings[self.token_lexemes[row]]
+    literal: object = None
+    if token_type == TokenType.NUMBER:
+      literal = float(lexeme)
+    elif token_type == TokenType.STRING:
+      literal = lexeme[1:-1]
+    elif token_type == TokenType.IDENTIFIER:
+      lexeme = sys.intern(lexeme)
+    return TokenItem(token_type, lexeme, literal, self.token_lines[row])
+
+
+  # Bytes held by the arrays, plus the lists of strings and constants
+  # (their objects are shared with the source and not counted).
+  @property
+  def nbytes(self) -> int:
+    columns = (self.kinds, self.starts, self.fields, self.lists, self.token_types,
+               self.token_lexemes, self.token_lines, self.roots)
+    return (sum(column.itemsize * len(column) for column in columns)
+            + sys.getsizeof(self.constants) + sys.getsizeof(self.strings))
@@ -0,0 +1,168 @@
+import gc
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import zlib
+
+from pylox.parser.expr import Expr
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_item import TokenItem
+from pylox.scanner.token_type import TokenType
+
+
+# Bump whenever the node schema below or the file layout changes.
+CACHE_VERSION = 4
+MAGIC = b'LOXC'
+CACHE_DIR = '__loxcache__'
+HEADER = MAGIC + CACHE_VERSION.to_bytes(2, 'little') + marshal.version.to_bytes(2, 'little')
+DIGEST_SIZE = 16
+
+# Every node is stored as a tuple of its schema code followed by its fields, in
+# constructor order. The field kinds tell the decoder how to rebuild each one.
+SCHEMA: list[tuple[type, tuple[tuple[str, str], ...]]] = [
+  (Expr.Assign,     (('name', 'token'), ('value', 'expr'))),
+  (Expr.Binary,     (('left', 'expr'), ('operator', 'token'), ('right', 'expr'))),
+  (Expr.Call,       (('callee', 'expr'), ('paren', 'token'), ('arguments', 'exprs'))),
+  (Expr.Grouping,   (('expression', 'expr'),)),
+  (Expr.Literal,    (('value', 'value'),)),
+  (Expr.Logical,    (('left', 'expr'), ('operator', 'token'), ('right', 'expr'))),
+  (Expr.Variable,   (('name', 'token'),)),
+  (Expr.Unary,      (('operator', 'token'), ('right', 'expr'))),
+  (Stmt.While,      (('keyword', 'token'), ('condition', 'expr'), ('body', 'stmt'))),
+  (Stmt.If,         (('keyword', 'token'), ('condition', 'expr'), ('then_branch', 'stmt'), ('else_branch', 'stmt'))),
+  (Stmt.Function,   (('name', 'token'), ('params', 'tokens'), ('body', 'stmts'))),
+  (Stmt.Block,      (('statements', 'stmts'),)),
+  (Stmt.Expression, (('expression', 'expr'),)),
+  (Stmt.Print,      (('keyword', 'token'), ('expression', 'expr'))),
+  (Stmt.Var,        (('name', 'token'), ('initializer', 'expr'))),
+  (Stmt.Return,     (('keyword', 'token'), ('value', 'expr'))),
+  (Stmt.For,        (('keyword', 'token'), ('initializer', 'stmt'), ('condition', 'expr'), ('increment', 'expr'), ('body', 'stmt'))),
+]
+
+CODES = {cls: code for code, (cls, _) in enumerate(SCHEMA)}
+
+TOKEN_TYPES = {t.value: t for t in TokenType}
+
+
+def encode_token(token: TokenItem) -> tuple:
+  return (token.token_type.value, token.lexeme, token.literal, token.line)
+
+
+def decode_token(data: tuple) -> TokenItem:
+  token_type, lexeme, literal, line = data
+  if token_type == TokenType.IDENTIFIER.value:
+    lexeme = sys.intern(lexeme)
+  return TokenItem(TOKEN_TYPES[token_type], lexeme, literal, line)
+
+
+def encode_node(node) -> tuple | None:
+  if node is None:
+    return None
+
+  code = CODES[type(node)]
+  fields = [code]
+  for name, kind in SCHEMA[code][1]:
+    value = getattr(node, name)
+    if kind == 'token':
+      fields.append(encode_token(value))
+    elif kind == 'tokens':
+      fields.append(tuple(encode_token(t) for t in value))
+    elif kind in ('exprs', 'stmts'):
+      fields.append(tuple(encode_node(n) for n in value))
+    elif kind == 'value':
+      fields.append(value)
+    else:
+      fields.append(encode_node(value))
+  return tuple(fields)
+
+
+def decode_node(data: tuple | None):
+  if data is None:
+    return None
+
+  cls, fields = SCHEMA[data[0]]
+  args = []
+  for (_, kind), value in zip(fields, data[1:]):
+    if kind == 'token':
+      args.append(decode_token(value))
+    elif kind == 'tokens':
+      args.append([decode_token(t) for t in value])
+    elif kind in ('exprs', 'stmts'):
+      args.append([decode_node(n) for n in value])
+    elif kind == 'value':
+      args.append(value)
+    else:
+      args.append(decode_node(value))
+  return cls(*args)
+
+
+def encode_statements(statements: list[Stmt]) -> bytes:
+  return zlib.compress(marshal.dumps(tuple(encode_node(s) for s in statements)), 1)
+
+
+def decode_statements(data: bytes) -> list[Stmt]:
+  # The decoded tree is acyclic, so the cyclic collector has nothing to find in
+  # it; letting it run over millions of fresh nodes triples the load time.
+  enabled = gc.isenabled()
+  gc.disable()
+  try:
+    return [decode_node(s) for s in marshal.loads(zlib.decompress(data))]
+  finally:
+    if enabled:
+      gc.enable()
+
+
+# pyc-style cache of parsed programs, kept in __loxcache__ next to the script.
+# A cache file is only used when its format version and the digest of the
+# source it was built from both match; anything else is treated as a miss.
+class ParseCache:
+  def __init__(self, script_path: str):
+    directory, name = os.path.split(os.path.abspath(script_path))
+    self.directory = os.path.join(directory, CACHE_DIR)
+    self.path = os.path.join(self.directory, os.path.splitext(name)[0] + '.loxc')
+
+
+  @staticmethod
+  def digest(source: str) -> bytes:
+    return hashlib.blake2b(source.encode('utf-8'), digest_size=DIGEST_SIZE).digest()
+
+
+  def load(self, source: str) -> list[Stmt] | None:
+    try:
+      with open(self.path, 'rb') as file:
+        data = file.read()
+    except OSError:
+      return None
+
+    prefix = HEADER + self.digest(source)
+    if not data.startswith(prefix):
+      return None
+
+    try:
+      return decode_statements(data[len(prefix):])
+    except (ValueError, EOFError, TypeError, IndexError, KeyError, RecursionError, zlib.error):
+      return None
+
+
+  def store(self, source: str, statements: list[Stmt]) -> bool:
+    try:
+      payload = encode_statements(statements)
+    except (ValueError, RecursionError):
+      return False
+
+    # Write to a temporary file first so concurrent runs never see a torn cache.
+    try:
+      os.makedirs(self.directory, exist_ok=True)
+      fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+      try:
+        with os.fdopen(fd, 'wb') as file:
+          file.write(HEADER + self.digest(source) + payload)
+        os.replace(tmp_path, self.path)
+      except BaseException:
+        os.unlink(tmp_path)
+        raise
+    except OSError:
+      return False
+    return True
@@ -1,5 +1,5 @@
 
-from typing import Callable
+from typing import Callable, Iterable, Iterator
 from pylox.parser.expr import Expr
 from pylox.parser.stmt import Stmt
 from pylox.scanner.token_item import TokenItem
@@ -11,17 +11,22 @@ class Parser:
   class ParseError(Exception):
     pass
 
-  def __init__(self, tokens: list[TokenItem], error_callback: Callable[[int, str], None]):
-    self.tokens = tokens
+  # Tokens are pulled one at a time, so a lazy token stream is only ever held
+  # in memory as far as the current and previous token.
+  def __init__(self, tokens: Iterable[TokenItem], error_callback: Callable[[int, str], None]):
+    self.tokens = iter(tokens)
     self.error_callback = error_callback
-    self.current = 0
+    self.current: TokenItem = next(self.tokens)
+    self.last: TokenItem | None = None
 
 
   def parse(self) -> list[Stmt]:
-    statements: list[Stmt] = []
+    return list(self.iter_parse())
+
+
+  def iter_parse(self) -> Iterator[Stmt]:
     while not self.is_at_end():
-      statements.append(self.declaration())
-    return statements
+      yield self.declaration()
   
 
   def declaration(self) -> Stmt | None:
@@ -43,6 +48,8 @@ class Parser:
       return self.if_statement()
     if self.match(TokenType.PRINT):
       return self.print_statement()
+    if self.match(TokenType.RETURN):
+      return self.return_statement()
     if self.match(TokenType.WHILE):
       return self.while_statement()
     if self.match(TokenType.LEFT_BRACE):
@@ -51,6 +58,7 @@ class Parser:
 
 
   def for_statement(self) -> Stmt:
+    keyword: TokenItem = self.previous()
     self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'for'.")
 
     initializer: Stmt | None
@@ -73,17 +81,9 @@ class Parser:
     
     body: Stmt = self.statement()
 
-    if increment:
-      body = Stmt.Block([body, Stmt.Expression(increment)])
-
     if not condition:
       condition = Expr.Literal(True)
-    body = Stmt.While(condition, body)
-
-    if initializer:
-      body = Stmt.Block([initializer, body])
-
-    return body
+    return Stmt.For(keyword, initializer, condition, increment, body)
 
   
   def var_declaration(self) -> Stmt.Var:
@@ -98,15 +98,17 @@ class Parser:
   
 
   def while_statement(self) -> Stmt.While:
+    keyword: TokenItem = self.previous()
     self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'while'.")
     condition: Expr = self.expression()
     self.consume(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
     body: Stmt = self.statement()
 
-    return Stmt.While(condition, body)
+    return Stmt.While(keyword, condition, body)
 
 
   def if_statement(self) -> Stmt.If:
+    keyword: TokenItem = self.previous()
     self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'if'.")
     condition: Expr = self.expression()
     self.consume(TokenType.RIGHT_PAREN, "Expect ')' after if condition.")
@@ -114,15 +116,25 @@ class Parser:
     then_branch: Stmt = self.statement()
     else_branch: Stmt | None = self.statement() if self.match(TokenType.ELSE) else None
     
-    return Stmt.If(condition, then_branch, else_branch) 
+    return Stmt.If(keyword, condition, then_branch, else_branch)
 
 
   def print_statement(self) -> Stmt.Print:
+    keyword: TokenItem = self.previous()
     value: Expr = self.expression()
     self.consume(TokenType.SEMICOLON, "Expect ';' after value.")
-    return Stmt.Print(value)
+    return Stmt.Print(keyword, value)
   
 
+  def return_statement(self) -> Stmt.Return:
+    keyword: TokenItem = self.previous()
+    value: Expr | None = None
+    if not self.check(TokenType.SEMICOLON):
+      value = self.expression()
+    self.consume(TokenType.SEMICOLON, "Expect ';' after return value.")
+    return Stmt.Return(keyword, value)
+
+
   def block(self) -> list[Stmt]:
     statements: list[Stmt] = []
 
@@ -291,7 +303,7 @@ class Parser:
       self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression")
       return Expr.Grouping(expr)
     
-    raise self.error_callback(self.peek(), "Expect expression.")
+    raise self.error(self.peek(), "Expect expression.")
 
 
   def match(self, *types: TokenType) -> bool:
@@ -316,7 +328,8 @@ class Parser:
 
   def advance(self) -> TokenItem:
     if not self.is_at_end():
-      self.current += 1
+      self.last = self.current
+      self.current = next(self.tokens)
     return self.previous()
 
 
@@ -325,11 +338,11 @@ class Parser:
 
 
   def peek(self) -> TokenItem:
-    return self.tokens[self.current]
+    return self.current
 
 
   def previous(self) -> TokenItem:
-    return self.tokens[self.current - 1]
+    return self.last
 
 
   def error(self, token: TokenItem, message: str):
@@ -0,0 +1,103 @@
+from pylox.parser.expr import Expr
+from pylox.parser.parser import Parser
+from pylox.scanner.token_type import TokenType
+
+
+# Binding powers, loosest first.
+ASSIGNMENT = 1
+OR = 2
+AND = 3
+EQUALITY = 4
+COMPARISON = 5
+TERM = 6
+FACTOR = 7
+UNARY = 8
+CALL = 9
+
+# Binding power of each token that can follow an operand.
+INFIX: dict[TokenType, int] = {
+  TokenType.EQUAL:         ASSIGNMENT,
+  TokenType.OR:            OR,
+  TokenType.AND:           AND,
+  TokenType.BANG_EQUAL:    EQUALITY,
+  TokenType.EQUAL_EQUAL:   EQUALITY,
+  TokenType.GREATER:       COMPARISON,
+  TokenType.GREATER_EQUAL: COMPARISON,
+  TokenType.LESS:          COMPARISON,
+  TokenType.LESS_EQUAL:    COMPARISON,
+  TokenType.MINUS:         TERM,
+  TokenType.PLUS:          TERM,
+  TokenType.SLASH:         FACTOR,
+  TokenType.STAR:          FACTOR,
+  TokenType.LEFT_PAREN:    CALL,
+}
+
+LOGICAL = {TokenType.OR, TokenType.AND}
+LITERALS = {TokenType.NUMBER, TokenType.STRING}
+CONSTANTS = {TokenType.FALSE: False, TokenType.TRUE: True, TokenType.NIL: None}
+PREFIX_OPERATORS = {TokenType.BANG, TokenType.MINUS}
+
+
+# Parser whose expressions are parsed by precedence climbing over the INFIX
+# table instead of one method per grammar level. Statements are parsed by
+# Parser, and the Expr trees and error reports are the same as Parser's:
+# binary and logical operators associate to the left, assignment to the
+# right, and an invalid assignment target is reported without unwinding.
+class PrattParser(Parser):
+
+  def expression(self) -> Expr:
+    return self.parse_precedence(ASSIGNMENT)
+
+
+  def parse_precedence(self, precedence: int) -> Expr:
+    expr = self.prefix()
+
+    while True:
+      token = self.current
+      power = INFIX.get(token.token_type, 0)
+      if power < precedence:
+        return expr
+      self.last = token
+      self.current = next(self.tokens)
+      token_type = token.token_type
+
+      if token_type == TokenType.LEFT_PAREN:
+        expr = self.finish_call(expr)
+      elif token_type == TokenType.EQUAL:
+        value = self.parse_precedence(ASSIGNMENT)
+        if isinstance(expr, Expr.Variable):
+          expr = Expr.Assign(expr.name, value)
+        else:
+          self.error(token, "Invalid assignment target.")
+      elif token_type in LOGICAL:
+        expr = Expr.Logical(expr, token, self.parse_precedence(power + 1))
+      else:
+        expr = Expr.Binary(expr, token, self.parse_precedence(power + 1))
+
+
+  def prefix(self) -> Expr:
+    token = self.current
+    token_type = token.token_type
+
+    if token_type == TokenType.IDENTIFIER:
+      expr = Expr.Variable(token)
+    elif token_type in LITERALS:
+      expr = Expr.Literal(token.literal)
+    elif token_type in CONSTANTS:
+      expr = Expr.Literal(CONSTANTS[token_type])
+    elif token_type in PREFIX_OPERATORS:
+      self.last = token
+      self.current = next(self.tokens)
+      return Expr.Unary(token, self.parse_precedence(UNARY))
+    elif token_type == TokenType.LEFT_PAREN:
+      self.last = token
+      self.current = next(self.tokens)
+      expr = self.expression()
+      self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression")
+      return Expr.Grouping(expr)
+    else:
+      raise self.error(token, "Expect expression.")
+
+    self.last = token
+    self.current = next(self.tokens)
+    return expr
@@ -15,6 +15,10 @@ class Stmt(ABC):
     def visit_while_stmt(self, stmt: Stmt.While):
       pass
 
+    @abstractmethod
+    def visit_for_stmt(self, stmt: Stmt.For):
+      pass
+
     @abstractmethod
     def visit_if_stmt(self, stmt: Stmt.If):
       pass
@@ -39,84 +43,156 @@ class Stmt(ABC):
     def visit_var_stmt(self, stmt: Stmt.Var):
       pass
 
+    @abstractmethod
+    def visit_return_stmt(self, stmt: Stmt.Return):
+      pass
+
 
   class While:
-    def __init__(self, condition: Expr, body: Stmt):
+    __slots__ = ('keyword', 'condition', 'body', 'vector')
+
+    def __init__(self, keyword: TokenItem, condition: Expr, body: Stmt):
+      self.keyword   = keyword
       self.condition = condition
       self.body      = body
+      self.vector = None # Set by pylox.interpreter.vectorize
 
     def accept(self, visitor: Stmt.Visitor):
-      visitor.visit_while_stmt(self)
+      return visitor.visit_while_stmt(self)
 
     def __repr__(self):
       return f'Stmt.Function(\n  {self.condition=}\n  {self.body}\n)'
 
+  # `for (initializer; condition; increment) body`. The initializer's
+  # variable lives in one loop scope, allocated once per loop.
+  class For:
+    __slots__ = ('keyword', 'initializer', 'condition', 'increment', 'body', 'slot_count', 'inline_body', 'vector')
+
+    def __init__(self, keyword: TokenItem, initializer: Stmt | None, condition: Expr, increment: Expr | None,
+                 body: Stmt):
+      self.keyword     = keyword
+      self.initializer = initializer
+      self.condition   = condition
+      self.increment   = increment
+      self.body        = body
+      # Filled in by the Resolver: the loop scope's size, and whether the body
+      # is a block without a scope of its own, whose statements run in the
+      # loop scope.
+      self.slot_count = 0
+      self.inline_body = False
+      self.vector = None # Set by pylox.interpreter.vectorize
+
+    def accept(self, visitor: Stmt.Visitor):
+      return visitor.visit_for_stmt(self)
+
+    def __repr__(self):
+      return f'Stmt.For(\n  {self.initializer=}\n  {self.condition=}\n  {self.increment=}\n  {self.body}\n)'
+
   class If:
-    def __init__(self, condition: Expr, then_branch: Stmt, else_branch: Stmt | None):
+    __slots__ = ('keyword', 'condition', 'then_branch', 'else_branch')
+
+    def __init__(self, keyword: TokenItem, condition: Expr, then_branch: Stmt, else_branch: Stmt | None):
+      self.keyword     = keyword
       self.condition   = condition
       self.then_branch = then_branch
       self.else_branch = else_branch
 
     def accept(self, visitor: Stmt.Visitor):
-      visitor.visit_if_stmt(self)
+      return visitor.visit_if_stmt(self)
 
     def __repr__(self):
       return f'Stmt.If(\n  {self.condition=}\n  {self.then_branch=}\n  {self.else_branch=}\n)'
 
   class Function:
+    __slots__ = ('name', 'params', 'body', 'slot', 'slot_count', 'pure')
+
     def __init__(self, name: TokenItem, params: list[TokenItem], body: list[Stmt]):
       self.name   = name
       self.params = params
       self.body   = body
+      # Filled in by the Resolver: where the function itself is bound (None
+      # for globals) and how many slots its call environment needs.
+      self.slot: int | None = None
+      self.slot_count = 0
+      self.pure = False # Set by pylox.interpreter.purity
 
     def accept(self, visitor: Stmt.Visitor):
-        visitor.visit_function_stmt(self)
+        return visitor.visit_function_stmt(self)
 
     def __repr__(self):
         return f'Stmt.Function(\n  {self.name=}\n  {self.params=}\n  {self.body})'
 
 
   class Block:
+    __slots__ = ('statements', 'slot_count', 'scoped')
+
     def __init__(self, statements: list[Stmt]):
       self.statements = statements
+      # Filled in by the Resolver: the block scope's size, and whether the
+      # block has a scope at all. One that declares nothing runs in the
+      # enclosing environment.
+      self.slot_count = 0
+      self.scoped = True
 
     def accept(self, visitor: Stmt.Visitor):
-      visitor.visit_block_stmt(self)
+      return visitor.visit_block_stmt(self)
 
     def __repr__(self):
       return "Stmt.Block(" + ',\n'.join([repr(s) for s in self.statements])
 
 
   class Expression:
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expr):
       self.expression = expression
 
     def accept(self, visitor: Stmt.Visitor):
-      visitor.visit_expression_stmt(self)
+      return visitor.visit_expression_stmt(self)
 
     def __repr__(self):
       return f'Stmt.Expression({self.expression=})'
 
 
   class Print:
-    def __init__(self, expression: Expr):
+    __slots__ = ('keyword', 'expression')
+
+    def __init__(self, keyword: TokenItem, expression: Expr):
+      self.keyword = keyword
       self.expression = expression
 
     def accept(self, visitor: Stmt.Visitor):
-      visitor.visit_print_stmt(self)
+      return visitor.visit_print_stmt(self)
 
     def __repr__(self):
       return f'Stmt.Print({self.expression=})'
 
 
   class Var:
+    __slots__ = ('name', 'initializer', 'slot')
+
     def __init__(self, name: TokenItem, initializer: Expr):
       self.name = name
       self.initializer = initializer
+      self.slot: int | None = None # Filled in by the Resolver; None for globals
 
     def accept(self, visitor: Stmt.Visitor):
-      visitor.visit_var_stmt(self)
+      return visitor.visit_var_stmt(self)
 
     def __repr__(self):
       return f'Stmt.Var({self.name=}, {self.initializer=})'
     
+
+
+  class Return:
+    __slots__ = ('keyword', 'value')
+
+    def __init__(self, keyword: TokenItem, value: Expr | None):
+      self.keyword = keyword
+      self.value = value
+
+    def accept(self, visitor: Stmt.Visitor):
+      return visitor.visit_return_stmt(self)
+
+    def __repr__(self):
+      return f'Stmt.Return({self.keyword=}, {self.value=})'
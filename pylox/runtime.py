@@ -0,0 +1,290 @@
+import argparse
+import mmap
+from typing import Iterable, TextIO
+
+from pylox.interpreter.closure_interpreter import ClosureInterpreter
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.optimizer import Optimizer
+from pylox.interpreter.profiling_interpreter import ProfilingInterpreter
+from pylox.interpreter.purity import find_pure_functions, global_bindings
+from pylox.interpreter.resolver import Resolver
+from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.natives.registry import pure_natives
+from pylox.parser.parse_cache import ParseCache
+from pylox.parser.parser import Parser
+from pylox.parser.pratt_parser import PrattParser
+from pylox.parser.stmt import Stmt
+from pylox.scanner.fast_scanner import FastScanner
+from pylox.scanner.scanner import Scanner
+from pylox.scanner.token_item import TokenItem
+from pylox.scanner.token_type import TokenType
+from pylox.transpiler.python_backend import PythonBackend
+from pylox.transpiler.transpiler import Transpiler
+from pylox.vm.vm import VM
+
+
+# A compile or runtime error reported by a LoxRuntime, as collected in
+# LoxRuntime.errors. str() is the text written to the runtime's output.
+class LoxError:
+  def __init__(self, kind: str, line: int, message: str, text: str):
+    self.kind = kind
+    self.line = line
+    self.message = message
+    self.text = text
+
+  def __str__(self):
+    return self.text
+
+  def __repr__(self):
+    return f'LoxError({self.kind!r}, {self.line}, {self.message!r})'
+
+
+# One independent Lox session: its own interpreter and globals, error state
+# and output sink. Nothing is shared between runtimes, so any number can run
+# side by side in threads or pool workers; a single runtime is not meant to
+# be used from two threads at once. Program output and error reports go to
+# `output` (default: the current sys.stdout); errors are also collected in
+# `errors`. The Lox class is the command line built on one runtime.
+class LoxRuntime:
+  backends = {
+    'tree': Interpreter,
+    'vm': VM,
+    'closure': ClosureInterpreter,
+    'python': PythonBackend,
+  }
+  scanner_engines = {
+    'classic': Scanner,
+    'fast': FastScanner,
+  }
+  parser_engines = {
+    'pratt': PrattParser,
+    'descent': Parser,
+  }
+
+  def __init__(self, backend: str = 'tree', scanner: str | None = None, parser: str = 'pratt', optimize: int = 0,
+               memo_size: int = 0, profile: bool = False, streaming: bool = False,
+               compact_tokens: bool = False, use_cache: bool = False, emit_python: bool = False,
+               vectorize: bool = False, scope_report: bool = False, output: TextIO | None = None):
+    if compact_tokens and scanner == 'classic':
+      raise ValueError('compact tokens are scanned by the fast scanner only')
+    self.scanner_engine = LoxRuntime.scanner_engines[scanner or 'classic']
+    # Streaming scans the mapped bytes directly, so it defaults to the fast
+    # scanner; the classic one only reads text.
+    self.stream_engine = LoxRuntime.scanner_engines[scanner or 'fast']
+    self.parser_engine = LoxRuntime.parser_engines[parser]
+    self.optimize = optimize
+    self.streaming = streaming
+    self.compact_tokens = compact_tokens
+    self.use_cache = use_cache
+    self.emit_python = emit_python
+    self.output = output
+    self.scope_report = scope_report
+    # Blocks resolved so far, and how many of them run without a scope.
+    self.blocks = 0
+    self.scopeless_blocks = 0
+    # Globals bound or assigned by earlier interpret() calls.
+    self.bound_globals: set[str] = set()
+    self.errors: list[LoxError] = []
+    self.had_error = False
+    self.had_runtime_error = False
+
+    # Profiling times the plain tree interpreter, without memoization or
+    # vectorized loops.
+    self.memo_size = 0 if profile else memo_size
+    self.vectorize = vectorize and not profile
+    self.interpreter = self.create_interpreter(backend, profile)
+    if isinstance(self.interpreter, Interpreter):
+      self.interpreter.memo_size = self.memo_size
+    self.interpreter.output = output
+
+
+  def create_interpreter(self, backend: str, profile: bool):
+    if profile:
+      return ProfilingInterpreter(self.runtime_error)
+    return LoxRuntime.backends[backend](self.runtime_error)
+
+
+  # A runtime configured from the command line options of Lox.parse_args.
+  @staticmethod
+  def from_args(args: argparse.Namespace, output: TextIO | None = None) -> 'LoxRuntime':
+    return LoxRuntime(
+      backend=args.backend,
+      scanner=args.scanner,
+      parser=args.parser,
+      optimize=args.optimize,
+      memo_size=args.memo_size if args.memoize else 0,
+      profile=args.profile or args.profile_stacks is not None,
+      streaming=args.stream,
+      compact_tokens=args.compact_tokens,
+      use_cache=args.cache,
+      emit_python=args.emit_python,
+      vectorize=args.vectorize,
+      scope_report=args.scope_report,
+      output=output,
+    )
+
+
+  # Clears the error state, keeping globals; the prompt does this after
+  # every line.
+  def reset_errors(self) -> None:
+    self.errors.clear()
+    self.had_error = False
+    self.had_runtime_error = False
+
+
+  # Runs a script and returns its exit status: 0, 65 after a compile error or
+  # 70 after a runtime error.
+  def run_file(self, path: str) -> int:
+    if self.streaming:
+      with open(path, 'rb') as file:
+        self.run_mapped(file)
+    else:
+      with open(path, 'r', encoding='utf-8') as file:
+        contents = file.read()
+      if self.use_cache:
+        self.run_cached(path, contents)
+      else:
+        self.run(contents)
+    return self.exit_code()
+
+
+  def exit_code(self) -> int:
+    if self.had_error:
+      return 65
+    if self.had_runtime_error:
+      return 70
+    return 0
+
+
+  def run(self, source: str) -> None:
+    statements: list[Stmt] = self.parse(source)
+
+    if self.had_error: return
+
+    self.interpret(statements)
+
+
+  def run_cached(self, path: str, source: str) -> None:
+    cache = ParseCache(path)
+    statements: list[Stmt] | None = cache.load(source)
+
+    if statements is None:
+      statements = self.parse(source)
+      if self.had_error: return
+      cache.store(source, statements)
+
+    self.interpret(statements)
+
+
+  def interpret(self, statements: list[Stmt]) -> None:
+    statements = Optimizer(self.optimize).optimize(statements)
+    resolver = Resolver(self.parse_error)
+    resolver.resolve(statements)
+    self.blocks += resolver.blocks
+    self.scopeless_blocks += resolver.scopeless
+    if self.had_error: return
+    if self.memo_size:
+      self.check_memoized(statements)
+    if self.vectorize:
+      # Imported here so that NumPy only loads when asked for.
+      from pylox.interpreter.vectorize import find_vector_loops
+      find_vector_loops(statements)
+    if self.emit_python:
+      print(Transpiler([]).source(statements), file=self.output)
+      return
+    self.interpreter.interpret(statements)
+
+
+  # The purity analysis only sees the statements of one interpret() call, but
+  # the prompt and --stream make one call per line or statement. Globals bound
+  # by earlier calls are remembered, and rebinding one that a memoized
+  # function may depend on (any memoized function, since they call each
+  # other, or a pure native) drops every memo so far.
+  def check_memoized(self, statements: list[Stmt]) -> None:
+    names = global_bindings(statements)
+    memoized = getattr(self.interpreter, 'memoized', ())
+    depended_on = pure_natives() | {function.declaration.name.lexeme for function in memoized}
+    if names & depended_on:
+      for function in memoized:
+        function.forget()
+    find_pure_functions(statements, pure_natives(), self.bound_globals)
+    self.bound_globals |= names
+
+
+  def report_memo(self, out: TextIO) -> None:
+    for function in getattr(self.interpreter, 'memoized', ()):
+      print(f'memo {function.declaration.name.lexeme}: {function.hits} hits, {function.misses} misses', file=out)
+
+
+  # Counted by the Resolver; each scopeless block is one environment the
+  # tree backends no longer allocate every time it runs. The VM and the
+  # Python backend allocate no environments, so there is nothing to report.
+  def report_scopes(self, out: TextIO) -> None:
+    if not isinstance(self.interpreter, Interpreter):
+      return
+    print(f'scopes: {self.scopeless_blocks} of {self.blocks} blocks run without their own environment', file=out)
+
+
+  def parse(self, source: str) -> list[Stmt]:
+    tokens: Iterable[TokenItem]
+    if self.compact_tokens:
+      tokens = FastScanner(source, self.scanner_error).scan_buffer()
+    else:
+      tokens = self.scanner_engine(source, self.scanner_error).scan_tokens()
+    parser = self.parser_engine(tokens, self.parse_error)
+    return parser.parse()
+
+
+  def run_mapped(self, file) -> None:
+    try:
+      source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError: # Empty files can't be mapped
+      source = b''
+
+    try:
+      self.run_stream(source)
+    finally:
+      if isinstance(source, mmap.mmap):
+        source.close()
+
+
+  # Top-level statements are executed as soon as they are parsed, so neither
+  # the tokens nor the program are ever fully materialized. Unlike run(), the
+  # statements before a syntax error have already executed when it is reported.
+  def run_stream(self, source: str | bytes) -> None:
+    if self.stream_engine is not FastScanner and not isinstance(source, str):
+      source = str(source, 'utf-8')
+    tokens = self.stream_engine(source, self.scanner_error).iter_tokens()
+    try:
+      parser = self.parser_engine(tokens, self.parse_error)
+      for statement in parser.iter_parse():
+        if self.had_error: return
+        self.interpret([statement])
+        if self.had_runtime_error: return
+    finally:
+      tokens.close()
+
+
+  def scanner_error(self, line: int, message: str) -> None:
+    self.report(line, "", message)
+
+
+  def parse_error(self, token: TokenItem, message: str) -> None:
+    if token.token_type == TokenType.EOF:
+      self.report(token.line, " at end", message)
+    else:
+      self.report(token.line, " at '" + token.lexeme + "'", message)
+
+
+  def runtime_error(self, error: RuntimeException) -> None:
+    text = f'Error: {error}\n[line {error.token.line}]'
+    self.errors.append(LoxError('runtime', error.token.line, str(error), text))
+    print(text, file=self.output)
+    self.had_runtime_error = True
+
+
+  def report(self, line: int, where: str, message: str) -> None:
+    text = f'[line {line}] Error{where}: {message}'
+    self.errors.append(LoxError('compile', line, message, text))
+    print(text, file=self.output)
+    self.had_error = True
@@ -0,0 +1,150 @@
+import re
+import sys
+from typing import Callable, Iterator
+
+from pylox.scanner.scanner import KEYWORDS
+from pylox.scanner.token_buffer import TokenBuffer
+from pylox.scanner.token_item import TokenItem
+from pylox.scanner.token_type import TokenType
+
+
+# Alternatives are tried in order, so comments must come before the '/' operator
+# and numbers before identifiers. Runs of blanks (including newlines), comment
+# bodies and identifier tails are consumed in a single match instead of one
+# advance() per character.
+TOKEN_REGEX = r'''
+    (?P<blank>[ \t\r\n]+)
+  | (?P<comment>//[^\n]*)
+  | (?P<number>[0-9]+(?:\.[0-9]+)?)
+  | (?P<identifier>[A-Za-z_][A-Za-z_0-9]*)
+  | (?P<string>"[^"]*")
+  | (?P<operator>[!=<>]=?|[(){},.\-+;*/])
+'''
+
+TOKEN_PATTERN = re.compile(TOKEN_REGEX + r'| (?P<error>.)', re.VERBOSE | re.DOTALL)
+
+# Byte sources (e.g. a memory-mapped file) are UTF-8; a multi-byte character
+# outside of a string literal is reported once, like the str scanners do.
+TOKEN_PATTERN_BYTES = re.compile(
+  TOKEN_REGEX.encode() + rb'| (?P<error>[\xc0-\xff][\x80-\xbf]*|.)', re.VERBOSE | re.DOTALL
+)
+
+BLANK, COMMENT, NUMBER, IDENTIFIER, STRING, OPERATOR, ERROR = range(1, 8)
+
+OPERATORS = {
+  "(":  TokenType.LEFT_PAREN,
+  ")":  TokenType.RIGHT_PAREN,
+  "{":  TokenType.LEFT_BRACE,
+  "}":  TokenType.RIGHT_BRACE,
+  ",":  TokenType.COMMA,
+  ".":  TokenType.DOT,
+  "-":  TokenType.MINUS,
+  "+":  TokenType.PLUS,
+  ";":  TokenType.SEMICOLON,
+  "/":  TokenType.SLASH,
+  "*":  TokenType.STAR,
+  "!":  TokenType.BANG,
+  "!=": TokenType.BANG_EQUAL,
+  "=":  TokenType.EQUAL,
+  "==": TokenType.EQUAL_EQUAL,
+  ">":  TokenType.GREATER,
+  ">=": TokenType.GREATER_EQUAL,
+  "<":  TokenType.LESS,
+  "<=": TokenType.LESS_EQUAL,
+}
+
+
+# Produces exactly the same TokenItem stream and error callbacks as Scanner.
+# The source may also be UTF-8 bytes or any buffer such as an mmap, which
+# iter_tokens() walks without ever decoding the whole file.
+class FastScanner:
+  def __init__(self, source: str | bytes, error_callback: Callable[[int, str], None]) -> None:
+    self.source = source
+    self.error_callback = error_callback
+    self.tokens: list[TokenItem] = []
+    self.line = 1
+
+
+  def scan_tokens(self) -> list[TokenItem]:
+    self.tokens.extend(self.iter_tokens())
+    return self.tokens
+
+
+  def iter_tokens(self) -> Iterator[TokenItem]:
+    source = self.source
+    binary = not isinstance(source, str)
+    pattern = TOKEN_PATTERN_BYTES if binary else TOKEN_PATTERN
+    newline, quote = (b'\n', b'"') if binary else ('\n', '"')
+    intern = sys.intern
+    line = 1
+
+    for m in pattern.finditer(source):
+      kind = m.lastindex
+
+      if kind == BLANK:
+        line += m.group().count(newline)
+        continue
+      if kind == COMMENT:
+        continue
+      if kind == ERROR:
+        if m.group() == quote:
+          line += source[m.start():].count(newline)
+          self.error_callback(line, "Unterminated string.")
+          break
+        self.error_callback(line, "Unexpected character.")
+        continue
+
+      text = m.group().decode() if binary else m.group()
+
+      if kind == IDENTIFIER:
+        text = intern(text)
+        yield TokenItem(KEYWORDS.get(text, TokenType.IDENTIFIER), text, None, line)
+      elif kind == OPERATOR:
+        yield TokenItem(OPERATORS[text], text, None, line)
+      elif kind == NUMBER:
+        yield TokenItem(TokenType.NUMBER, text, float(text), line)
+      elif kind == STRING:
+        line += text.count('\n')
+        yield TokenItem(TokenType.STRING, text, text[1:-1], line)
+
+    self.line = line
+    yield TokenItem(token_type=TokenType.EOF, lexeme="", literal=None, line=line)
+
+
+  # Same scan as iter_tokens(), but the tokens are recorded as rows of a
+  # TokenBuffer instead of being materialized as TokenItem objects.
+  def scan_buffer(self) -> TokenBuffer:
+    source = self.source
+    binary = not isinstance(source, str)
+    pattern = TOKEN_PATTERN_BYTES if binary else TOKEN_PATTERN
+    newline, quote = (b'\n', b'"') if binary else ('\n', '"')
+    buffer = TokenBuffer(source)
+    append = buffer.append
+    line = 1
+
+    for m in pattern.finditer(source):
+      kind = m.lastindex
+
+      if kind == BLANK:
+        line += m.group().count(newline)
+      elif kind == IDENTIFIER:
+        text = m.group().decode() if binary else m.group()
+        append(KEYWORDS.get(text, TokenType.IDENTIFIER), m.start(), m.end(), line)
+      elif kind == OPERATOR:
+        text = m.group().decode() if binary else m.group()
+        append(OPERATORS[text], m.start(), m.end(), line)
+      elif kind == NUMBER:
+        append(TokenType.NUMBER, m.start(), m.end(), line)
+      elif kind == STRING:
+        line += m.group().count(newline)
+        append(TokenType.STRING, m.start(), m.end(), line)
+      elif kind == ERROR:
+        if m.group() == quote:
+          line += source[m.start():].count(newline)
+          self.error_callback(line, "Unterminated string.")
+          break
+        self.error_callback(line, "Unexpected character.")
+
+    self.line = line
+    append(TokenType.EOF, len(source), len(source), line)
+    return buffer
@@ -1,9 +1,30 @@
-from typing import Callable
+import sys
+from typing import Callable, Iterator
 
 from pylox.scanner.token_item import TokenItem
 from pylox.scanner.token_type import TokenType
 
 
+KEYWORDS = {
+  "and":    TokenType.AND,
+  "class":  TokenType.CLASS,
+  "else":   TokenType.ELSE,
+  "false":  TokenType.FALSE,
+  "for":    TokenType.FOR,
+  "fun":    TokenType.FUN,
+  "if":     TokenType.IF,
+  "nil":    TokenType.NIL,
+  "or":     TokenType.OR,
+  "print":  TokenType.PRINT,
+  "return": TokenType.RETURN,
+  "super":  TokenType.SUPER,
+  "this":   TokenType.THIS,
+  "true":   TokenType.TRUE,
+  "var":    TokenType.VAR,
+  "while":  TokenType.WHILE
+}
+
+
 class Scanner:
   def __init__(self, source: str, error_callback: Callable[[TokenItem, str], None]) -> None:
     self.source = source
@@ -12,24 +33,7 @@ class Scanner:
     self.start = 0
     self.current = 0
     self.line = 1
-    self.keywords = {
-      "and":    TokenType.AND,
-      "class":  TokenType.CLASS,
-      "else":   TokenType.ELSE,
-      "false":  TokenType.FALSE,
-      "for":    TokenType.FOR,
-      "fun":    TokenType.FUN,
-      "if":     TokenType.IF,
-      "nil":    TokenType.NIL,
-      "or":     TokenType.OR,
-      "print":  TokenType.PRINT,
-      "return": TokenType.RETURN,
-      "super":  TokenType.SUPER,
-      "this":   TokenType.THIS,
-      "true":   TokenType.TRUE,
-      "var":    TokenType.VAR,
-      "while":  TokenType.WHILE
-    }
+    self.keywords = KEYWORDS
 
 
   def scan_tokens(self) -> list[TokenItem]:
@@ -40,6 +44,17 @@ class Scanner:
     self.tokens.append(TokenItem(token_type=TokenType.EOF, lexeme="", literal=None, line=self.line))
     return self.tokens
 
+
+  def iter_tokens(self) -> Iterator[TokenItem]:
+    while not self.is_at_end():
+      self.start = self.current
+      self.scan_token()
+      if self.tokens:
+        yield from self.tokens
+        self.tokens.clear()
+
+    yield TokenItem(token_type=TokenType.EOF, lexeme="", literal=None, line=self.line)
+
   
   def scan_token(self) -> None:
     c = self.advance()
@@ -86,9 +101,6 @@ class Scanner:
       self.string()
     elif self.is_digit(c):
       self.number()
-    elif c == 'o':
-      if self.match('r'):
-        self.add_token(token_type=TokenType.OR)
     elif self.is_alpha(c):
       self.identifier()
     else:
@@ -99,9 +111,10 @@ class Scanner:
     while self.is_alphanumeric(self.peek()):
       self.advance()
 
-    text = self.source[self.start: self.current]
+    # Names repeat constantly, so every occurrence shares one interned string.
+    text = sys.intern(self.source[self.start: self.current])
     token_type = self.keywords.get(text, TokenType.IDENTIFIER)
-    self.add_token(token_type=token_type)
+    self.tokens.append(TokenItem(token_type=token_type, lexeme=text, literal=None, line=self.line))
 
   
   def number(self) -> None:
@@ -0,0 +1,68 @@
+import sys
+from array import array
+from typing import Iterator
+
+from pylox.scanner.token_item import TokenItem
+from pylox.scanner.token_type import TokenType
+
+
+TOKEN_TYPES: list[TokenType | None] = [None] * (max(t.value for t in TokenType) + 1)
+for t in TokenType:
+  TOKEN_TYPES[t.value] = t
+
+
+# Struct-of-arrays token store: one row per token, split over typed array
+# columns that point back into the source. A TokenItem is only built when a
+# row is read, and its literal is recomputed from the lexeme.
+class TokenBuffer:
+  def __init__(self, source: str | bytes):
+    self.source = source
+    self.types = array('B')
+    self.starts = array('I')
+    self.ends = array('I')
+    self.lines = array('I')
+
+
+  def append(self, token_type: TokenType, start: int, end: int, line: int) -> None:
+    self.types.append(token_type.value)
+    self.starts.append(start)
+    self.ends.append(end)
+    self.lines.append(line)
+
+
+  def __len__(self) -> int:
+    return len(self.types)
+
+
+  def __getitem__(self, index: int) -> TokenItem:
+    token_type = TOKEN_TYPES[self.types[index]]
+    lexeme = self.lexeme(index)
+
+    literal: object = None
+    if token_type == TokenType.NUMBER:
+      literal = float(lexeme)
+    elif token_type == TokenType.STRING:
+      literal = lexeme[1:-1]
+    elif token_type != TokenType.EOF:
+      lexeme = sys.intern(lexeme)
+
+    return TokenItem(token_type, lexeme, literal, self.lines[index])
+
+
+  def __iter__(self) -> Iterator[TokenItem]:
+    for i in range(len(self)):
+      yield self[i]
+
+
+  def token_type(self, index: int) -> TokenType:
+    return TOKEN_TYPES[self.types[index]]
+
+
+  def lexeme(self, index: int) -> str:
+    text = self.source[self.starts[index]:self.ends[index]]
+    return text if isinstance(text, str) else text.decode()
+
+
+  @property
+  def nbytes(self) -> int:
+    return sum(column.itemsize * len(column) for column in (self.types, self.starts, self.ends, self.lines))
@@ -0,0 +1,88 @@
+from typing import Callable, TextIO
+
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.lox_callable import LoxCallable
+from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.natives.registry import NativeError, NativeFunction, install
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_item import TokenItem
+from pylox.scanner.token_type import TokenType
+from pylox.transpiler.python_function import PythonFunction
+from pylox.transpiler.transpiler import FILENAME, Transpiler, global_name
+
+
+# Runs programs by transpiling them to Python and handing the result to
+# CPython's own compiler. It is a drop-in alternative to Interpreter: same
+# constructor, same interpret() entry point, same values, output and
+# RuntimeExceptions. Globals live in one namespace shared by every run.
+class PythonBackend:
+  stringify = Interpreter.stringify
+
+  def __init__(self, error_callback: Callable[[RuntimeException], None]):
+    self.error_callback = error_callback
+    self.sites: list[tuple[TokenItem, str | None]] = []
+    self.output: TextIO | None = None
+    self.namespace: dict[str, object] = {
+      '_print': self.print,
+      '_call': self.make_call(),
+      '_error': self.error,
+      '_function': PythonFunction,
+    }
+    install(lambda name, native: self.namespace.__setitem__(global_name(name), native))
+
+
+  def interpret(self, statements: list[Stmt]):
+    code = compile(Transpiler(self.sites).transpile(statements), FILENAME, 'exec')
+    try:
+      exec(code, self.namespace)
+    except RuntimeException as e:
+      self.error_callback(e)
+    except NameError as e:
+      if not (e.name or '').startswith(global_name('')):
+        raise
+      self.error_callback(self.undefined_variable(e))
+
+
+  # Undefined globals raise NameError; the innermost generated frame's line
+  # is the Lox line of the variable.
+  @staticmethod
+  def undefined_variable(error: NameError) -> RuntimeException:
+    line = 0
+    tb = error.__traceback__
+    while tb:
+      if tb.tb_frame.f_code.co_filename == FILENAME:
+        line = tb.tb_lineno
+      tb = tb.tb_next
+    lexeme = error.name[len(global_name('')):]
+    token = TokenItem(TokenType.IDENTIFIER, lexeme, None, line)
+    return RuntimeException(token, f"Undefined variable '{lexeme}'.")
+
+
+  def print(self, value: object) -> None:
+    print(self.stringify(value), file=self.output)
+
+
+  def error(self, site: int):
+    raise RuntimeException(*self.sites[site])
+
+
+  def make_call(self) -> Callable[..., object]:
+    sites = self.sites
+
+    def call(site: int, callee: object, *arguments: object) -> object:
+      if type(callee) is PythonFunction and len(arguments) == callee.param_count:
+        return callee.function(*arguments)
+
+      paren = sites[site][0]
+      if type(callee) is NativeFunction and len(arguments) == callee.param_count:
+        try:
+          return callee.function(*arguments)
+        except NativeError as e:
+          raise RuntimeException(paren, str(e)) from None
+      if not isinstance(callee, LoxCallable):
+        raise RuntimeException(paren, 'Can only call functions and classes.')
+      if len(arguments) != callee.arity():
+        raise RuntimeException(paren, f'Expected {callee.arity()} arguments but got {len(arguments)}.')
+      return callee.call(self, list(arguments))
+
+    return call
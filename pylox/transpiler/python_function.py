@@ -0,0 +1,21 @@
+from typing import Callable
+
+from pylox.interpreter.lox_callable import LoxCallable
+
+
+# A Lox function transpiled to a plain Python function. `param_count` is kept
+# as an attribute so the generated `_call` helper can check it without a call.
+class PythonFunction(LoxCallable):
+  def __init__(self, name: str, param_count: int, function: Callable[..., object]):
+    self.name = name
+    self.param_count = param_count
+    self.function = function
+
+  def arity(self) -> int:
+    return self.param_count
+
+  def call(self, interpreter, arguments: list[object]) -> object:
+    return self.function(*arguments)
+
+  def __repr__(self):
+    return f'<fn {self.name}>'
@@ -0,0 +1,366 @@
+import ast
+
+from pylox.parser.expr import Expr
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_item import TokenItem
+from pylox.scanner.token_type import TokenType
+
+
+FILENAME = '<lox>'
+MAIN = '_main'
+
+COMPARISONS = {
+  TokenType.GREATER:       ast.Gt,
+  TokenType.GREATER_EQUAL: ast.GtE,
+  TokenType.LESS:          ast.Lt,
+  TokenType.LESS_EQUAL:    ast.LtE,
+  TokenType.EQUAL_EQUAL:   ast.Eq,
+  TokenType.BANG_EQUAL:    ast.NotEq,
+}
+
+ARITHMETIC = {
+  TokenType.MINUS: ast.Sub,
+  TokenType.PLUS:  ast.Add,
+  TokenType.SLASH: ast.Div,
+  TokenType.STAR:  ast.Mult,
+}
+
+
+def load(name: str, line: int | None = None) -> ast.Name:
+  node = ast.Name(name, ast.Load())
+  if line is not None:
+    node.lineno = node.end_lineno = line
+    node.col_offset = node.end_col_offset = 0
+  return node
+
+
+def store(name: str) -> ast.Name:
+  return ast.Name(name, ast.Store())
+
+
+def call(name: str, *args: ast.expr) -> ast.Call:
+  return ast.Call(load(name), list(args), [])
+
+
+def type_of(node: ast.expr) -> ast.Call:
+  return call('type', node)
+
+
+# Name of a Lox global in the generated module. Locals are `l_<name>_<n>` and
+# temporaries `_t_<n>`, so the three can never collide with each other or with
+# the `_`-prefixed runtime helpers.
+def global_name(lexeme: str) -> str:
+  return 'g_' + lexeme
+
+
+# Translates a resolved program into a Python module that CPython compiles and
+# runs. Lox semantics are kept inline where they are cheap (number checks,
+# truthiness, right-to-left operand order) and through the helpers installed
+# by PythonBackend otherwise:
+#
+#   _print(value)          prints stringify(value)
+#   _call(site, f, *args)  calls a Lox callable, checking it and its arity
+#   _error(site)           raises the RuntimeException recorded for a site
+#   _function(name, arity, f)  wraps a def as a Lox function
+#
+# A site is an index into `sites`, which holds the token (and message) each
+# runtime error is reported against. Lox globals are module globals, so an
+# undefined one surfaces as a NameError; the Name node carries the Lox line.
+# The whole program runs inside `_main` so block locals are fast locals.
+class Transpiler(Expr.Visitor, Stmt.Visitor):
+
+  def __init__(self, sites: list[tuple[TokenItem, str | None]]):
+    self.sites = sites
+    self.scopes: list[dict[int, str]] = []
+    self.assigned: set[str] = set()
+    self.names = 0
+
+
+  def transpile(self, statements: list[Stmt]) -> ast.Module:
+    body = self.function_body(statements, [{}])
+    main = ast.FunctionDef(MAIN, self.arguments([]), body, [], None)
+    module = ast.Module([main, ast.Expr(call(MAIN))], [])
+    return ast.fix_missing_locations(module)
+
+
+  def source(self, statements: list[Stmt]) -> str:
+    return ast.unparse(self.transpile(statements))
+
+
+  def function_body(self, statements: list[Stmt], scopes: list[dict[int, str]]) -> list[ast.stmt]:
+    enclosing = self.scopes, self.assigned
+    self.scopes, self.assigned = scopes, set()
+    body = self.block(statements)
+    if self.assigned:
+      body.insert(0, ast.Global(sorted(self.assigned)))
+    self.scopes, self.assigned = enclosing
+    return body
+
+
+  def block(self, statements: list[Stmt]) -> list[ast.stmt]:
+    body = []
+    for stmt in statements:
+      body.extend(stmt.accept(self))
+    return body or [ast.Pass()]
+
+
+  @staticmethod
+  def arguments(names: list[str]) -> ast.arguments:
+    return ast.arguments([], [ast.arg(n) for n in names], None, [], [], None, [])
+
+
+  def fresh(self, prefix: str) -> str:
+    self.names += 1
+    return f'{prefix}_{self.names}'
+
+
+  def site(self, token: TokenItem, message: str | None = None) -> ast.Constant:
+    self.sites.append((token, message))
+    return ast.Constant(len(self.sites) - 1)
+
+
+  def error(self, token: TokenItem, message: str) -> ast.Call:
+    return call('_error', self.site(token, message))
+
+
+  # Python name the value of a declaration is bound to.
+  def declare(self, name: TokenItem, slot: int | None) -> str:
+    if slot is None:
+      target = global_name(name.lexeme)
+      self.assigned.add(target)
+      return target
+    scope = self.scopes[-1]
+    if slot not in scope:
+      scope[slot] = self.fresh('l_' + name.lexeme)
+    return scope[slot]
+
+
+  def variable(self, expr: Expr.Variable | Expr.Assign) -> str:
+    if expr.slot is None:
+      return global_name(expr.name.lexeme)
+    return self.scopes[-1 - expr.depth][expr.slot]
+
+
+  # Returns (first, again): an expression evaluating `expr` once, and one that
+  # reads the result again afterwards. Names and constants are re-read
+  # directly; anything else is bound to a temporary with `:=`.
+  def operand(self, expr: Expr) -> tuple[ast.expr, ast.expr]:
+    node = self.compile(expr)
+    if isinstance(node, (ast.Constant, ast.Name)):
+      return node, self.reread(node)
+    temp = self.fresh('_t')
+    return ast.NamedExpr(store(temp), node), load(temp)
+
+
+  @staticmethod
+  def reread(node: ast.Name | ast.Constant) -> ast.expr:
+    if isinstance(node, ast.Constant):
+      return ast.Constant(node.value)
+    return load(node.id)
+
+
+  def compile(self, expr: Expr) -> ast.expr:
+    return expr.accept(self)
+
+
+  # Expressions whose value is always a Python bool, so Python's truthiness
+  # agrees with Lox's for them.
+  def is_bool(self, expr: Expr) -> bool:
+    if isinstance(expr, Expr.Grouping):
+      return self.is_bool(expr.expression)
+    if isinstance(expr, Expr.Literal):
+      return isinstance(expr.value, bool)
+    if isinstance(expr, Expr.Binary):
+      return expr.operator.token_type in COMPARISONS
+    if isinstance(expr, Expr.Unary):
+      return expr.operator.token_type == TokenType.BANG
+    if isinstance(expr, Expr.Logical):
+      return self.is_bool(expr.left) and self.is_bool(expr.right)
+    return False
+
+
+  # Expressions that can be evaluated at any point without side effects or
+  # errors: literals and locals.
+  @staticmethod
+  def is_inert(expr: Expr) -> bool:
+    while isinstance(expr, Expr.Grouping):
+      expr = expr.expression
+    return isinstance(expr, Expr.Literal) or (isinstance(expr, Expr.Variable) and expr.slot is not None)
+
+
+  def truthy(self, expr: Expr) -> ast.expr:
+    if self.is_bool(expr):
+      return self.compile(expr)
+    return self.is_truthy(*self.operand(expr))
+
+
+  @staticmethod
+  def is_truthy(first: ast.expr, again: ast.expr) -> ast.expr:
+    if isinstance(first, ast.Constant):
+      return ast.Constant(first.value is not None and first.value is not False)
+    return ast.BoolOp(ast.And(), [
+      ast.Compare(first, [ast.IsNot()], [ast.Constant(None)]),
+      ast.Compare(again, [ast.IsNot()], [ast.Constant(False)]),
+    ])
+
+
+  def visit_expression_stmt(self, stmt: Stmt.Expression) -> list[ast.stmt]:
+    expr = stmt.expression
+    if isinstance(expr, Expr.Assign) and expr.slot is not None:
+      return [ast.Assign([store(self.variable(expr))], self.compile(expr.value))]
+    return [ast.Expr(self.compile(expr))]
+
+
+  def visit_print_stmt(self, stmt: Stmt.Print) -> list[ast.stmt]:
+    return [ast.Expr(call('_print', self.compile(stmt.expression)))]
+
+
+  def visit_var_stmt(self, stmt: Stmt.Var) -> list[ast.stmt]:
+    value = self.compile(stmt.initializer) if stmt.initializer else ast.Constant(None)
+    return [ast.Assign([store(self.declare(stmt.name, stmt.slot))], value)]
+
+
+  def visit_function_stmt(self, stmt: Stmt.Function) -> list[ast.stmt]:
+    target = self.declare(stmt.name, stmt.slot)
+    params = [self.fresh('l_' + param.lexeme) for param in stmt.params]
+    body = self.function_body(stmt.body, [dict(enumerate(params))])
+    function = ast.FunctionDef(target, self.arguments(params), body, [], None)
+    wrapped = call('_function', ast.Constant(stmt.name.lexeme), ast.Constant(len(stmt.params)), load(target))
+    return [function, ast.Assign([store(target)], wrapped)]
+
+
+  def visit_return_stmt(self, stmt: Stmt.Return) -> list[ast.stmt]:
+    return [ast.Return(self.compile(stmt.value) if stmt.value else None)]
+
+
+  def visit_block_stmt(self, stmt: Stmt.Block) -> list[ast.stmt]:
+    if not stmt.scoped:
+      return self.block(stmt.statements)
+    self.scopes.append({})
+    body = self.block(stmt.statements)
+    self.scopes.pop()
+    return body
+
+
+  def visit_if_stmt(self, stmt: Stmt.If) -> list[ast.stmt]:
+    orelse = self.block([stmt.else_branch]) if stmt.else_branch else []
+    return [ast.If(self.truthy(stmt.condition), self.block([stmt.then_branch]), orelse)]
+
+
+  def visit_while_stmt(self, stmt: Stmt.While) -> list[ast.stmt]:
+    return [ast.While(self.truthy(stmt.condition), self.block([stmt.body]), [])]
+
+
+  def visit_for_stmt(self, stmt: Stmt.For) -> list[ast.stmt]:
+    self.scopes.append({})
+    body = stmt.initializer.accept(self) if stmt.initializer else []
+    test = self.truthy(stmt.condition)
+    loop = self.block(stmt.body.statements if stmt.inline_body else [stmt.body])
+    if stmt.increment:
+      loop.append(ast.Expr(self.compile(stmt.increment)))
+    body.append(ast.While(test, loop, []))
+    self.scopes.pop()
+    return body
+
+
+  def visit_literal_expr(self, expr: Expr.Literal) -> ast.expr:
+    return ast.Constant(expr.value)
+
+
+  def visit_grouping_expr(self, expr: Expr.Grouping) -> ast.expr:
+    return self.compile(expr.expression)
+
+
+  def visit_variable_expr(self, expr: Expr.Variable) -> ast.expr:
+    return load(self.variable(expr), expr.name.line)
+
+
+  def visit_assign_expr(self, expr: Expr.Assign) -> ast.expr:
+    value = self.compile(expr.value)
+    target = self.variable(expr)
+    if expr.slot is None:
+      # Read the global after evaluating the value so an undefined name fails
+      # the way Environment.assign does.
+      self.assigned.add(target)
+      value = ast.Subscript(ast.Tuple([value, load(target, expr.name.line)], ast.Load()), ast.Constant(0), ast.Load())
+    return ast.NamedExpr(store(target), value)
+
+
+  def visit_logical_expr(self, expr: Expr.Logical) -> ast.expr:
+    is_or = expr.operator.token_type == TokenType.OR
+    if self.is_bool(expr.left):
+      op = ast.Or() if is_or else ast.And()
+      return ast.BoolOp(op, [self.compile(expr.left), self.compile(expr.right)])
+
+    first, again = self.operand(expr.left)
+    test = self.is_truthy(first, again)
+    left = self.reread(again)
+    right = self.compile(expr.right)
+    if is_or:
+      return ast.IfExp(test, left, right)
+    return ast.IfExp(test, right, left)
+
+
+  def visit_unary_expr(self, expr: Expr.Unary) -> ast.expr:
+    if expr.operator.token_type == TokenType.BANG:
+      if self.is_bool(expr.right):
+        return ast.UnaryOp(ast.Not(), self.compile(expr.right))
+      first, again = self.operand(expr.right)
+      if isinstance(first, ast.Constant):
+        return ast.Constant(first.value is None or first.value is False)
+      return ast.BoolOp(ast.Or(), [
+        ast.Compare(first, [ast.Is()], [ast.Constant(None)]),
+        ast.Compare(again, [ast.Is()], [ast.Constant(False)]),
+      ])
+
+    first, again = self.operand(expr.right)
+    test = ast.Compare(type_of(first), [ast.Is()], [load('float')])
+    return ast.IfExp(test, ast.UnaryOp(ast.USub(), again), self.error(expr.operator, "Operand must be a number."))
+
+
+  # Lox evaluates the right operand before the left one. Both are evaluated in
+  # the test of a conditional expression, right first, before either is
+  # checked; the result then reuses them.
+  def visit_binary_expr(self, expr: Expr.Binary) -> ast.expr:
+    token_type = expr.operator.token_type
+
+    if token_type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
+      op = COMPARISONS[token_type]()
+      if self.is_inert(expr.left) or self.is_inert(expr.right):
+        return ast.Compare(self.compile(expr.left), [op], [self.compile(expr.right)])
+      right_first, right = self.operand(expr.right)
+      pair = ast.Tuple([right_first, ast.Compare(self.compile(expr.left), [op], [right])], ast.Load())
+      return ast.Subscript(pair, ast.Constant(1), ast.Load())
+
+    right_first, right = self.operand(expr.right)
+    left_first, left = self.operand(expr.left)
+
+    if token_type == TokenType.PLUS:
+      types = (float, str)
+      message = "Operand must be two numbers or two strings."
+    else:
+      types = (float,)
+      message = "Operand must be a number."
+
+    # With a number (or, for `+`, string) literal on one side only the other
+    # side needs checking.
+    if isinstance(right_first, ast.Constant) and type(right_first.value) in types:
+      test = ast.Compare(type_of(left_first), [ast.Is()], [load(type(right_first.value).__name__)])
+    elif isinstance(left_first, ast.Constant) and type(left_first.value) in types:
+      test = ast.Compare(type_of(right_first), [ast.Is()], [load(type(left_first.value).__name__)])
+    elif len(types) == 1:
+      test = ast.Compare(type_of(right_first), [ast.Is(), ast.Is()], [type_of(left_first), load('float')])
+    else:
+      allowed = ast.Tuple([load('float'), load('str')], ast.Load())
+      test = ast.Compare(type_of(right_first), [ast.Is(), ast.In()], [type_of(left_first), allowed])
+
+    if token_type in COMPARISONS:
+      result = ast.Compare(left, [COMPARISONS[token_type]()], [right])
+    else:
+      result = ast.BinOp(left, ARITHMETIC[token_type](), right)
+    return ast.IfExp(test, result, self.error(expr.operator, message))
+
+
+  def visit_call_expr(self, expr: Expr.Call) -> ast.expr:
+    arguments = [self.compile(argument) for argument in expr.arguments]
+    return call('_call', self.site(expr.paren), self.compile(expr.callee), *arguments)
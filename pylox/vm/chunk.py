@@ -0,0 +1,47 @@
+from array import array
+
+from pylox.scanner.token_item import TokenItem
+
+
+# A compiled function body. Every instruction is one opcode byte in `code` and
+# one operand in the parallel `args` column (0 when the opcode takes none), so
+# jumps address instruction indices directly. Instructions that can fail keep
+# the token they report errors at in `tokens`.
+class Chunk:
+  def __init__(self):
+    self.code = array('B')
+    self.args = array('I')
+    self.constants: list[object] = []
+    self.tokens: dict[int, TokenItem] = {}
+    self.constant_index: dict[tuple[type, str], int] = {}
+
+
+  def write(self, op: int, arg: int = 0, token: TokenItem | None = None) -> int:
+    offset = len(self.code)
+    self.code.append(op)
+    self.args.append(arg)
+    if token is not None:
+      self.tokens[offset] = token
+    return offset
+
+
+  def patch(self, offset: int, arg: int) -> None:
+    self.args[offset] = arg
+
+
+  def add_constant(self, value: object) -> int:
+    if not isinstance(value, (float, str, bool)) and value is not None:
+      self.constants.append(value)
+      return len(self.constants) - 1
+
+    # repr() keeps 0.0 and -0.0 (and 1.0 and True) apart.
+    key = (type(value), repr(value))
+    index = self.constant_index.get(key)
+    if index is None:
+      index = self.constant_index[key] = len(self.constants)
+      self.constants.append(value)
+    return index
+
+
+  def __len__(self) -> int:
+    return len(self.code)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from pylox.parser.expr import Expr
+from pylox.parser.stmt import Stmt
+from pylox.scanner.token_type import TokenType
+from pylox.vm.chunk import Chunk
+from pylox.vm.opcode import OpCode
+from pylox.vm.vm_function import VMFunction
+
+
+BINARY_OPCODES = {
+  TokenType.BANG_EQUAL:    OpCode.NOT_EQUAL,
+  TokenType.EQUAL_EQUAL:   OpCode.EQUAL,
+  TokenType.GREATER:       OpCode.GREATER,
+  TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+  TokenType.LESS:          OpCode.LESS,
+  TokenType.LESS_EQUAL:    OpCode.LESS_EQUAL,
+  TokenType.MINUS:         OpCode.SUBTRACT,
+  TokenType.PLUS:          OpCode.ADD,
+  TokenType.SLASH:         OpCode.DIVIDE,
+  TokenType.STAR:          OpCode.MULTIPLY,
+}
+
+
+class FunctionState:
+  def __init__(self, enclosing: FunctionState | None, name: str, arity: int):
+    self.enclosing = enclosing
+    self.function = VMFunction(name, arity, Chunk())
+    self.locals: list[tuple[str, int]] = []
+    self.scope_depth = 0 if enclosing is None else 1
+
+
+# Lowers a parsed program to bytecode for the VM. Variables declared inside a
+# block or function live in stack slots resolved here; top-level declarations
+# are globals. Like the tree-walking Interpreter, a function body only sees its
+# own locals and the globals, never the scopes it was declared in.
+class Compiler(Expr.Visitor, Stmt.Visitor):
+
+  def __init__(self):
+    self.state: FunctionState | None = None
+
+
+  def compile(self, statements: list[Stmt]) -> VMFunction:
+    self.state = FunctionState(None, 'script', 0)
+    for stmt in statements:
+      stmt.accept(self)
+    self.emit(OpCode.NIL)
+    self.emit(OpCode.RETURN)
+    return self.state.function
+
+
+  @property
+  def chunk(self) -> Chunk:
+    return self.state.function.chunk
+
+
+  def emit(self, op: OpCode, arg: int = 0, token=None) -> int:
+    return self.chunk.write(op, arg, token)
+
+
+  def emit_constant(self, value: object) -> None:
+    self.emit(OpCode.CONSTANT, self.chunk.add_constant(value))
+
+
+  def patch_jump(self, offset: int) -> None:
+    self.chunk.patch(offset, len(self.chunk))
+
+
+  def compile_expr(self, expr: Expr) -> None:
+    expr.accept(self)
+
+
+  def begin_scope(self) -> None:
+    self.state.scope_depth += 1
+
+
+  def end_scope(self) -> None:
+    state = self.state
+    state.scope_depth -= 1
+    count = 0
+    while state.locals and state.locals[-1][1] > state.scope_depth:
+      state.locals.pop()
+      count += 1
+    if count:
+      self.emit(OpCode.POPN, count)
+
+
+  def resolve_local(self, name: str) -> int | None:
+    locals = self.state.locals
+    for slot in range(len(locals) - 1, -1, -1):
+      if locals[slot][0] == name:
+        return slot
+    return None
+
+
+  # Binds the value on top of the stack to `name` in the current scope.
+  def declare(self, name) -> None:
+    state = self.state
+    if state.scope_depth == 0:
+      self.emit(OpCode.DEFINE_GLOBAL, self.chunk.add_constant(name.lexeme))
+      return
+
+    # Redeclaring a name in the same scope overwrites it, as Environment.define does.
+    for slot in range(len(state.locals) - 1, -1, -1):
+      local_name, depth = state.locals[slot]
+      if depth < state.scope_depth:
+        break
+      if local_name == name.lexeme:
+        self.emit(OpCode.SET_LOCAL, slot)
+        self.emit(OpCode.POP)
+        return
+
+    state.locals.append((name.lexeme, state.scope_depth))
+
+
+  def visit_expression_stmt(self, stmt: Stmt.Expression) -> None:
+    self.compile_expr(stmt.expression)
+    self.emit(OpCode.POP)
+
+
+  def visit_print_stmt(self, stmt: Stmt.Print) -> None:
+    self.compile_expr(stmt.expression)
+    self.emit(OpCode.PRINT)
+
+
+  def visit_var_stmt(self, stmt: Stmt.Var) -> None:
+    if stmt.initializer:
+      self.compile_expr(stmt.initializer)
+    else:
+      self.emit(OpCode.NIL)
+    self.declare(stmt.name)
+
+
+  def visit_function_stmt(self, stmt: Stmt.Function) -> None:
+    self.state = FunctionState(self.state, stmt.name.lexeme, len(stmt.params))
+    # Every argument gets its own slot; a repeated parameter name resolves to
+    # the last one, matching Environment.define.
+    for param in stmt.params:
+      self.state.locals.append((param.lexeme, 1))
+    for body_stmt in stmt.body:
+      body_stmt.accept(self)
+    self.emit(OpCode.NIL)
+    self.emit(OpCode.RETURN)
+
+    function = self.state.function
+    self.state = self.state.enclosing
+    self.emit_constant(function)
+    self.declare(stmt.name)
+
+
+  def visit_return_stmt(self, stmt: Stmt.Return) -> None:
+    if stmt.value:
+      self.compile_expr(stmt.value)
+    else:
+      self.emit(OpCode.NIL)
+    self.emit(OpCode.RETURN)
+
+
+  def visit_block_stmt(self, stmt: Stmt.Block) -> None:
+    self.begin_scope()
+    for s in stmt.statements:
+      s.accept(self)
+    self.end_scope()
+
+
+  def visit_if_stmt(self, stmt: Stmt.If) -> None:
+    self.compile_expr(stmt.condition)
+    else_jump = self.emit(OpCode.POP_JUMP_IF_FALSE)
+    stmt.then_branch.accept(self)
+
+    if stmt.else_branch:
+      end_jump = self.emit(OpCode.JUMP)
+      self.patch_jump(else_jump)
+      stmt.else_branch.accept(self)
+      self.patch_jump(end_jump)
+    else:
+      self.patch_jump(else_jump)
+
+
+  def visit_while_stmt(self, stmt: Stmt.While) -> None:
+    loop_start = len(self.chunk)
+    self.compile_expr(stmt.condition)
+    exit_jump = self.emit(OpCode.POP_JUMP_IF_FALSE)
+    stmt.body.accept(self)
+    self.emit(OpCode.JUMP, loop_start)
+    self.patch_jump(exit_jump)
+
+
+  def visit_for_stmt(self, stmt: Stmt.For) -> None:
+    self.begin_scope()
+    if stmt.initializer:
+      stmt.initializer.accept(self)
+    loop_start = len(self.chunk)
+    self.compile_expr(stmt.condition)
+    exit_jump = self.emit(OpCode.POP_JUMP_IF_FALSE)
+    stmt.body.accept(self)
+    if stmt.increment:
+      self.compile_expr(stmt.increment)
+      self.emit(OpCode.POP)
+    self.emit(OpCode.JUMP, loop_start)
+    self.patch_jump(exit_jump)
+    self.end_scope()
+
+
+  def visit_literal_expr(self, expr: Expr.Literal) -> None:
+    if expr.value is None:
+      self.emit(OpCode.NIL)
+    elif expr.value is True:
+      self.emit(OpCode.TRUE)
+    elif expr.value is False:
+      self.emit(OpCode.FALSE)
+    else:
+      self.emit_constant(expr.value)
+
+
+  def visit_grouping_expr(self, expr: Expr.Grouping) -> None:
+    self.compile_expr(expr.expression)
+
+
+  def visit_logical_expr(self, expr: Expr.Logical) -> None:
+    self.compile_expr(expr.left)
+    jump = OpCode.JUMP_IF_TRUE if expr.operator.token_type == TokenType.OR else OpCode.JUMP_IF_FALSE
+    end_jump = self.emit(jump)
+    self.emit(OpCode.POP)
+    self.compile_expr(expr.right)
+    self.patch_jump(end_jump)
+
+
+  def visit_unary_expr(self, expr: Expr.Unary) -> None:
+    self.compile_expr(expr.right)
+    if expr.operator.token_type == TokenType.MINUS:
+      self.emit(OpCode.NEGATE, token=expr.operator)
+    else:
+      self.emit(OpCode.NOT)
+
+
+  # The Interpreter evaluates the right operand first, so the VM does too.
+  def visit_binary_expr(self, expr: Expr.Binary) -> None:
+    self.compile_expr(expr.right)
+    self.compile_expr(expr.left)
+    self.emit(BINARY_OPCODES[expr.operator.token_type], token=expr.operator)
+
+
+  def visit_variable_expr(self, expr: Expr.Variable) -> None:
+    slot = self.resolve_local(expr.name.lexeme)
+    if slot is not None:
+      self.emit(OpCode.GET_LOCAL, slot)
+    else:
+      self.emit(OpCode.GET_GLOBAL, self.chunk.add_constant(expr.name.lexeme), expr.name)
+
+
+  def visit_assign_expr(self, expr: Expr.Assign) -> None:
+    self.compile_expr(expr.value)
+    slot = self.resolve_local(expr.name.lexeme)
+    if slot is not None:
+      self.emit(OpCode.SET_LOCAL, slot)
+    else:
+      self.emit(OpCode.SET_GLOBAL, self.chunk.add_constant(expr.name.lexeme), expr.name)
+
+
+  def visit_call_expr(self, expr: Expr.Call) -> None:
+    self.compile_expr(expr.callee)
+    for arg in expr.arguments:
+      self.compile_expr(arg)
+    self.emit(OpCode.CALL, len(expr.arguments), expr.paren)
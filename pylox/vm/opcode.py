@@ -0,0 +1,43 @@
+from enum import IntEnum, unique
+
+
+@unique
+class OpCode(IntEnum):
+  # Stack
+  CONSTANT = 0
+  NIL = 1
+  TRUE = 2
+  FALSE = 3
+  POP = 4
+  POPN = 5
+
+  # Variables
+  GET_LOCAL = 6
+  SET_LOCAL = 7
+  GET_GLOBAL = 8
+  SET_GLOBAL = 9
+  DEFINE_GLOBAL = 10
+
+  # Operators
+  EQUAL = 11
+  NOT_EQUAL = 12
+  GREATER = 13
+  GREATER_EQUAL = 14
+  LESS = 15
+  LESS_EQUAL = 16
+  ADD = 17
+  SUBTRACT = 18
+  MULTIPLY = 19
+  DIVIDE = 20
+  NOT = 21
+  NEGATE = 22
+
+  # Control flow
+  JUMP = 23
+  JUMP_IF_FALSE = 24
+  JUMP_IF_TRUE = 25
+  POP_JUMP_IF_FALSE = 26
+  CALL = 27
+  RETURN = 28
+
+  PRINT = 29
@@ -0,0 +1,267 @@
+from typing import Callable, TextIO
+
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.lox_callable import LoxCallable
+from pylox.interpreter.runtime_exception import RuntimeException
+from pylox.natives.registry import NativeError, NativeFunction, install
+from pylox.parser.stmt import Stmt
+from pylox.vm.compiler import Compiler
+from pylox.vm.opcode import OpCode
+from pylox.vm.vm_function import VMFunction
+
+
+CONSTANT = OpCode.CONSTANT.value
+NIL = OpCode.NIL.value
+TRUE = OpCode.TRUE.value
+FALSE = OpCode.FALSE.value
+POP = OpCode.POP.value
+POPN = OpCode.POPN.value
+GET_LOCAL = OpCode.GET_LOCAL.value
+SET_LOCAL = OpCode.SET_LOCAL.value
+GET_GLOBAL = OpCode.GET_GLOBAL.value
+SET_GLOBAL = OpCode.SET_GLOBAL.value
+DEFINE_GLOBAL = OpCode.DEFINE_GLOBAL.value
+EQUAL = OpCode.EQUAL.value
+NOT_EQUAL = OpCode.NOT_EQUAL.value
+GREATER = OpCode.GREATER.value
+GREATER_EQUAL = OpCode.GREATER_EQUAL.value
+LESS = OpCode.LESS.value
+LESS_EQUAL = OpCode.LESS_EQUAL.value
+ADD = OpCode.ADD.value
+SUBTRACT = OpCode.SUBTRACT.value
+MULTIPLY = OpCode.MULTIPLY.value
+DIVIDE = OpCode.DIVIDE.value
+NOT = OpCode.NOT.value
+NEGATE = OpCode.NEGATE.value
+JUMP = OpCode.JUMP.value
+JUMP_IF_FALSE = OpCode.JUMP_IF_FALSE.value
+JUMP_IF_TRUE = OpCode.JUMP_IF_TRUE.value
+POP_JUMP_IF_FALSE = OpCode.POP_JUMP_IF_FALSE.value
+CALL = OpCode.CALL.value
+RETURN = OpCode.RETURN.value
+PRINT = OpCode.PRINT.value
+
+MAX_FRAMES = 1 << 16
+
+
+# Stack-based virtual machine for programs lowered by Compiler. It is a drop-in
+# alternative to Interpreter: same constructor, same interpret() entry point,
+# same values, output and RuntimeExceptions.
+class VM:
+  stringify = Interpreter.stringify
+
+  def __init__(self, error_callback: Callable[[RuntimeException], None]):
+    self.error_callback = error_callback
+    self.globals: dict[str, object] = {}
+    install(self.globals.__setitem__)
+    self.stack: list[object] = []
+    self.output: TextIO | None = None
+
+
+  def interpret(self, statements: list[Stmt]):
+    try:
+      self.run(Compiler().compile(statements))
+    except RuntimeException as e:
+      self.stack.clear()
+      self.error_callback(e)
+
+
+  def run(self, script: VMFunction) -> None:
+    stack = self.stack
+    push = stack.append
+    pop = stack.pop
+    globals = self.globals
+    frames = []
+
+    chunk = script.chunk
+    code, args, constants = chunk.code, chunk.args, chunk.constants
+    base = len(stack)
+    ip = 0
+
+    while True:
+      op = code[ip]
+      arg = args[ip]
+      ip += 1
+
+      if op == GET_LOCAL:
+        push(stack[base + arg])
+
+      elif op == CONSTANT:
+        push(constants[arg])
+
+      elif op == GET_GLOBAL:
+        try:
+          push(globals[constants[arg]])
+        except KeyError:
+          token = chunk.tokens[ip - 1]
+          raise RuntimeException(token, f"Undefined variable '{token.lexeme}'.")
+
+      elif op == SET_LOCAL:
+        stack[base + arg] = stack[-1]
+
+      elif op == POP:
+        pop()
+
+      elif op == POP_JUMP_IF_FALSE:
+        value = pop()
+        if value is None or value is False:
+          ip = arg
+
+      elif op == JUMP:
+        ip = arg
+
+      elif op == ADD:
+        left = pop()
+        right = stack[-1]
+        if isinstance(left, float) and isinstance(right, float):
+          stack[-1] = left + right
+        elif isinstance(left, str) and isinstance(right, str):
+          stack[-1] = left + right
+        else:
+          raise RuntimeException(chunk.tokens[ip - 1], "Operand must be two numbers or two strings.")
+
+      elif op == LESS:
+        left = pop()
+        right = stack[-1]
+        if not (isinstance(left, float) and isinstance(right, float)):
+          raise RuntimeException(chunk.tokens[ip - 1], "Operand must be a number.")
+        stack[-1] = left < right
+
+      elif op == SUBTRACT:
+        left = pop()
+        right = stack[-1]
+        if not (isinstance(left, float) and isinstance(right, float)):
+          raise RuntimeException(chunk.tokens[ip - 1], "Operand must be a number.")
+        stack[-1] = left - right
+
+      elif op == MULTIPLY:
+        left = pop()
+        right = stack[-1]
+        if not (isinstance(left, float) and isinstance(right, float)):
+          raise RuntimeException(chunk.tokens[ip - 1], "Operand must be a number.")
+        stack[-1] = left * right
+
+      elif op == CALL:
+        callee = stack[-1 - arg]
+
+        if type(callee) is VMFunction:
+          if arg != callee.arity:
+            raise RuntimeException(chunk.tokens[ip - 1], f'Expected {callee.arity} arguments but got {arg}.')
+          if len(frames) == MAX_FRAMES:
+            raise RuntimeException(chunk.tokens[ip - 1], 'Stack overflow.')
+          frames.append((chunk, ip, base))
+          chunk = callee.chunk
+          code, args, constants = chunk.code, chunk.args, chunk.constants
+          base = len(stack) - arg
+          ip = 0
+
+        elif type(callee) is NativeFunction:
+          if arg != callee.param_count:
+            raise RuntimeException(chunk.tokens[ip - 1], f'Expected {callee.param_count} arguments but got {arg}.')
+          arguments = stack[len(stack) - arg:]
+          del stack[len(stack) - 1 - arg:]
+          try:
+            push(callee.function(*arguments))
+          except NativeError as e:
+            raise RuntimeException(chunk.tokens[ip - 1], str(e))
+
+        elif isinstance(callee, LoxCallable):
+          if arg != callee.arity():
+            raise RuntimeException(chunk.tokens[ip - 1], f'Expected {callee.arity()} arguments but got {arg}.')
+          arguments = stack[len(stack) - arg:]
+          del stack[len(stack) - 1 - arg:]
+          push(callee.call(self, arguments))
+
+        else:
+          raise RuntimeException(chunk.tokens[ip - 1], 'Can only call functions and classes.')
+
+      elif op == RETURN:
+        result = pop()
+        if not frames:
+          del stack[base:]
+          return
+        del stack[base - 1:]
+        push(result)
+        chunk, ip, base = frames.pop()
+        code, args, constants = chunk.code, chunk.args, chunk.constants
+
+      elif op == NIL:
+        push(None)
+
+      elif op == TRUE:
+        push(True)
+
+      elif op == FALSE:
+        push(False)
+
+      elif op == POPN:
+        del stack[len(stack) - arg:]
+
+      elif op == SET_GLOBAL:
+        name = constants[arg]
+        if name not in globals:
+          token = chunk.tokens[ip - 1]
+          raise RuntimeException(token, f"Undefined variable '{token.lexeme}'.")
+        globals[name] = stack[-1]
+
+      elif op == DEFINE_GLOBAL:
+        globals[constants[arg]] = pop()
+
+      elif op == EQUAL:
+        left = pop()
+        stack[-1] = left == stack[-1]
+
+      elif op == NOT_EQUAL:
+        left = pop()
+        stack[-1] = left != stack[-1]
+
+      elif op == GREATER:
+        left = pop()
+        right = stack[-1]
+        if not (isinstance(left, float) and isinstance(right, float)):
+          raise RuntimeException(chunk.tokens[ip - 1], "Operand must be a number.")
+        stack[-1] = left > right
+
+      elif op == GREATER_EQUAL:
+        left = pop()
+        right = stack[-1]
+        if not (isinstance(left, float) and isinstance(right, float)):
+          raise RuntimeException(chunk.tokens[ip - 1], "Operand must be a number.")
+        stack[-1] = left >= right
+
+      elif op == LESS_EQUAL:
+        left = pop()
+        right = stack[-1]
+        if not (isinstance(left, float) and isinstance(right, float)):
+          raise RuntimeException(chunk.tokens[ip - 1], "Operand must be a number.")
+        stack[-1] = left <= right
+
+      elif op == DIVIDE:
+        left = pop()
+        right = stack[-1]
+        if not (isinstance(left, float) and isinstance(right, float)):
+          raise RuntimeException(chunk.tokens[ip - 1], "Operand must be a number.")
+        stack[-1] = left / right
+
+      elif op == NOT:
+        value = stack[-1]
+        stack[-1] = value is None or value is False
+
+      elif op == NEGATE:
+        value = stack[-1]
+        if not isinstance(value, float):
+          raise RuntimeException(chunk.tokens[ip - 1], "Operand must be a number.")
+        stack[-1] = -value
+
+      elif op == JUMP_IF_FALSE:
+        value = stack[-1]
+        if value is None or value is False:
+          ip = arg
+
+      elif op == JUMP_IF_TRUE:
+        value = stack[-1]
+        if value is not None and value is not False:
+          ip = arg
+
+      elif op == PRINT:
+        print(self.stringify(pop()), file=self.output)
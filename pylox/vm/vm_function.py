@@ -0,0 +1,11 @@
+from pylox.vm.chunk import Chunk
+
+
+class VMFunction:
+  def __init__(self, name: str, arity: int, chunk: Chunk):
+    self.name = name
+    self.arity = arity
+    self.chunk = chunk
+
+  def __repr__(self):
+    return f'<fn {self.name}>'
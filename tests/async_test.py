@@ -0,0 +1,116 @@
+import asyncio
+import io
+
+import pytest
+
+from pylox.async_runtime import AsyncLoxRuntime
+from pylox.natives.registry import NativeError
+from pylox.runtime import LoxRuntime
+
+
+# Fake I/O: each fetch records when it started and finished, so tests can see
+# whether scripts overlapped on the loop.
+class FakeService:
+  def __init__(self):
+    self.events: list[str] = []
+
+  def natives(self, name):
+    async def fetch(key):
+      key = int(key)
+      self.events.append(f'{name} start {key}')
+      await asyncio.sleep(0.01)
+      self.events.append(f'{name} end {key}')
+      return f'{name}:{key}'
+
+    async def fail(message):
+      await asyncio.sleep(0)
+      raise NativeError(message)
+
+    def add(a, b):
+      return a + b
+    return {'fetch': fetch, 'fail': fail, 'add': add}
+
+
+def runtime(service, name):
+  return AsyncLoxRuntime(natives=service.natives(name), output=io.StringIO())
+
+
+def test_scripts_interleave_on_one_loop():
+  service = FakeService()
+  source = 'for (var i = 0; i < 3; i = i + 1) print fetch(i);'
+  runtimes = [runtime(service, 'a'), runtime(service, 'b')]
+
+  async def main():
+    return await asyncio.gather(*(r.run_async(source) for r in runtimes))
+
+  assert asyncio.run(main()) == [0, 0]
+  assert runtimes[0].output.getvalue() == 'a:0\na:1\na:2\n'
+  assert runtimes[1].output.getvalue() == 'b:0\nb:1\nb:2\n'
+  # Both scripts were waiting on a fetch before either one's first ended.
+  first_end = min(service.events.index('a end 0'), service.events.index('b end 0'))
+  assert {'a start 0', 'b start 0'} <= set(service.events[:first_end])
+
+
+def test_native_errors_and_arity():
+  service = FakeService()
+  r = runtime(service, 'a')
+  assert asyncio.run(r.run_async('print add(1, 2);\nfail("boom");')) == 70
+  assert r.output.getvalue() == '3\nError: boom\n[line 2]\n'
+
+  r = runtime(service, 'a')
+  assert asyncio.run(r.run_async('fetch();')) == 70
+  assert r.errors[0].message == 'Expected 1 arguments but got 0.'
+
+
+def test_compile_errors_return_65():
+  r = runtime(FakeService(), 'a')
+  assert asyncio.run(r.run_async('print (;')) == 65
+
+
+@pytest.mark.parametrize('backend', LoxRuntime.backends)
+def test_coroutine_natives_run_to_completion_elsewhere(backend):
+  r = LoxRuntime(backend=backend, output=io.StringIO())
+  r.run('print sleep(0);')
+  assert r.output.getvalue() == 'nil\n'
+  r = AsyncLoxRuntime(output=io.StringIO())
+  assert asyncio.run(r.run_async('print sleep(0);')) == 0
+  assert r.output.getvalue() == 'nil\n'
+
+
+def test_cancelling_the_task_stops_the_script():
+  service = FakeService()
+  r = runtime(service, 'a')
+
+  async def main():
+    task = asyncio.create_task(r.run_async('var i = 0;\nwhile (true) { fetch(i); i = i + 1; }'))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+      await task
+    for _ in range(100):
+      if r.errors: break
+      await asyncio.sleep(0.01)
+  asyncio.run(main())
+  assert [(e.kind, e.line, e.message) for e in r.errors] == [('runtime', 2, 'Script cancelled.')]
+  started = len(service.events)
+  asyncio.run(asyncio.sleep(0.05))
+  assert len(service.events) == started
+
+
+@pytest.mark.parametrize('backend', LoxRuntime.backends)
+def test_coroutine_natives_inside_a_running_loop_need_the_async_runtime(backend, recwarn):
+  r = LoxRuntime(backend=backend, output=io.StringIO())
+
+  async def main():
+    r.run('print "before";\nsleep(0);')
+  asyncio.run(main())
+  assert r.exit_code() == 70
+  assert r.output.getvalue().startswith('before\n')
+  assert [(e.kind, e.line) for e in r.errors] == [('runtime', 2)]
+  assert 'AsyncLoxRuntime' in r.errors[0].message
+  assert not [w for w in recwarn if 'never awaited' in str(w.message)]
+
+
+def test_tree_backend_only():
+  with pytest.raises(ValueError):
+    AsyncLoxRuntime(backend='vm')
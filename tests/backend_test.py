@@ -0,0 +1,213 @@
+import contextlib
+import io
+
+import pytest
+
+from pylox.interpreter.closure_interpreter import ClosureInterpreter
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.resolver import Resolver
+from pylox.parser.parser import Parser
+from pylox.scanner.scanner import Scanner
+from pylox.transpiler.python_backend import PythonBackend
+from pylox.transpiler.transpiler import Transpiler
+from pylox.vm.vm import VM
+
+
+BACKENDS = [VM, ClosureInterpreter, PythonBackend]
+
+PROGRAMS = {
+  'arithmetic': 'print 1 + 2 * 3 - 4 / 8; print -(2 + 3); print 10 - 2 - 3; print 7 / 2;',
+  'strings': 'var s = "foo" + "bar"; print s; print s == "foobar"; print "a" != "b";',
+  'truthiness': 'print !nil; print !0; print !""; print true and nil or "x"; print nil or false; print 1 and 2;',
+  'equality': 'print nil == nil; print nil == false; print 1 == 1; print "1" == 1; print true == 1;',
+  'scopes': '''
+    var a = "global";
+    {
+      var a = a + " shadowed";
+      print a;
+      var a = "redeclared";
+      print a;
+      { print a; var b = a + "!"; print b; }
+    }
+    print a;
+  ''',
+  'late_declaration': '''
+    var a = "global";
+    { print a; var a = "local"; print a; }
+    var i = 0;
+    while (i < 2) { print a; var a = i; print a; i = i + 1; }
+  ''',
+  'deep_nesting': '''
+    var total = 0;
+    { var x = 1; { var y = 2; { var z = 3; { { total = x + y + z; x = 10; } } } print x; } }
+    print total;
+  ''',
+  'parameters_redeclared': 'fun f(a, b) { var a = a + b; print a; var c = 3; print c + b; } f(1, 2);',
+  'loops': '''
+    var i = 0;
+    while (i < 3) { print i; i = i + 1; }
+    for (var j = 0; j < 3; j = j + 1) { var k = j * 2; print k; }
+    var n = 0;
+    for (; n < 2;) n = n + 1;
+    print n;
+  ''',
+  'functions': '''
+    fun add(x, y) { print x + y; }
+    add(1, 2);
+    add("a", "b");
+    fun twice(a, a) { print a; }
+    twice(1, 2);
+    print add;
+    print clock;
+    print clock() > 0;
+    { fun inner() { print "inner"; } inner(); }
+    var g = "visible";
+    fun outer() { fun nested(q) { print q; } nested(g); }
+    outer();
+  ''',
+  'functions_do_not_see_blocks': '{ var hidden = 1; fun peek() { print hidden; } peek(); }',
+  'recursion': '''
+    var calls = 0;
+    fun countdown(n) { calls = calls + 1; if (n > 0) countdown(n - 1); }
+    countdown(20);
+    print calls;
+  ''',
+  'returns': '''
+    fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+    print fib(15);
+    fun first(limit) {
+      var i = 0;
+      while (true) { { var j = i * i; if (j > limit) return i; } i = i + 1; }
+    }
+    print first(50);
+    fun bare() { print "before"; return; print "after"; }
+    print bare();
+    fun none() {}
+    print none();
+    fun pick(flag) { if (flag) { return "yes"; } else { return "no"; } }
+    print pick(true) + pick(nil);
+    fun get() { return fib; }
+    print get()(10);
+    fun loop() { for (var i = 0; i < 10; i = i + 1) if (i == 3) return i; return -1; }
+    print loop();
+  ''',
+  'return_error_unwinds': 'fun f() { return 1 + nil; }\nprint "a";\nprint f();',
+  'undefined_variable': 'print 1; print missing;',
+  'undefined_assignment': 'missing = 1;',
+  'undefined_in_function': 'fun f() {\n  var a = 1;\n  print a + missing;\n}\nf();',
+  'undefined_operands_order': 'print left + right;',
+  'bad_operands': 'print 1;\nprint 1 + "a";',
+  'bad_comparison': 'print "a" < "b";',
+  'bad_negation': 'print -"a";',
+  'wrong_arity': 'fun f(a) {}\nf(1, 2);',
+  'native_arity': 'clock(1);',
+  'natives': '''
+    print sqrt(16) + floor(2.5) + ceil(2.5) + abs(-1);
+    print min(3, 4) + max(3, 4) + pow(2, 10);
+    print len("hello") + find("hello", "ll");
+    print upper("ab") + lower("CD") + substring("hello", 1, 3);
+    fun hyp(a, b) { return sqrt(a * a + b * b); }
+    print hyp(3, 4);
+    print sqrt;
+  ''',
+  'native_error': 'print 1;\nprint sqrt("x");',
+  'native_wrong_arity': 'print min(1);',
+  'not_callable': 'var x = "str";\nx();',
+  'evaluation_order': '''
+    var log = "";
+    fun mark(s) { log = log + s; }
+    var r = (mark("L") == nil) == (mark("R") == nil);
+    print log;
+  ''',
+  'for_loops': '''
+    var i = "outer";
+    for (var i = 0; i < 3; i = i + 1) { var sq = i * i; print sq; }
+    print i;
+    var j = 0;
+    for (j = 10; j > 7; j = j - 1) print j;
+    for (; j < 9;) j = j + 1;
+    print j;
+    fun first(limit) {
+      for (var k = 0; ; k = k + 1) {
+        for (var m = 0; m < k; m = m + 1) if (k * m >= limit) return k + m / 10;
+      }
+    }
+    print first(20);
+    for (var n = 0; n < 2; n = n + 1) { for (var n = 5; n < 7; n = n + 1) print n; }
+  ''',
+  'scopeless_blocks': '''
+    var a = "global";
+    {
+      var a = "outer";
+      { { print a; a = "changed"; } }
+      if (true) { var a = "inner"; { print a; } }
+      print a;
+    }
+    fun f(n) { if (n > 0) { { return n; } } else { return -n; } }
+    print f(2) + f(-3);
+    while (a == "global") { a = "done"; }
+    print a;
+  ''',
+  'string_building': '''
+    var s = "";
+    var t = "";
+    for (var i = 0; i < 300; i = i + 1) {
+      s = s + "ab";
+      if (i == 150) t = s;
+    }
+    var u = t + "!";
+    print s == t;
+    print t + "" == t;
+    print len(s);
+    print u;
+    print s + s == s + s;
+    print "<" + s;
+  ''',
+}
+
+
+def parse(source):
+  statements = Parser(Scanner(source, print).scan_tokens(), print).parse()
+  Resolver(print).resolve(statements)
+  return statements
+
+
+def run(backend, source):
+  errors = []
+  statements = parse(source)
+  out = io.StringIO()
+  with contextlib.redirect_stdout(out):
+    backend(lambda e: errors.append((str(e), e.token.line))).interpret(statements)
+  return out.getvalue(), errors
+
+
+@pytest.mark.parametrize('backend', BACKENDS, ids=lambda b: b.__name__)
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_backend_matches_interpreter(backend, name):
+  assert run(backend, PROGRAMS[name]) == run(Interpreter, PROGRAMS[name])
+
+
+@pytest.mark.parametrize('backend', BACKENDS, ids=lambda b: b.__name__)
+def test_backend_keeps_globals_between_runs(backend):
+  errors = []
+  runner = backend(errors.append)
+  out = io.StringIO()
+  with contextlib.redirect_stdout(out):
+    runner.interpret(parse('var a = 1; { var b = 2; }'))
+    runner.interpret(parse('print missing;'))
+    runner.interpret(parse('print a;'))
+  assert out.getvalue() == '1\n'
+  assert len(errors) == 1
+
+
+def test_emit_python_is_valid_python():
+  source = Transpiler([]).source(parse(PROGRAMS['functions']))
+  assert 'def g_add(' in source
+  compile(source, '<test>', 'exec')
+
+
+def test_return_outside_a_function_is_an_error():
+  errors = []
+  statements = Parser(Scanner('fun f() { return 1; }\nreturn 2;', print).scan_tokens(), print).parse()
+  Resolver(lambda token, message: errors.append((token.line, message))).resolve(statements)
+  assert errors == [(2, "Can't return from top-level code.")]
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from pylox.batch import collect_scripts, run_many
+
+
+@pytest.fixture
+def scripts(tmp_path):
+  (tmp_path / 'nested').mkdir()
+  (tmp_path / 'ok.lox').write_text('var a = 1; print a + 1;')
+  (tmp_path / 'nested' / 'runtime.lox').write_text('print "a";\nprint -nil;')
+  (tmp_path / 'nested' / 'syntax.lox').write_text('print (;')
+  (tmp_path / 'notes.txt').write_text('not a script')
+  return tmp_path
+
+
+def test_collect_scripts(scripts):
+  names = [path.removeprefix(str(scripts)) for path in collect_scripts([str(scripts)])]
+  assert names == ['/nested/runtime.lox', '/nested/syntax.lox', '/ok.lox']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_many(scripts, workers, capsys):
+  summary = scripts / 'summary.json'
+  assert run_many([str(scripts), '--workers', str(workers), '--summary', str(summary)]) == 70
+
+  results = {r['script'].removeprefix(str(scripts)): r for r in json.loads(summary.read_text())['results']}
+  assert results['/ok.lox']['stdout'] == '2\n'
+  assert results['/ok.lox']['exit_code'] == 0
+  assert results['/nested/runtime.lox']['stdout'] == 'a\nError: Operand must be a number.\n[line 2]\n'
+  assert results['/nested/runtime.lox']['exit_code'] == 70
+  assert results['/nested/syntax.lox']['exit_code'] == 65
+  assert '3 scripts, 2 failed' in capsys.readouterr().out
+
+
+def test_options_apply_to_every_script(scripts, capsys):
+  assert run_many([str(scripts / 'ok.lox'), '--workers', '1', '--backend', 'vm', '--show-output']) == 0
+  assert '2\n' in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from pylox.scanner.fast_scanner import FastScanner
+from pylox.scanner.scanner import Scanner
+
+
+SOURCES = [
+  "",
+  "print 1;",
+  "var x = 21 * (12 + (9 / 3));\nprint x;",
+  "!= == <= >= ! = < > ( ) { } , . - + ; / *",
+  "// only a comment",
+  "// comment\nprint a; // trailing\n",
+  "123 123.5 123. .5 1.2.3 007",
+  "orchid or other order fortune for nil nile _under score_9",
+  '"multi\nline\nstring" after',
+  '"unterminated\nstring',
+  "@ # $ ^ var ok = 1;",
+  "café ² ٣",
+  "\t\r\n  \n\tprint 2;\r\n",
+  "fun helloWorld(phrase) {\n  print phrase;\n}\n\nhelloWorld(\"hello\");\n",
+]
+
+ALPHABET = list('abcfinorstuvw_019 .=!<>(){};,+-*/"\n\t@') + ['//', 'or', 'var', 'while', 'é']
+
+
+def scan(engine, source):
+  errors = []
+  tokens = engine(source, lambda line, message: errors.append((line, message))).scan_tokens()
+  return [(t.token_type, t.lexeme, t.literal, t.line) for t in tokens], errors
+
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_fast_scanner_matches_scanner(source):
+  assert scan(FastScanner, source) == scan(Scanner, source)
+
+
+def test_fast_scanner_matches_scanner_on_random_sources():
+  rng = random.Random(1234)
+  for _ in range(500):
+    source = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 80)))
+    assert scan(FastScanner, source) == scan(Scanner, source), source
+
+
+def test_or_prefixed_identifiers_are_identifiers():
+  tokens, _ = scan(Scanner, "orchid on or")
+  assert [t[1] for t in tokens] == ["orchid", "on", "or", ""]
+
+
+def stream(engine, source):
+  errors = []
+  tokens = engine(source, lambda line, message: errors.append((line, message))).iter_tokens()
+  return [(t.token_type, t.lexeme, t.literal, t.line) for t in tokens], errors
+
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_iter_tokens_matches_scan_tokens(source):
+  assert stream(Scanner, source) == scan(Scanner, source)
+  assert stream(FastScanner, source) == scan(Scanner, source)
+
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_fast_scanner_accepts_utf8_bytes(source):
+  assert stream(FastScanner, source.encode()) == scan(Scanner, source)
+
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_token_buffer_materializes_same_tokens(source):
+  errors = []
+  buffer = FastScanner(source, lambda line, message: errors.append((line, message))).scan_buffer()
+  tokens = [(t.token_type, t.lexeme, t.literal, t.line) for t in buffer]
+  assert (tokens, errors) == scan(Scanner, source)
+  assert len(buffer) == len(tokens)
@@ -0,0 +1,59 @@
+import contextlib
+import io
+
+from backend_test import parse
+from pylox.interpreter.environment import Environment
+from pylox.interpreter.interpreter import Interpreter
+
+
+def run(interpreter, statements):
+  out = io.StringIO()
+  with contextlib.redirect_stdout(out):
+    interpreter.interpret(statements)
+  return out.getvalue()
+
+
+def test_redefinition_and_assignment_invalidate_cached_globals():
+  source = '''
+    fun f() { print "one"; }
+    fun g() { f(); }
+    g(); g();
+    fun f() { print "two"; }
+    g();
+    var x = 1;
+    fun h() { print x; }
+    h(); x = 2; h();
+  '''
+  assert run(Interpreter(print), parse(source)) == 'one\none\ntwo\n1\n2\n'
+
+
+def test_cache_hit_skips_the_global_table():
+  statements = parse('var a = 1; fun f() { print a; } f();')
+  interpreter = Interpreter(print)
+  run(interpreter, statements)
+  read = statements[1].body[0].expression
+  assert read.cache_version == interpreter.Globals.version
+  # A hit returns the cached value without consulting Globals.values.
+  interpreter.Globals.values['a'] = 'stale'
+  assert run(interpreter, statements[2:]) == '1\n'
+
+
+def test_cache_is_not_shared_between_interpreters():
+  statements = parse('print clock == clock;')
+  first, second = Interpreter(print), Interpreter(print)
+  assert run(first, statements) == 'True\n'
+  read = statements[0].expression.left
+  assert read.cache_value is first.Globals.values['clock']
+  run(second, statements)
+  assert read.cache_value is second.Globals.values['clock']
+
+
+def test_only_the_globals_take_versions():
+  interpreter = Interpreter(print)
+  version = interpreter.Globals.version
+  run(interpreter, parse('{ var a = 1; { var b = a; } } fun f(n) { return n; } f(1);'))
+  assert interpreter.Globals.version > version
+  stamped = next(Environment.versions)
+  run(interpreter, parse('{ var a = 1; { var b = a; } } f(2);'))
+  # Blocks and calls allocate environments without drawing a version.
+  assert next(Environment.versions) == stamped + 1
@@ -0,0 +1,87 @@
+import contextlib
+import io
+
+from backend_test import parse
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.memoized_function import memo_key
+from pylox.interpreter.purity import find_pure_functions
+from pylox.runtime import LoxRuntime
+
+
+def pure_names(source):
+  return sorted(f.name.lexeme for f in find_pure_functions(parse(source)))
+
+
+def run(source, memo_size):
+  statements = parse(source)
+  find_pure_functions(statements)
+  interpreter = Interpreter(print)
+  interpreter.memo_size = memo_size
+  out = io.StringIO()
+  with contextlib.redirect_stdout(out):
+    interpreter.interpret(statements)
+  return out.getvalue(), interpreter
+
+
+def test_purity_analysis():
+  source = '''
+    var g = 1;
+    fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+    fun local(n) { var a = n; { a = a * 2; } return a; }
+    fun calls_pure(n) { return fib(n) + local(n); }
+    fun prints(n) { print n; }
+    fun writes(n) { g = n; }
+    fun reads(n) { return n + g; }
+    fun timed() { return clock(); }
+    fun calls_impure(n) { return prints(n); }
+    fun calls_argument(f) { return f(); }
+    fun rebound() { return 1; }
+    rebound = nil;
+  '''
+  assert pure_names(source) == ['calls_pure', 'fib', 'local']
+
+
+def test_memoized_results_match_and_are_counted():
+  source = 'fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); } print fib(20); print fib(20);'
+  plain, _ = run(source, 0)
+  memo, interpreter = run(source, 8)
+  assert memo == plain == '6765\n6765\n'
+  [fib] = interpreter.memoized
+  assert (fib.hits, fib.misses) == (19, 21)
+  assert len(fib.cache) == 8
+
+
+def test_lru_evicts_least_recently_used():
+  _, interpreter = run('fun id(x) { return x; } id(1); id(2); id(1); id(3); id(2);', 2)
+  [function] = interpreter.memoized
+  assert list(function.cache) == [(3.0,), (2.0,)]
+  assert (function.hits, function.misses) == (1, 4)
+
+
+def test_keys_keep_lox_values_apart():
+  assert memo_key([1.0]) != memo_key([True])
+  assert memo_key([0.0]) != memo_key([-0.0])
+  assert memo_key([None, 'a']) == memo_key([None, 'a'])
+  assert memo_key([print]) is None
+
+
+REBOUND = '''
+  fun f(n) { if (n < 1) return 0; return f(n - 1) + 1; }
+  print f(3);
+  var old = f;
+  fun f(n) { return 100; }
+  print old(3);
+'''
+
+
+def test_rebinding_in_a_later_statement_drops_the_memo():
+  runtime = LoxRuntime(memo_size=8, streaming=True, output=io.StringIO())
+  runtime.run_stream(REBOUND)
+  assert runtime.output.getvalue() == '3\n101\n'
+
+
+def test_rebinding_a_pure_native_on_a_later_line_is_seen():
+  runtime = LoxRuntime(memo_size=8, output=io.StringIO())
+  for line in ['var sqrt = clock;', 'fun root(n) { return sqrt(n); }']:
+    runtime.run(line)
+  assert not runtime.interpreter.memoized
@@ -0,0 +1,96 @@
+import math
+
+import pytest
+
+from backend_test import parse
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.purity import find_pure_functions
+from pylox.natives.registry import MODULES, NativeError, NativeFunction, install, native, pure_natives
+
+
+def evaluate(source):
+  errors = []
+  interpreter = Interpreter(lambda e: errors.append(str(e)))
+  interpreter.interpret(parse(f'var result = {source};'))
+  return interpreter.Globals.values.get('result'), errors
+
+
+def test_modules_are_registered():
+  assert {'math', 'string', 'time'} <= MODULES.keys()
+  assert MODULES['math']['sqrt'].param_count == 1
+  assert MODULES['string']['substring'].param_count == 3
+  assert 'clock' not in pure_natives()
+  assert {'sqrt', 'len', 'max'} <= pure_natives()
+
+
+def test_install_selected_modules():
+  defined = {}
+  install(defined.__setitem__, ['string'])
+  assert set(defined) == set(MODULES['string'])
+  assert all(type(f) is NativeFunction for f in defined.values())
+
+
+def test_names_are_unique_across_modules():
+  with pytest.raises(ValueError):
+    native('other', 'sqrt')(lambda x: x)
+
+
+@pytest.mark.parametrize('source, value', [
+  ('sqrt(2) * sqrt(2) > 1.99', True),
+  ('floor(-1.5)', -2.0),
+  ('pow(2, 0.5) == sqrt(2)', True),
+  ('len("")', 0.0),
+  ('find("abc", "z")', -1.0),
+  ('substring("abc", 0, 3)', 'abc'),
+])
+def test_native_results(source, value):
+  assert evaluate(source) == (value, [])
+
+
+@pytest.mark.parametrize('source, value', [
+  ('floor(exp(1000))', math.inf),
+  ('ceil(-exp(1000))', -math.inf),
+  ('floor(exp(1000) - exp(1000))', 'nan'),
+  ('ceil(exp(1000) - exp(1000))', 'nan'),
+  ('sin(exp(1000))', 'nan'),
+  ('cos(-exp(1000))', 'nan'),
+  ('sin(exp(1000) - exp(1000))', 'nan'),
+])
+def test_non_finite_arguments(source, value):
+  result, errors = evaluate(source)
+  assert errors == []
+  if value == 'nan':
+    assert math.isnan(result)
+  else:
+    assert result == value
+
+
+@pytest.mark.parametrize('source, message', [
+  ('sqrt(-1)', 'Operand must be a non-negative number.'),
+  ('len(1)', 'Operand must be a string.'),
+  ('substring("abc", 2, 1)', 'Substring bounds out of range.'),
+  ('max(1, 2, 3)', 'Expected 2 arguments but got 3.'),
+  ('len(sqrt("x"))', 'Operand must be a number.'),
+])
+def test_native_errors_are_runtime_errors(source, message):
+  assert evaluate(source) == (None, [message])
+
+
+def test_native_errors_stay_native():
+  with pytest.raises(NativeError):
+    MODULES['math']['sqrt'].function('x')
+
+
+def pure_names(source):
+  return sorted(f.name.lexeme for f in find_pure_functions(parse(source), pure_natives()))
+
+
+def test_pure_natives_keep_callers_pure():
+  assert pure_names('''
+    fun norm(a, b) { return sqrt(a * a + b * b); }
+    fun timed() { return clock(); }
+  ''') == ['norm']
+
+
+def test_rebound_natives_are_not_pure():
+  assert pure_names('var sqrt = nil; fun f(x) { return sqrt(x); }') == []
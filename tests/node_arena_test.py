@@ -0,0 +1,48 @@
+import contextlib
+import io
+
+import pytest
+
+from backend_test import PROGRAMS
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.resolver import Resolver
+from pylox.parser.expr import Expr
+from pylox.parser.node_arena import NodeArena
+from pylox.parser.parse_cache import SCHEMA, encode_node
+from pylox.parser.parser import Parser
+from pylox.scanner.scanner import Scanner
+
+
+def parse(source):
+  return Parser(Scanner(source, print).scan_tokens(), print).parse()
+
+
+def test_nodes_have_slots():
+  for cls, _ in SCHEMA:
+    assert '__dict__' not in dir(cls)
+  with pytest.raises(AttributeError):
+    Expr.Literal(1).extra = 2
+
+
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_arena_round_trip(name):
+  statements = parse(PROGRAMS[name])
+  rebuilt = NodeArena.from_statements(statements).statements()
+  assert [encode_node(s) for s in rebuilt] == [encode_node(s) for s in statements]
+
+
+def test_arena_shares_constants_and_lexemes():
+  arena = NodeArena.from_statements(parse('var a = 1; a = a + 1; print true; print 1 == true; print -0; print 0;'))
+  assert arena.constants == [1.0, True, 0.0]
+  assert arena.strings.count('a') == 1
+  assert arena.nbytes > 0 and len(arena) > 0
+
+
+def test_rebuilt_program_runs():
+  arena = NodeArena.from_statements(parse(PROGRAMS['returns']))
+  statements = arena.statements()
+  Resolver(print).resolve(statements)
+  out = io.StringIO()
+  with contextlib.redirect_stdout(out):
+    Interpreter(print).interpret(statements)
+  assert out.getvalue().splitlines()[0] == '610'
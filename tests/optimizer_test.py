@@ -0,0 +1,70 @@
+import contextlib
+import io
+
+import pytest
+
+from backend_test import PROGRAMS
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.optimizer import Optimizer
+from pylox.interpreter.resolver import Resolver
+from pylox.parser.expr import Expr
+from pylox.parser.parser import Parser
+from pylox.parser.stmt import Stmt
+from pylox.scanner.scanner import Scanner
+
+
+def parse(source):
+  return Parser(Scanner(source, print).scan_tokens(), print).parse()
+
+
+def run(statements):
+  Resolver(print).resolve(statements)
+  errors = []
+  out = io.StringIO()
+  with contextlib.redirect_stdout(out):
+    Interpreter(lambda e: errors.append((str(e), e.token.line))).interpret(statements)
+  return out.getvalue(), errors
+
+
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_optimized_program_behaves_the_same(name):
+  source = PROGRAMS[name]
+  assert run(Optimizer(1).optimize(parse(source))) == run(parse(source))
+
+
+def test_level_zero_leaves_the_tree_alone():
+  statements = parse('print 1 + 2;')
+  assert Optimizer(0).optimize(statements) is statements
+
+
+def test_folds_constant_expressions():
+  [stmt] = Optimizer().optimize(parse('print -(1 + 2 * 3) == -7 and !nil;'))
+  assert isinstance(stmt.expression, Expr.Literal)
+  assert stmt.expression.value is True
+
+
+def test_keeps_expressions_that_fail_at_run_time():
+  statements = Optimizer().optimize(parse('print 1;\nprint "a" + 1;\nprint -"b";'))
+  assert isinstance(statements[1].expression, Expr.Binary)
+  assert run(statements) == ('1\n', [('Operand must be two numbers or two strings.', 2)])
+
+
+def test_drops_dead_branches():
+  statements = Optimizer().optimize(parse('if (1 > 2) print "no"; else print "yes"; while (nil) print "never"; if (false) print "no";'))
+  assert len(statements) == 1
+  assert isinstance(statements[0], Stmt.Print)
+
+
+def test_propagates_unassigned_local_literals():
+  [block] = Optimizer().optimize(parse('{ var a = 2; var b = 3; print a * 10; b = 4; print b; }'))
+  assert block.statements[2].expression.value == 20
+  assert isinstance(block.statements[4].expression, Expr.Variable)
+
+
+def test_optimizes_for_loops():
+  [loop] = Optimizer().optimize(parse('for (var i = 0; i < 1 + 2; i = i + 1) { print i; }'))
+  assert isinstance(loop, Stmt.For)
+  assert isinstance(loop.condition.right, Expr.Literal) and loop.condition.right.value == 3
+  assert [type(s) for s in loop.body.statements] == [Stmt.Print]
+  [block] = Optimizer().optimize(parse('for (var i = 0; false; i = i + 1) print i;'))
+  assert [type(s) for s in block.statements] == [Stmt.Var]
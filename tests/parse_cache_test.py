@@ -0,0 +1,52 @@
+from pylox.parser.parse_cache import CACHE_DIR, ParseCache, decode_statements, encode_statements
+from pylox.parser.parser import Parser
+from pylox.scanner.scanner import Scanner
+
+
+SOURCE = '''
+var a = 1;
+var b;
+fun add(x, y) { print x + y; if (x) return; return x + y; }
+{
+  var c = "block";
+  a = b = -a * (2 / 3) >= 4 == !true;
+}
+if (a or nil and false) print "then"; else print "else";
+for (var i = 0; i < 3; i = i + 1) add(i, clock());
+while (false) {}
+'''
+
+
+def parse(source):
+  return Parser(Scanner(source, print).scan_tokens(), print).parse()
+
+
+def test_encoding_round_trips():
+  payload = encode_statements(parse(SOURCE))
+  assert encode_statements(decode_statements(payload)) == payload
+
+
+def test_cache_hit_miss_and_invalidation(tmp_path):
+  script = tmp_path / 'script.lox'
+  cache = ParseCache(str(script))
+
+  assert cache.load(SOURCE) is None
+  assert cache.store(SOURCE, parse(SOURCE))
+  assert (tmp_path / CACHE_DIR / 'script.loxc').exists()
+
+  cached = cache.load(SOURCE)
+  assert encode_statements(cached) == encode_statements(parse(SOURCE))
+
+  assert cache.load(SOURCE + 'print 1;') is None
+
+
+def test_corrupt_cache_is_a_miss(tmp_path):
+  cache = ParseCache(str(tmp_path / 'script.lox'))
+  cache.store(SOURCE, parse(SOURCE))
+  with open(cache.path, 'r+b') as file:
+    data = file.read()
+    file.seek(0)
+    file.write(data[:-10])
+    file.truncate()
+
+  assert cache.load(SOURCE) is None
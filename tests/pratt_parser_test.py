@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from pylox.parser.ast_printer import AstPrinter
+from pylox.parser.parser import Parser
+from pylox.parser.pratt_parser import PrattParser
+from pylox.parser.stmt import Stmt
+from pylox.scanner.scanner import Scanner
+
+
+OPERATORS = ['=', 'or', 'and', '==', '!=', '<', '<=', '>', '>=', '+', '-', '*', '/']
+
+
+def random_expression(rng: random.Random, depth: int) -> str:
+  if depth == 0 or rng.random() < 0.2:
+    return rng.choice(['a', 'b', '1', '2.5', '"s"', 'true', 'false', 'nil'])
+  kind = rng.random()
+  if kind < 0.55:
+    return f'{random_expression(rng, depth - 1)} {rng.choice(OPERATORS)} {random_expression(rng, depth - 1)}'
+  if kind < 0.7:
+    return f'{rng.choice(["-", "!"])}{random_expression(rng, depth - 1)}'
+  if kind < 0.85:
+    return f'({random_expression(rng, depth - 1)})'
+  arguments = ', '.join(random_expression(rng, depth - 1) for _ in range(rng.randrange(3)))
+  return f'{random_expression(rng, depth - 1)}({arguments})'
+
+
+def parse(parser_class, source):
+  errors = []
+  tokens = Scanner(source, lambda line, message: errors.append((line, message))).scan_tokens()
+  statements = parser_class(tokens, lambda token, message: errors.append((token.line, token.lexeme, message))).parse()
+  printer = AstPrinter()
+  printed = [printer.print(s.expression) if isinstance(s, Stmt.Expression) else repr(type(s)) for s in statements]
+  return printed, errors
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_generated_expressions_parse_identically(seed):
+  rng = random.Random(seed)
+  source = '\n'.join(f'{random_expression(rng, 5)};' for _ in range(50))
+  assert parse(PrattParser, source) == parse(Parser, source)
+
+
+@pytest.mark.parametrize('source', [
+  'a = b = c;',
+  '-a * b - c / d;',
+  '!!a == b;',
+  'f(1)(2, g(3));',
+  '-f(x);',
+  'a + b = c;',
+  '-a = 1;',
+  '(a) = 1;',
+  'a or b and c or d;',
+  '1 + ;',
+  '(1 + 2;',
+  'f(1, ;',
+  'print 1 +;\nvar x = 2;',
+  'for (var i = 0; i < 10; i = i + 1) print i * 2;',
+])
+def test_precedence_and_errors_match(source):
+  assert parse(PrattParser, source) == parse(Parser, source)
+
+
+def test_printed_tree():
+  assert parse(PrattParser, 'a = 1 + 2 * -b < c or f(d);')[0] == ['(= a (or (< (+ 1.0 (* 2.0 (- b))) c) (call f d)))']
@@ -0,0 +1,64 @@
+import contextlib
+import io
+
+from backend_test import PROGRAMS, parse, run
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.profiling_interpreter import ProfilingInterpreter
+
+
+SOURCE = '''fun fib(n) {
+  if (n < 2) return n;
+  return fib(n - 1) + fib(n - 2);
+}
+print fib(5);
+print 1;
+if (true) print 2;
+while (false) {}
+'''
+
+
+def profile(source):
+  interpreter = ProfilingInterpreter(print)
+  with contextlib.redirect_stdout(io.StringIO()):
+    interpreter.interpret(parse(source))
+  return interpreter.profiler
+
+
+def test_output_matches_interpreter():
+  for source in PROGRAMS.values():
+    assert run(ProfilingInterpreter, source) == run(Interpreter, source)
+
+
+def test_counts_lines_and_calls():
+  profiler = profile(SOURCE)
+  counts = {line: stats[0] for line, stats in profiler.lines.items()}
+  # Line 2 counts the if (15 calls) and the return it runs (8 base cases).
+  # Statements of literals alone are counted on their keyword's line.
+  assert counts == {1: 1, 2: 23, 3: 7, 5: 1, 6: 1, 7: 2, 8: 1}
+  [(declaration, (calls, total, own, active))] = profiler.functions.items()
+  assert declaration.name.lexeme == 'fib'
+  assert calls == 15 and active == 0
+  assert total == own > 0
+
+
+def test_recursion_is_timed_once():
+  profiler = profile(SOURCE)
+  assert profiler.lines[3][1] <= profiler.lines[5][1]
+  assert not any(stats[2] for stats in profiler.lines.values())
+
+
+def test_collapsed_stacks():
+  profiler = profile(SOURCE)
+  assert ('<script>', 'fib', 'fib', 'fib', 'fib', 'fib') in profiler.stacks
+  out = io.StringIO()
+  profiler.collapsed(out)
+  for line in out.getvalue().splitlines():
+    stack, weight = line.rsplit(' ', 1)
+    assert stack.startswith('<script>') and int(weight) > 0
+
+
+def test_report_lists_lines_and_functions():
+  out = io.StringIO()
+  profile(SOURCE).report(out)
+  assert 'fib:1' in out.getvalue()
+  assert out.getvalue().splitlines()[1].split()[0] == '5'
@@ -0,0 +1,72 @@
+import contextlib
+import io
+
+from backend_test import parse
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.memoized_function import memo_key
+from pylox.interpreter.optimizer import Optimizer
+from pylox.interpreter.rope import ROPE_MIN, Rope, concat
+from pylox.natives.registry import string
+
+
+def build(*pieces):
+  value = ''
+  for piece in pieces:
+    value = concat(value, piece)
+  return value
+
+
+def test_short_strings_stay_strings():
+  assert type(concat('a', 'b')) is str
+  assert type(concat('a' * ROPE_MIN, 'b')) is Rope
+
+
+def test_ropes_compare_and_hash_like_strings():
+  long = 'x' * ROPE_MIN
+  rope = build(long, 'a', 'b')
+  assert rope == long + 'ab'
+  assert long + 'ab' == rope
+  assert rope == build(long + 'a', 'b')
+  assert rope != long + 'ba'
+  assert rope != None and not rope == 1.0
+  assert hash(rope) == hash(long + 'ab')
+  assert len(rope) == ROPE_MIN + 2
+
+
+def test_ropes_sharing_pieces_stay_independent():
+  base = build('x' * ROPE_MIN, 'a')
+  first = concat(base, 'b')
+  second = concat(base, 'c')
+  third = concat(first, 'd')
+  assert str(base) == 'x' * ROPE_MIN + 'a'
+  assert str(second) == 'x' * ROPE_MIN + 'ac'
+  assert str(third) == 'x' * ROPE_MIN + 'abd'
+  assert str(concat('<', third)) == '<' + str(third)
+  assert str(concat(second, third)) == str(second) + str(third)
+
+
+def test_observers_see_plain_strings():
+  rope = build('x' * ROPE_MIN, 'y')
+  assert type(string(rope)) is str
+  assert memo_key([rope]) == memo_key([str(rope)])
+
+
+def test_folded_constants_are_strings():
+  long = 'x' * ROPE_MIN
+  statements = Optimizer(1).optimize(parse(f'print "{long}" + "y";'))
+  assert type(statements[0].expression.value) is str
+
+
+def test_interpreter_builds_ropes_transparently():
+  interpreter = Interpreter(print)
+  out = io.StringIO()
+  with contextlib.redirect_stdout(out):
+    interpreter.interpret(parse('''
+      var s = "";
+      for (var i = 0; i < 1000; i = i + 1) s = s + "ab";
+      print len(s);
+      print s == s + "";
+      print substring(s, 0, 4);
+    '''))
+  assert type(interpreter.Globals.values['s']) is Rope
+  assert out.getvalue() == '2000\nTrue\nabab\n'
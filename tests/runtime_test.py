@@ -0,0 +1,82 @@
+import io
+import threading
+
+import pytest
+
+from pylox.lox import Lox
+from pylox.runtime import LoxRuntime
+
+
+@pytest.mark.parametrize('backend', LoxRuntime.backends)
+def test_output_and_errors_stay_in_the_runtime(backend, capsys):
+  out = io.StringIO()
+  runtime = LoxRuntime(backend=backend, output=out)
+  runtime.run('print "hi";\nprint -nil;')
+  assert out.getvalue() == 'hi\nError: Operand must be a number.\n[line 2]\n'
+  assert [(e.kind, e.line, e.message) for e in runtime.errors] == [('runtime', 2, 'Operand must be a number.')]
+  assert runtime.exit_code() == 70
+  assert capsys.readouterr().out == ''
+
+
+def test_compile_errors_are_collected():
+  runtime = LoxRuntime(output=io.StringIO())
+  runtime.run('print (;\nreturn 1;')
+  assert [str(e) for e in runtime.errors] == ["[line 1] Error at ';': Expect expression."]
+  assert runtime.exit_code() == 65
+  runtime.reset_errors()
+  assert runtime.errors == [] and runtime.exit_code() == 0
+
+
+def test_globals_belong_to_one_runtime():
+  first, second = LoxRuntime(output=io.StringIO()), LoxRuntime(output=io.StringIO())
+  first.run('var shared = "first";')
+  second.run('print shared;')
+  first.run('print shared;')
+  assert first.output.getvalue() == 'first\n'
+  assert second.errors[0].message == "Undefined variable 'shared'."
+
+
+def test_runtimes_in_parallel_threads():
+  source = '''
+    fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+    var total = 0;
+    for (var i = 0; i < 30; i = i + 1) total = total + fib(%d);
+    print total;
+  '''
+  runtimes = [LoxRuntime(backend=backend, output=io.StringIO())
+              for backend in LoxRuntime.backends for _ in range(3)]
+  threads = [threading.Thread(target=runtime.run, args=(source % (i % 5 + 5),))
+             for i, runtime in enumerate(runtimes)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+
+  fib = [0, 1]
+  while len(fib) < 10:
+    fib.append(fib[-1] + fib[-2])
+  assert [r.output.getvalue() for r in runtimes] == [f'{30 * fib[i % 5 + 5]}\n' for i in range(len(runtimes))]
+
+
+@pytest.mark.parametrize('scanner', [None, *LoxRuntime.scanner_engines])
+def test_streaming_uses_the_selected_scanner(scanner, tmp_path, monkeypatch):
+  used = []
+  for engine in LoxRuntime.scanner_engines.values():
+    monkeypatch.setattr(engine, 'iter_tokens', lambda self, iter_tokens=engine.iter_tokens: used.append(type(self)) or iter_tokens(self))
+  script = tmp_path / 'script.lox'
+  script.write_text('var s = "café";\nprint s;\nprint 1 + 2;\n', encoding='utf-8')
+  runtime = LoxRuntime(scanner=scanner, streaming=True, output=io.StringIO())
+  with open(script) as file:
+    runtime.run_mapped(file)
+  assert runtime.output.getvalue() == 'café\n3\n'
+  assert used == [LoxRuntime.scanner_engines[scanner or 'fast']]
+
+
+def test_compact_tokens_reject_the_classic_scanner():
+  with pytest.raises(SystemExit):
+    Lox.parse_args(['--compact-tokens', '--scanner', 'classic'])
+  with pytest.raises(ValueError):
+    LoxRuntime(scanner='classic', compact_tokens=True)
+  runtime = LoxRuntime.from_args(Lox.parse_args(['--compact-tokens']), output=io.StringIO())
+  runtime.run('print 1 + 2;')
+  assert runtime.output.getvalue() == '3\n'
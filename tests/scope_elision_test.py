@@ -0,0 +1,48 @@
+import io
+
+from pylox.interpreter.resolver import Resolver
+from pylox.parser.parser import Parser
+from pylox.runtime import LoxRuntime
+from pylox.scanner.scanner import Scanner
+
+
+def test_blocks_that_declare_nothing_have_no_scope():
+  statements = Parser(Scanner('''
+    { print 1; }
+    { var a = 1; { a = 2; } }
+    { fun f() {} }
+    for (var i = 0; i < 2; i = i + 1) { print i; }
+  ''', print).scan_tokens(), print).parse()
+  resolver = Resolver(print)
+  resolver.resolve(statements)
+  empty, declaring, function, loop = statements
+  inner = declaring.statements[1]
+  assert [empty.scoped, declaring.scoped, inner.scoped, function.scoped] == [False, True, False, True]
+  assert loop.inline_body and not loop.body.scoped
+  assert (resolver.blocks, resolver.scopeless) == (5, 3)
+  # `a` is in the declaring block's environment, which is the one the
+  # assignment runs in: the scopeless inner block adds no level.
+  assert inner.statements[0].expression.depth == 0
+
+
+def test_scope_report():
+  source = '''
+    var total = 0;
+    for (var i = 0; i < 10; i = i + 1) {
+      if (i > 4) { total = total + i; } else { var x = i; total = total - x; }
+    }
+    print total;
+  '''
+  for backend in ('tree', 'closure'):
+    output, report = io.StringIO(), io.StringIO()
+    runtime = LoxRuntime(backend=backend, output=output, scope_report=True)
+    runtime.run(source)
+    runtime.report_scopes(report)
+    assert output.getvalue() == '25\n'
+    assert report.getvalue() == 'scopes: 2 of 3 blocks run without their own environment\n'
+  # The VM allocates no environments at all.
+  report = io.StringIO()
+  runtime = LoxRuntime(backend='vm', output=io.StringIO(), scope_report=True)
+  runtime.run(source)
+  runtime.report_scopes(report)
+  assert report.getvalue() == ''
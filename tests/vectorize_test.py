@@ -0,0 +1,87 @@
+import io
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from backend_test import parse
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.vectorize import VectorLoop, find_vector_loops
+from pylox.runtime import LoxRuntime
+
+
+LOOPS = {
+  'harmonic': 'var acc = 0; for (var i = 0; i < 5000; i = i + 1) acc = acc + 1 / (i + 1);',
+  'tenths': 'var acc = 0.1; for (var i = 3; i <= 7000; i = i + 1) { acc = acc + (i * 0.1 - 0.3); }',
+  'product': 'var acc = 1; var k = 1.0001; for (var i = 0; i < 3000; i = i + 1) acc = (k - i / 10000000) * acc;',
+  'down': 'var acc = 1000000; for (var i = 1000; i > -500; i = i - 7) acc = acc - i / 3;',
+  'divide': 'var acc = 123456789; for (var i = 1; i <= 900; i = i + 2) acc = acc / (1 + i / 100000);',
+  'global_counter': 'var acc = 0; var i = 0; var n = 100.5; while (i < n) { acc = acc + -i * i; i = i + 1; }',
+  'local': 'fun f(n) { var acc = 0; for (var i = 0; i < n; i = i + 1) acc = acc + i / 7; return acc; } var acc = f(100000);',
+  'big_loop': 'var acc = 0; for (var i = 0; i < 200000; i = i + 1) acc = acc + 0.1;',
+}
+
+# Loops that match but must be interpreted when they run.
+FALLBACKS = {
+  'short': 'var acc = 0; for (var i = 0; i < 10; i = i + 1) acc = acc + i / 3;',
+  'fractional_start': 'var acc = 0; for (var i = 0.5; i < 100; i = i + 1) acc = acc + i / 3;',
+  'string': 'var acc = ""; var s = "x"; for (var i = 0; i < 100; i = i + 1) acc = acc + s;',
+  'wrong_direction': 'var acc = 0; for (var i = 0; i > 10; i = i + 1) acc = acc + i;',
+}
+
+
+def run(source, vectorize):
+  output = io.StringIO()
+  runtime = LoxRuntime(vectorize=vectorize, output=output)
+  runtime.run(source + ' print acc;')
+  return output.getvalue(), [str(error) for error in runtime.errors]
+
+
+@pytest.mark.parametrize('name', [*LOOPS, *FALLBACKS])
+def test_loops_are_vectorized(name, monkeypatch):
+  source = LOOPS.get(name) or FALLBACKS[name]
+  assert len(find_vector_loops(parse(source))) == 1
+  runs = []
+  original = VectorLoop.run
+  monkeypatch.setattr(VectorLoop, 'run', lambda loop, interpreter: runs.append(original(loop, interpreter)) or runs[-1])
+  run(source, True)
+  assert runs == [name in LOOPS]
+
+
+@pytest.mark.parametrize('name', [*LOOPS, *FALLBACKS])
+def test_results_are_bit_identical(name):
+  source = LOOPS.get(name) or FALLBACKS[name]
+  assert run(source, True) == run(source, False)
+
+
+# Dividing by zero fails the same way once the loop is interpreted.
+def test_zero_divisor_is_interpreted():
+  source = 'var acc = 0; for (var i = -50; i < 100; i = i + 1) acc = acc + 1 / i;'
+  for vectorize in (True, False):
+    with pytest.raises(ZeroDivisionError):
+      run(source, vectorize)
+
+
+@pytest.mark.parametrize('source', [
+  'var acc = 0; for (var i = 0; i < 100; i = i + 1) { print i; acc = acc + i; }',
+  'var acc = 0; for (var i = 0; i < 100; i = i + 1) acc = acc + f(i);',
+  'var acc = 0; for (var i = 0; i < 100; i = i + 1) acc = acc + acc;',
+  'var acc = 0; for (var i = 0; i < 100; i = i * 2) acc = acc + i;',
+  'var acc = 0; for (var i = 0; i < acc; i = i + 1) acc = acc + i;',
+  'var acc = 0; for (var i = 0; i < 100; i = i + 1) acc = i - acc;',
+  'var acc = 0; for (var i = 0; i < 100; i = i + 0.5) acc = acc + i;',
+])
+def test_other_loops_are_left_alone(source):
+  assert find_vector_loops(parse(source)) == []
+
+
+def test_counter_and_accumulator_end_as_interpreted():
+  source = 'var acc = 0; var i = 5; while (i <= 1000) { acc = acc + i; i = i + 5; } print i;'
+  assert run(source, True) == run(source, False) == ('1005\n100500\n', [])
+  statements = parse(source)
+  find_vector_loops(statements)
+  interpreter = Interpreter(print)
+  interpreter.output = io.StringIO()
+  interpreter.interpret(statements)
+  assert interpreter.Globals.values['i'] == 1005.0
+  assert type(interpreter.Globals.values['acc']) is float